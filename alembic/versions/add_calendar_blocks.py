@@ -0,0 +1,47 @@
+"""add calendar_blocks
+
+Revision ID: add_calendar_blocks
+Revises: add_user_data_version
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_calendar_blocks'
+down_revision = 'add_user_data_version'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'calendar_blocks',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=False),
+        sa.Column('end_time', sa.DateTime(), nullable=False),
+        sa.Column(
+            'recurrence',
+            sa.Enum('NONE', 'DAILY', 'WEEKDAYS', 'WEEKLY', name='blockrecurrence'),
+            nullable=False
+        ),
+        sa.Column('recurrence_until', sa.DateTime(), nullable=True),
+        sa.Column('last_end_time', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_calendar_blocks_id', 'calendar_blocks', ['id'])
+    op.create_index('ix_calendar_blocks_user_id_id', 'calendar_blocks', ['user_id', 'id'])
+    op.create_index(
+        'ix_calendar_blocks_user_id_start_time', 'calendar_blocks', ['user_id', 'start_time']
+    )
+
+def downgrade():
+    op.drop_index('ix_calendar_blocks_user_id_start_time', table_name='calendar_blocks')
+    op.drop_index('ix_calendar_blocks_user_id_id', table_name='calendar_blocks')
+    op.drop_index('ix_calendar_blocks_id', table_name='calendar_blocks')
+    op.drop_table('calendar_blocks')
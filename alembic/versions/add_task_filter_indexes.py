@@ -0,0 +1,23 @@
+"""add task filter indexes
+
+Revision ID: add_task_filter_indexes
+Revises: add_calendar_blocks
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_task_filter_indexes'
+down_revision = 'add_calendar_blocks'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Фильтры списка задач по сроку и дате создания
+    op.create_index('ix_tasks_user_id_due_date', 'tasks', ['user_id', 'due_date'])
+    op.create_index('ix_tasks_user_id_created_at', 'tasks', ['user_id', 'created_at'])
+
+def downgrade():
+    op.drop_index('ix_tasks_user_id_created_at', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_due_date', table_name='tasks')
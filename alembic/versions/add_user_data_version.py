@@ -0,0 +1,25 @@
+"""add data_version to users
+
+Revision ID: add_user_data_version
+Revises: add_user_scoped_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_data_version'
+down_revision = 'add_user_scoped_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Версия данных пользователя: по ней проверяется актуальность кэшей
+    op.add_column(
+        'users',
+        sa.Column('data_version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+def downgrade():
+    op.drop_column('users', 'data_version')
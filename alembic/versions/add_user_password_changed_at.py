@@ -0,0 +1,22 @@
+"""add password_changed_at to users
+
+Revision ID: add_user_password_changed_at
+Revises: update_user_model
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_password_changed_at'
+down_revision = 'update_user_model'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Момент последней смены пароля: токены, выпущенные раньше, отзываются
+    op.add_column('users', sa.Column('password_changed_at', sa.DateTime(), nullable=True))
+
+def downgrade():
+    op.drop_column('users', 'password_changed_at')
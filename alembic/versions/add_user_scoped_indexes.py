@@ -0,0 +1,34 @@
+"""add user scoped composite indexes
+
+Revision ID: add_user_scoped_indexes
+Revises: add_refresh_tokens
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_scoped_indexes'
+down_revision = 'add_refresh_tokens'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Индексы под реальные запросы: все выборки ограничены пользователем
+    op.create_index('ix_tasks_user_id_id', 'tasks', ['user_id', 'id'])
+    op.create_index('ix_tasks_user_id_status_due_date', 'tasks', ['user_id', 'status', 'due_date'])
+    op.create_index('ix_tasks_category_id_user_id', 'tasks', ['category_id', 'user_id'])
+    op.create_index('ix_categories_user_id_id', 'categories', ['user_id', 'id'])
+
+    # По названиям ничего не фильтруется, индексы только замедляют запись
+    op.drop_index('ix_tasks_title', table_name='tasks')
+    op.drop_index('ix_categories_name', table_name='categories')
+
+def downgrade():
+    op.create_index('ix_categories_name', 'categories', ['name'])
+    op.create_index('ix_tasks_title', 'tasks', ['title'])
+
+    op.drop_index('ix_categories_user_id_id', table_name='categories')
+    op.drop_index('ix_tasks_category_id_user_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_status_due_date', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_id', table_name='tasks')
@@ -1,8 +1,12 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, tasks, categories
+from app.api.v1.endpoints import auth, tasks, categories, calendar_blocks, dashboard
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
-api_router.include_router(categories.router, prefix="/categories", tags=["categories"]) 
\ No newline at end of file
+api_router.include_router(categories.router, prefix="/categories", tags=["categories"])
+api_router.include_router(
+    calendar_blocks.router, prefix="/calendar-blocks", tags=["calendar-blocks"]
+)
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
@@ -6,10 +6,12 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.security import verify_password, create_access_token, get_current_user
+from app.core.hashing import verify_password_async
+from app.core.security import create_access_token, get_current_user
 from app.core.config import settings
+from app.crud import refresh_token as refresh_token_crud
 from app.crud import user as user_crud
-from app.schemas.user import User, UserCreate, Token, UserUpdate
+from app.schemas.user import User, UserCreate, Token, UserUpdate, RefreshTokenRequest
 
 router = APIRouter()
 
@@ -30,16 +32,40 @@ async def login(
     db: AsyncSession = Depends(get_db)
 ):
     """Войти в систему и получить токен доступа."""
-    user = await user_crud.get_user_by_email(db, email=form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await user_crud.authenticate_user(db, form_data.username, form_data.password)
+    if not user:
         raise HTTPException(status_code=401, detail="Неверная почта или пароль")
     
+    refresh_token, _ = await refresh_token_crud.create_refresh_token(db, user.id)
+    return _token_response(user.id, refresh_token)
+
+@router.post("/refresh", response_model=Token)
+async def refresh(
+    request: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Обменять токен обновления на новую пару токенов без проверки пароля.
+    Использованный токен обновления отзывается.
+    """
+    rotated = await refresh_token_crud.rotate_refresh_token(db, request.refresh_token)
+    if rotated is None:
+        raise HTTPException(status_code=401, detail="Недействительный токен обновления")
+    user_id, refresh_token = rotated
+    return _token_response(user_id, refresh_token)
+
+def _token_response(user_id: int, refresh_token: str) -> dict:
+    """Сформировать ответ с новым токеном доступа и токеном обновления."""
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": str(user.id)},
+        data={"sub": str(user_id)},
         expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+    }
 
 @router.get("/me", response_model=User)
 async def read_current_user(
@@ -76,7 +102,7 @@ async def change_password(
     if not user:
         raise HTTPException(status_code=404, detail="Пользователь не найден")
     
-    if not verify_password(current_password, user.hashed_password):
+    if not await verify_password_async(current_password, user.hashed_password):
         raise HTTPException(status_code=400, detail="Неверный текущий пароль")
     
     await user_crud.update_user_password(db, current_user, new_password)
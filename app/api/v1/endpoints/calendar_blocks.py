@@ -0,0 +1,120 @@
+"""Эндпоинты для работы с блоками календаря."""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.replicas import get_read_db
+from app.core.security import get_current_user
+from app.crud import calendar_block as calendar_block_crud
+from app.schemas.calendar_block import CalendarBlock, CalendarBlockCreate, CalendarBlockUpdate
+
+router = APIRouter()
+
+@router.get(
+    "/",
+    response_model=List[CalendarBlock],
+    summary="Получить блоки календаря",
+    description=(
+        "Возвращает блоки календаря пользователя в порядке ID. "
+        f"Курсор следующей страницы передается в заголовке {NEXT_CURSOR_HEADER}."
+    )
+)
+async def read_calendar_blocks(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Получить список блоков календаря пользователя."""
+    try:
+        page = await calendar_block_crud.get_calendar_blocks_page(
+            db,
+            current_user,
+            limit=limit,
+            skip=skip,
+            cursor=decode_cursor(cursor) if cursor else None
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page.next_cursor)
+    return page.items
+
+@router.post(
+    "/",
+    response_model=CalendarBlock,
+    summary="Создать блок календаря",
+    description=(
+        "Создаёт блок занятого времени: встречу или время вне рабочих часов. "
+        "Блок может повторяться каждый день, по рабочим дням или каждую неделю "
+        "до recurrence_until. Расписание задач размещает задачи вне блоков."
+    )
+)
+async def create_calendar_block(
+    block: CalendarBlockCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Создать блок календаря."""
+    return await calendar_block_crud.create_calendar_block(db, block, current_user)
+
+@router.get(
+    "/{block_id}",
+    response_model=CalendarBlock,
+    summary="Получить блок календаря",
+    description="Получить блок календаря по его идентификатору."
+)
+async def read_calendar_block(
+    block_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Получить блок календаря."""
+    db_block = await calendar_block_crud.get_calendar_block(db, block_id, current_user)
+    if db_block is None:
+        raise HTTPException(status_code=404, detail="Calendar block not found")
+    return db_block
+
+@router.put(
+    "/{block_id}",
+    response_model=CalendarBlock,
+    summary="Обновить блок календаря",
+    description="Обновить блок календаря по его идентификатору."
+)
+async def update_calendar_block(
+    block_id: int,
+    block: CalendarBlockUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Обновить блок календаря."""
+    try:
+        db_block = await calendar_block_crud.update_calendar_block(
+            db, block_id, block, current_user
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if db_block is None:
+        raise HTTPException(status_code=404, detail="Calendar block not found")
+    return db_block
+
+@router.delete(
+    "/{block_id}",
+    summary="Удалить блок календаря",
+    description="Удалить блок календаря по его идентификатору."
+)
+async def delete_calendar_block(
+    block_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Удалить блок календаря."""
+    success = await calendar_block_crud.delete_calendar_block(db, block_id, current_user)
+    if not success:
+        raise HTTPException(status_code=404, detail="Calendar block not found")
+    return {"message": "Calendar block deleted successfully"}
@@ -1,30 +1,73 @@
 """Эндпоинты для работы с категориями задач."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.etag import etag_matches, make_etag, not_modified, set_cache_headers
+from app.core.importer import import_records
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.replicas import get_read_db
 from app.core.security import get_current_user
+from app.core.serialization import parse_fields, row_response, rows_response
 from app.crud import category as category_crud
+from app.crud.user import get_data_version
 from app.schemas.category import Category, CategoryCreate, CategoryUpdate
+from app.schemas.data_import import ImportReport, ImportTarget
 
 router = APIRouter()
 
+def _parse_category_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Поля категории из параметра fields; 400, если поле не входит в схему Category."""
+    try:
+        return parse_fields(Category, fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
 @router.get(
     "/",
     response_model=List[Category],
     summary="Получить категории",
-    description="Возвращает список категорий пользователя."
+    description=(
+        "Возвращает список категорий пользователя в порядке ID. "
+        "Параметр fields (поля категории через запятую) ограничивает поля ответа. "
+        f"Курсор следующей страницы передается в заголовке {NEXT_CURSOR_HEADER}. "
+        "Если ETag из If-None-Match актуален, возвращается 304 без тела."
+    )
 )
 async def read_categories(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: int = Depends(get_current_user)
 ):
     """Получить список категорий пользователя."""
-    return await category_crud.get_categories(db, current_user, skip=skip, limit=limit)
+    selected = _parse_category_fields(fields)
+    etag = make_etag(current_user, await get_data_version(db, current_user))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        page = await category_crud.get_categories_page(
+            db,
+            current_user,
+            limit=limit,
+            skip=skip,
+            cursor=decode_cursor(cursor) if cursor else None,
+            fields=selected
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    # Строки сериализуются сразу в байты, без проверки схемой response_model
+    response = rows_response(Category, page.items, fields=selected)
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page.next_cursor)
+    set_cache_headers(response, etag)
+    return response
 
 @router.post(
     "/",
@@ -40,22 +83,54 @@ async def create_category(
     """Создать новую категорию."""
     return await category_crud.create_category(db, category, current_user)
 
+@router.post(
+    "/import",
+    response_model=ImportReport,
+    summary="Импортировать категории",
+    description=(
+        "Импортирует категории из тела запроса в формате NDJSON, JSON-массива или записей, "
+        "идущих подряд. Тело разбирается по мере получения, записи вставляются пакетами "
+        "по chunk_size строк. Отклоненные записи возвращаются в отчете."
+    )
+)
+async def import_categories(
+    request: Request,
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1),
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Импортировать категории пользователя."""
+    return await import_records(
+        db, current_user, request.stream(), ImportTarget.CATEGORIES, chunk_size
+    )
+
 @router.get(
     "/{category_id}",
     response_model=Category,
     summary="Получить категорию",
-    description="Получить информацию о конкретной категории по её идентификатору."
+    description=(
+        "Получить информацию о конкретной категории по её идентификатору. "
+        "Параметр fields (поля категории через запятую) ограничивает поля ответа."
+    )
 )
 async def read_category(
     category_id: int,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: int = Depends(get_current_user)
 ):
     """Получить информацию о конкретной категории."""
-    db_category = await category_crud.get_category(db, category_id, current_user)
-    if db_category is None:
+    selected = _parse_category_fields(fields)
+    etag = make_etag(current_user, await get_data_version(db, current_user))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    row = await category_crud.get_category_row(db, category_id, current_user, selected)
+    if row is None:
         raise HTTPException(status_code=404, detail="Category not found")
-    return db_category
+    response = row_response(Category, row, fields=selected)
+    set_cache_headers(response, etag)
+    return response
 
 @router.put(
     "/{category_id}",
@@ -0,0 +1,70 @@
+"""Эндпоинт сводки для главного экрана."""
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import get_session_factory
+from app.core.security import get_current_user
+from app.core.serialization import json_response, row_records
+from app.crud import category as category_crud
+from app.crud import task as task_crud
+from app.schemas.dashboard import CategoryTaskCount, Dashboard
+from app.schemas.task import Task, TaskFilter
+
+router = APIRouter()
+
+T = TypeVar("T")
+
+async def _in_session(
+    session_factory: sessionmaker,
+    query: Callable[[AsyncSession], Awaitable[T]]
+) -> T:
+    """Выполнить запрос в собственной сессии: сессию нельзя использовать конкурентно."""
+    async with session_factory() as session:
+        return await query(session)
+
+@router.get(
+    "",
+    response_model=Dashboard,
+    summary="Получить сводку",
+    description=(
+        f"Возвращает {settings.DASHBOARD_TASKS_LIMIT} самых приоритетных и столько же "
+        "просроченных задач, число задач по статусам и по категориям. Запросы выполняются "
+        "одновременно в отдельных сессиях, поэтому время ответа определяет самый "
+        "медленный из них."
+    )
+)
+async def read_dashboard(
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: int = Depends(get_current_user)
+):
+    """Получить сводку для главного экрана."""
+    limit = settings.DASHBOARD_TASKS_LIMIT
+    top, overdue, status_counts, categories = await asyncio.gather(
+        _in_session(session_factory, lambda db: task_crud.get_tasks_page(
+            db, current_user, limit=limit
+        )),
+        _in_session(session_factory, lambda db: task_crud.get_tasks_page(
+            db, current_user, limit=limit, filters=TaskFilter(overdue=True)
+        )),
+        _in_session(session_factory, lambda db: task_crud.count_tasks_by_status(
+            db, current_user
+        )),
+        _in_session(session_factory, lambda db: category_crud.count_tasks_by_category(
+            db, current_user
+        )),
+    )
+    # Задачи без категории (или со ссылкой на чужую категорию) не попадают
+    # в группировку по категориям пользователя
+    categorized = sum(row.task_count for row in categories)
+    return json_response({
+        "top_tasks": row_records(Task, top.items),
+        "overdue_tasks": row_records(Task, overdue.items),
+        "status_counts": {status.value: count for status, count in status_counts.items()},
+        "categories": row_records(CategoryTaskCount, categories),
+        "uncategorized_count": sum(status_counts.values()) - categorized,
+    })
@@ -1,32 +1,141 @@
 """Эндпоинты для работы с задачами."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import date, datetime, time
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, get_session_factory
+from app.core.etag import etag_matches, make_etag, not_modified, set_cache_headers
+from app.core.export import MEDIA_TYPES, export_tasks
+from app.core.importer import import_records
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from app.core.replicas import get_read_db
+from app.core.scheduler import get_schedule
 from app.core.security import get_current_user
+from app.core.serialization import (
+    json_response,
+    parse_fields,
+    row_records,
+    row_response,
+    rows_response,
+)
+from app.core.timeutil import to_naive_utc
 from app.crud import task as task_crud
-from app.schemas.task import Task, TaskCreate, TaskUpdate
-from app.core.priority import sort_tasks_by_priority
+from app.crud.user import get_data_version
+from app.schemas.data_import import ImportReport, ImportTarget
+from app.schemas.task import (
+    BulkItemStatus,
+    ScheduleResponse,
+    Task,
+    TaskBatchGet,
+    TaskBatchGetResponse,
+    TaskBulkCreate,
+    TaskBulkDelete,
+    TaskBulkItemResult,
+    TaskBulkResponse,
+    TaskBulkUpdate,
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskExportFormat,
+    TaskFilter,
+    TaskSort,
+    TaskStatus,
+    TaskUpdate,
+)
 
 router = APIRouter()
 
+def _parse_task_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Поля задачи из параметра fields; 400, если поле не входит в схему Task."""
+    try:
+        return parse_fields(Task, fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
 @router.get(
     "/",
     response_model=List[Task],
     summary="Получить задачи",
-    description="Возвращает список задач пользователя, отсортированных по приоритету."
+    description=(
+        "Возвращает список задач пользователя, отсортированных по приоритету или по ID. "
+        "Список можно отфильтровать по статусам (параметр status повторяется), категории, "
+        "сроку (due_after и due_before включительно), дате создания и просроченности "
+        "(overdue - незавершенные задачи со сроком раньше сегодняшнего дня). "
+        "Параметр fields (поля задачи через запятую) ограничивает поля ответа. "
+        f"Курсор следующей страницы передается в заголовке {NEXT_CURSOR_HEADER}. "
+        "Если ETag из If-None-Match актуален, возвращается 304 без тела."
+    )
 )
 async def read_tasks(
     skip: int = 0,
     limit: int = 100,
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    sort: TaskSort = TaskSort.PRIORITY,
+    status: Optional[List[TaskStatus]] = Query(None),
+    category_id: Optional[int] = None,
+    due_before: Optional[date] = None,
+    due_after: Optional[date] = None,
+    created_after: Optional[datetime] = None,
+    overdue: bool = False,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: int = Depends(get_current_user)
 ):
     """Получить список задач пользователя."""
-    tasks = await task_crud.get_tasks(db, current_user, skip=skip, limit=limit)
-    return sort_tasks_by_priority(tasks)
+    selected = _parse_task_fields(fields)
+    filters = TaskFilter(
+        status=status,
+        category_id=category_id,
+        due_before=due_before,
+        due_after=due_after,
+        created_after=created_after,
+        overdue=overdue
+    )
+    filtered = filters != TaskFilter()
+    # Просроченность отсчитывается от текущей даты: после полуночи тот же запрос
+    # дает другой список, поэтому дата входит в ETag
+    today = datetime.combine(datetime.utcnow().date(), time.min) if overdue else None
+    # Версия читается до задач: если они изменятся во время запроса,
+    # ответ получит старый ETag и будет запрошен заново при следующем опросе.
+    # Индекс приоритетов используется, только если он построен при этой версии,
+    # иначе ETag с этой версией получила бы устаревшая страница
+    version = await get_data_version(db, current_user)
+    if if_none_match:
+        # Первая страница приоритетной сортировки зависит и от момента расчета
+        # приоритетов: он известен без запросов к базе, только если страница
+        # строится по загруженному индексу, то есть без фильтров
+        moment = None
+        if sort == TaskSort.PRIORITY and cursor is None and not filtered:
+            moment = task_crud.get_cached_ranking_moment(current_user, skip, limit, version)
+        if moment is not None or sort != TaskSort.PRIORITY or cursor is not None:
+            etag = make_etag(current_user, version, moment or today)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+    try:
+        page = await task_crud.get_tasks_page(
+            db,
+            current_user,
+            limit=limit,
+            skip=skip,
+            sort=sort,
+            cursor=decode_cursor(cursor) if cursor else None,
+            filters=filters,
+            fields=selected,
+            version=version
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+    # Строки сериализуются сразу в байты, без проверки схемой response_model
+    response = rows_response(Task, page.items, fields=selected)
+    if page.next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(page.next_cursor)
+    set_cache_headers(response, make_etag(current_user, version, page.evaluated_at or today))
+    return response
 
 @router.post(
     "/",
@@ -42,22 +151,213 @@ async def create_task(
     """Создать новую задачу."""
     return await task_crud.create_task(db, task, current_user)
 
+# Пакетные маршруты объявлены до /{task_id}, иначе "bulk" будет принят за ID задачи
+
+@router.post(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    summary="Создать задачи пакетом",
+    description=(
+        f"Создаёт до {settings.BULK_MAX_ITEMS} задач в одной транзакции. "
+        "Результаты возвращаются в порядке элементов запроса."
+    )
+)
+async def create_tasks_bulk(
+    bulk: TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Создать несколько задач."""
+    db_tasks = await task_crud.create_tasks(db, bulk.tasks, current_user)
+    return TaskBulkResponse(results=[
+        TaskBulkItemResult(
+            index=index,
+            id=db_task.id,
+            status=BulkItemStatus.CREATED,
+            task=Task.model_validate(db_task)
+        )
+        for index, db_task in enumerate(db_tasks)
+    ])
+
+def _bulk_update_status(item: TaskBulkUpdateItem, found: bool) -> BulkItemStatus:
+    """Статус элемента пакетного обновления."""
+    if not found:
+        return BulkItemStatus.NOT_FOUND
+    return BulkItemStatus.UPDATED if item.has_changes else BulkItemStatus.UNCHANGED
+
+@router.patch(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    summary="Обновить задачи пакетом",
+    description=(
+        f"Обновляет до {settings.BULK_MAX_ITEMS} задач в одной транзакции. "
+        "Для задач, которые не найдены, возвращается статус not_found, "
+        "для элементов только с ID - unchanged."
+    )
+)
+async def update_tasks_bulk(
+    bulk: TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Обновить несколько задач."""
+    db_tasks = await task_crud.update_tasks(db, bulk.tasks, current_user)
+    return TaskBulkResponse(results=[
+        TaskBulkItemResult(
+            index=index,
+            id=item.id,
+            status=_bulk_update_status(item, db_task is not None),
+            task=Task.model_validate(db_task) if db_task else None
+        )
+        for index, (item, db_task) in enumerate(zip(bulk.tasks, db_tasks))
+    ])
+
+@router.delete(
+    "/bulk",
+    response_model=TaskBulkResponse,
+    summary="Удалить задачи пакетом",
+    description=(
+        f"Удаляет до {settings.BULK_MAX_ITEMS} задач одним запросом. "
+        "Для задач, которые не найдены, возвращается статус not_found."
+    )
+)
+async def delete_tasks_bulk(
+    bulk: TaskBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Удалить несколько задач."""
+    deleted = await task_crud.delete_tasks(db, bulk.ids, current_user)
+    return TaskBulkResponse(results=[
+        TaskBulkItemResult(
+            index=index,
+            id=task_id,
+            status=BulkItemStatus.DELETED if success else BulkItemStatus.NOT_FOUND
+        )
+        for index, (task_id, success) in enumerate(zip(bulk.ids, deleted))
+    ])
+
+@router.post(
+    "/batch-get",
+    response_model=TaskBatchGetResponse,
+    summary="Получить задачи по списку ID",
+    description=(
+        f"Возвращает до {settings.BULK_MAX_ITEMS} задач пользователя одним запросом "
+        "в порядке ID в запросе (повторы не дублируются); ID, которые не найдены, "
+        "перечисляются в missing. Параметр fields ограничивает поля задач."
+    )
+)
+async def batch_get_tasks(
+    batch: TaskBatchGet,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Получить несколько задач по ID."""
+    selected = _parse_task_fields(fields)
+    task_ids = list(dict.fromkeys(batch.ids))
+    rows = await task_crud.get_task_rows_by_ids(db, task_ids, current_user, selected)
+    found = {row.id for row in rows}
+    return json_response({
+        "tasks": row_records(Task, rows, selected),
+        "missing": [task_id for task_id in task_ids if task_id not in found],
+    })
+
+@router.post(
+    "/import",
+    response_model=ImportReport,
+    summary="Импортировать задачи",
+    description=(
+        "Импортирует задачи из тела запроса в формате NDJSON, JSON-массива или записей, "
+        "идущих подряд. Тело разбирается по мере получения, записи вставляются пакетами "
+        "по chunk_size строк. Отклоненные записи возвращаются в отчете."
+    )
+)
+async def import_tasks(
+    request: Request,
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1),
+    db: AsyncSession = Depends(get_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Импортировать задачи пользователя."""
+    return await import_records(
+        db, current_user, request.stream(), ImportTarget.TASKS, chunk_size
+    )
+
+@router.get(
+    "/schedule",
+    response_model=ScheduleResponse,
+    summary="Получить расписание",
+    description=(
+        "Размещает незавершенные задачи со сроком в интервале [start_date, end_date] "
+        "по убыванию рассчитанного приоритета: каждая задача занимает самое раннее "
+        "свободное от блоков календаря время, в которое помещается. "
+        "Длительность задачи берется из estimated_duration (в часах); "
+        "задачи, для которых нет места, пропускаются."
+    )
+)
+async def read_schedule(
+    start_date: datetime,
+    end_date: datetime,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: int = Depends(get_current_user)
+):
+    """Получить расписание задач на период."""
+    start_date, end_date = to_naive_utc(start_date), to_naive_utc(end_date)
+    if end_date <= start_date:
+        raise HTTPException(status_code=400, detail="end_date must be after start_date")
+    return await get_schedule(db, current_user, start_date, end_date)
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Выгрузить задачи",
+    description=(
+        "Выгружает все задачи пользователя в порядке ID в формате NDJSON или CSV. "
+        "Строки читаются из базы и отправляются частями, не загружаясь в память целиком."
+    )
+)
+async def export_tasks_stream(
+    export_format: TaskExportFormat = Query(TaskExportFormat.NDJSON, alias="format"),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: int = Depends(get_current_user)
+):
+    """Выгрузить задачи пользователя."""
+    return StreamingResponse(
+        export_tasks(session_factory, current_user, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format.value}"'
+        }
+    )
+
 @router.get(
     "/{task_id}",
     response_model=Task,
     summary="Получить задачу",
-    description="Получить информацию о конкретной задаче по её идентификатору."
+    description=(
+        "Получить информацию о конкретной задаче по её идентификатору. "
+        "Параметр fields (поля задачи через запятую) ограничивает поля ответа."
+    )
 )
 async def read_task(
     task_id: int,
-    db: AsyncSession = Depends(get_db),
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_read_db),
     current_user: int = Depends(get_current_user)
 ):
     """Получить информацию о конкретной задаче."""
-    db_task = await task_crud.get_task(db, task_id, current_user)
-    if db_task is None:
+    selected = _parse_task_fields(fields)
+    etag = make_etag(current_user, await get_data_version(db, current_user))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    row = await task_crud.get_task_row(db, task_id, current_user, selected)
+    if row is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return db_task
+    response = row_response(Task, row, fields=selected)
+    set_cache_headers(response, etag)
+    return response
 
 @router.put(
     "/{task_id}",
@@ -0,0 +1,53 @@
+"""Кэши в памяти процесса."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+class LRUCache:
+    """
+    Кэш ограниченного размера с вытеснением давно неиспользуемых записей (LRU).
+    У записи может быть срок жизни: момент time.time(), после которого она недействительна.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Получить значение, если запись есть и не истекла."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at is not None and time.time() >= expires_at:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """Сохранить значение, при необходимости вытеснив самые старые записи."""
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Удалить запись и вернуть ее значение."""
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def discard_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Удалить записи, для которых predicate(ключ, значение) истинно."""
+        keys = [key for key, (value, _) in self._data.items() if predicate(key, value)]
+        for key in keys:
+            del self._data[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Удалить все записи."""
+        self._data.clear()
@@ -0,0 +1,194 @@
+"""Занятое время пользователя по блокам календаря и поиск свободных интервалов."""
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from app.schemas.calendar_block import BlockRecurrence
+
+# Время внутри модуля - целые микросекунды от EPOCH: без ошибок округления
+EPOCH = datetime(1970, 1, 1)
+MICROSECONDS_PER_HOUR = 3_600_000_000
+_MICROSECONDS_PER_DAY = 24 * MICROSECONDS_PER_HOUR
+
+# Шаг повторения блока; рабочие дни - ежедневные повторения без субботы и воскресенья
+RECURRENCE_STEPS = {
+    BlockRecurrence.NONE: 0,
+    BlockRecurrence.DAILY: _MICROSECONDS_PER_DAY,
+    BlockRecurrence.WEEKDAYS: _MICROSECONDS_PER_DAY,
+    BlockRecurrence.WEEKLY: 7 * _MICROSECONDS_PER_DAY,
+}
+
+class BusyIntervals(NamedTuple):
+    """Непересекающиеся занятые интервалы [starts[i], ends[i]) по возрастанию, в микросекундах."""
+    starts: np.ndarray
+    ends: np.ndarray
+
+def to_microseconds(moment: datetime) -> int:
+    """Момент времени в микросекундах от EPOCH."""
+    return (moment - EPOCH) // timedelta(microseconds=1)
+
+def from_microseconds(value: int) -> datetime:
+    """Момент времени по числу микросекунд от EPOCH."""
+    return EPOCH + timedelta(microseconds=value)
+
+def _recurrence(value) -> BlockRecurrence:
+    """Повторение блока по значению из базы (в SQLite - имя элемента перечисления)."""
+    if isinstance(value, Enum):
+        return BlockRecurrence(value.value)
+    return BlockRecurrence(value.lower())
+
+def last_end_time(
+    start_time: datetime,
+    end_time: datetime,
+    recurrence: BlockRecurrence,
+    recurrence_until: Optional[datetime]
+) -> Optional[datetime]:
+    """
+    Момент, не раньше которого заканчивается последнее повторение блока;
+    None, если блок повторяется бессрочно.
+    """
+    if recurrence == BlockRecurrence.NONE:
+        return end_time
+    if recurrence_until is None:
+        return None
+    return max(recurrence_until, start_time) + (end_time - start_time)
+
+def busy_intervals(blocks: Sequence, start: datetime, end: datetime) -> BusyIntervals:
+    """
+    Занятые интервалы внутри [start, end] по блокам календаря.
+    blocks - строки (start_time, end_time, recurrence, recurrence_until);
+    повторения разворачиваются массивами NumPy, пересекающиеся и смежные
+    интервалы объединяются.
+    """
+    window_start, window_end = to_microseconds(start), to_microseconds(end)
+    if not blocks:
+        return BusyIntervals(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    block_starts, block_ends, recurrences, untils = zip(*blocks)
+    first = np.array(block_starts, dtype="datetime64[us]").astype(np.int64)
+    duration = np.array(block_ends, dtype="datetime64[us]").astype(np.int64) - first
+    recurrences = [_recurrence(value) for value in recurrences]
+    step = np.array([RECURRENCE_STEPS[value] for value in recurrences], dtype=np.int64)
+    weekdays = np.array([value == BlockRecurrence.WEEKDAYS for value in recurrences])
+    until = np.array(untils, dtype="datetime64[us]")
+    # Повторение начинается не позже recurrence_until и раньше конца окна
+    limit = np.where(
+        np.isnat(until) | (step == 0),
+        window_end,
+        np.minimum(until.astype(np.int64) + 1, window_end)
+    )
+
+    # Номера первого повторения, заканчивающегося после начала окна,
+    # и повторения, следующего за последним подходящим
+    repeating = step > 0
+    safe_step = np.where(repeating, step, 1)
+    first_index = np.where(
+        repeating, np.maximum((window_start - duration - first) // safe_step + 1, 0), 0
+    )
+    stop_index = np.where(
+        repeating,
+        -((first - limit) // safe_step),
+        ((first < limit) & (first + duration > window_start)).astype(np.int64)
+    )
+    counts = np.maximum(stop_index - first_index, 0)
+
+    block = np.repeat(np.arange(len(blocks)), counts)
+    offsets = np.cumsum(counts) - counts
+    occurrence = first_index[block] + np.arange(len(block)) - offsets[block]
+    starts = first[block] + occurrence * step[block]
+    # 1970-01-01 - четверг: день недели с понедельника (0) равен (день + 3) % 7
+    keep = ~weekdays[block] | ((starts // _MICROSECONDS_PER_DAY + 3) % 7 < 5)
+    ends = np.minimum(starts[keep] + duration[block][keep], window_end)
+    starts = np.maximum(starts[keep], window_start)
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    if not len(starts):
+        return BusyIntervals(starts, ends)
+
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    reach = np.maximum.accumulate(ends[order])
+    # Новый интервал начинается там, где начало больше концов всех предыдущих
+    opens = np.flatnonzero(np.concatenate(([True], starts[1:] > reach[:-1])))
+    closes = np.concatenate((opens[1:] - 1, [len(starts) - 1]))
+    return BusyIntervals(starts[opens], reach[closes])
+
+class FreeSlots:
+    """
+    Свободные интервалы окна, из которых задачам по очереди выделяется время.
+    Над длинами интервалов (в порядке времени) построено дерево отрезков
+    максимумов: самый ранний интервал, вмещающий задачу, находится и сокращается
+    за O(log n). Задача занимает начало интервала, поэтому интервалы только
+    сокращаются и никогда не делятся.
+    """
+
+    def __init__(self, start: datetime, end: datetime, busy: Optional[BusyIntervals] = None):
+        window_start, window_end = to_microseconds(start), to_microseconds(end)
+        if busy is None:
+            busy = BusyIntervals(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+        gap_starts = np.concatenate(([window_start], busy.ends)).astype(np.int64)
+        gap_ends = np.concatenate((busy.starts, [window_end])).astype(np.int64)
+        keep = gap_ends > gap_starts
+        gap_starts, gap_ends = gap_starts[keep], gap_ends[keep]
+
+        size = 1
+        while size < len(gap_starts):
+            size *= 2
+        tree = np.zeros(2 * size, dtype=np.int64)
+        tree[size:size + len(gap_starts)] = gap_ends - gap_starts
+        level = size
+        while level > 1:
+            tree[level // 2:level] = np.maximum(
+                tree[level:2 * level:2], tree[level + 1:2 * level:2]
+            )
+            level //= 2
+
+        self._size = size
+        self._tree = tree.tolist()
+        self._origins = gap_starts.tolist()
+        self._starts = gap_starts.tolist()
+        self._ends = gap_ends.tolist()
+
+    @property
+    def longest(self) -> int:
+        """Длина самого длинного свободного интервала в микросекундах."""
+        return self._tree[1]
+
+    def take(self, duration: int) -> Optional[int]:
+        """
+        Занять duration микросекунд в начале самого раннего интервала, который их вмещает.
+        Возвращает начало занятого времени или None, если места нет.
+        """
+        tree = self._tree
+        if tree[1] < duration:
+            return None
+        node = 1
+        while node < self._size:
+            node *= 2
+            if tree[node] < duration:
+                node += 1
+        index = node - self._size
+        start = self._starts[index]
+        self._shrink(index, start + duration)
+        return start
+
+    def occupy(self, start: int, end: int) -> None:
+        """Повторно занять время [start, end), выделенное ранее через take (в том же порядке)."""
+        self._shrink(bisect_right(self._origins, start) - 1, end)
+
+    def _shrink(self, index: int, start: int) -> None:
+        """Перенести начало интервала index и обновить максимумы в дереве."""
+        self._starts[index] = start
+        tree = self._tree
+        node = index + self._size
+        tree[node] = self._ends[index] - start
+        node //= 2
+        while node:
+            longest = max(tree[2 * node], tree[2 * node + 1])
+            if tree[node] == longest:
+                break
+            tree[node] = longest
+            node //= 2
@@ -21,9 +21,55 @@ class Settings(BaseSettings):
     # Настройки безопасности
     SECRET_KEY: str = "your-secret-key-here"  # Измените это значение в production
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    BCRYPT_ROUNDS: int = 12  # Стоимость bcrypt; хеши с другой стоимостью обновляются при входе
+    PASSWORD_HASH_WORKERS: int = 4  # Потоки для хеширования паролей; 0 - хешировать в цикле событий
+    TOKEN_CACHE_SIZE: int = 10_000  # Число проверенных токенов в кэше
+    TOKEN_CACHE_TTL_SECONDS: int = 300  # Максимальное время жизни записи кэша токенов
     
     # Настройки базы данных
     DATABASE_URL: str = "sqlite+aiosqlite:///./task_management.db"
+    # Реплики для чтения (для SQLite - копии файла базы, открываемые только для чтения);
+    # пустой список - все запросы выполняются на основной базе
+    DATABASE_READ_URLS: List[str] = []
+    READ_REPLICA_LAG_SECONDS: float = 5  # После записи пользователь столько читает с основной базы
+    READ_REPLICA_RETRY_SECONDS: float = 30  # Недоступная реплика пропускается столько секунд
+    READ_REPLICA_CHECK_SECONDS: float = 1  # Столько секунд доступность реплики не перепроверяется
+    DB_ECHO: bool = False  # Логировать SQL-запросы (не зависит от DEBUG)
+    DB_POOL_SIZE: int = 5  # Постоянные соединения в пуле
+    DB_MAX_OVERFLOW: int = 10  # Дополнительные соединения сверх пула при пиковой нагрузке
+    DB_POOL_TIMEOUT: float = 30  # Ожидание свободного соединения, секунды
+    # Профиль SQLite: PRAGMA, выполняемые для каждого нового соединения.
+    # WAL позволяет читать во время записи, NORMAL в режиме WAL не теряет
+    # целостность базы при сбое и синхронизирует диск только на контрольных точках
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Ожидание блокировки записи вместо "database is locked"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # Отображение файла базы в память, байты
+    SQLITE_CACHE_SIZE: int = -64_000  # Кэш страниц; отрицательное значение - в КиБ
+    SQLITE_TEMP_STORE: str = "MEMORY"  # Временные таблицы и индексы сортировки в памяти
+    # Группировка записей: операции записи CRUD выполняет одна задача-писатель,
+    # фиксируя все, что пришло за окно группировки, одной транзакцией
+    DB_GROUP_COMMIT: bool = False
+    DB_GROUP_COMMIT_WINDOW_MS: float = 2  # Ожидание следующих операций после первой в пакете
+    DB_GROUP_COMMIT_MAX_BATCH: int = 256  # Максимальное число операций в одной транзакции
+
+    # Настройки пакетных операций
+    BULK_MAX_ITEMS: int = 500  # Максимальное число элементов в одном пакетном запросе
+    EXPORT_CHUNK_SIZE: int = 1000  # Число строк, читаемых из базы за раз при выгрузке
+    IMPORT_CHUNK_SIZE: int = 1000  # Число строк, вставляемых в одной транзакции при импорте
+
+    # Настройки индекса приоритетов в памяти
+    TASK_INDEX_MAX_TASKS: int = 200_000  # Суммарный лимит задач во всех индексах
+
+    # Настройки расписания
+    SCHEDULE_CACHE_SIZE: int = 256  # Число расписаний (пользователь, интервал) в кэше
+    # Приоритеты для расписания рассчитываются на начало интервала такой длины,
+    # поэтому повторные запросы в его пределах отдаются из кэша
+    SCHEDULE_PRIORITY_RESOLUTION_SECONDS: int = 300
+
+    # Настройки сводки главного экрана
+    DASHBOARD_TASKS_LIMIT: int = 10  # Число задач в списках самых приоритетных и просроченных
     
     class Config:
         """Конфигурация Pydantic."""
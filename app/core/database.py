@@ -1,16 +1,208 @@
 """Настройки и инициализация базы данных."""
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+import asyncio
+import logging
+from contextlib import suppress
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+# Ключ info сессии со списком действий, выполняемых после фиксации общей транзакции
+_AFTER_COMMIT = "after_commit"
+
+def register_sqlite_functions(dbapi_connection, connection_record):
+    """Зарегистрировать пользовательские SQL-функции в новом соединении SQLite."""
+    # Импорт внутри функции: модуль приоритетов зависит от моделей, а модели - от Base
+    from app.core.priority import PRIORITY_SQL_FUNCTION, sqlite_task_priority
+
+    dbapi_connection.run_async(
+        lambda conn: conn.create_function(
+            PRIORITY_SQL_FUNCTION, 6, sqlite_task_priority, deterministic=True
+        )
+    )
+
+def sqlite_pragmas() -> List[Tuple[str, Any]]:
+    """PRAGMA профиля SQLite из настроек в порядке выполнения."""
+    return [
+        # Ожидание блокировки задается первым: смена режима журнала сама требует блокировки
+        ("busy_timeout", settings.SQLITE_BUSY_TIMEOUT_MS),
+        ("journal_mode", settings.SQLITE_JOURNAL_MODE),
+        ("synchronous", settings.SQLITE_SYNCHRONOUS),
+        ("mmap_size", settings.SQLITE_MMAP_SIZE),
+        ("cache_size", settings.SQLITE_CACHE_SIZE),
+        ("temp_store", settings.SQLITE_TEMP_STORE),
+    ]
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Применить профиль SQLite к новому соединению."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in sqlite_pragmas():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+def _engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Параметры движка. Файловым базам и серверным СУБД нужен пул соединений заданного
+    размера (для файлов SQLite драйвер по умолчанию открывает соединение на каждую
+    сессию); база SQLite в памяти живет в одном соединении и остается без пула.
+    """
+    options: Dict[str, Any] = {"echo": settings.DB_ECHO, "future": True}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+def build_engine(database_url: str) -> AsyncEngine:
+    """Создать асинхронный движок с пулом и профилем соединений из настроек."""
+    engine = create_async_engine(database_url, **_engine_options(database_url))
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+        event.listen(engine.sync_engine, "connect", register_sqlite_functions)
+    return engine
+
+def after_commit(db: AsyncSession, callback: Callable[[], None]) -> None:
+    """
+    Выполнить callback после фиксации изменений сессии: сразу, если сессия
+    зафиксировала их сама, или после общей транзакции координатора записи.
+    Вызывается после db.commit(); так кэши процесса не опережают базу.
+    """
+    callbacks = db.info.get(_AFTER_COMMIT)
+    if callbacks is None:
+        callback()
+    else:
+        callbacks.append(callback)
+
+class WriteCoordinator:
+    """
+    Единственный писатель базы. Задача-писатель выбирает операции записи из очереди
+    и выполняет все, что пришло за окно группировки, в одной транзакции, каждую -
+    в своей точке сохранения: commit() операции только освобождает точку, ошибка
+    откатывает лишь ее. После общей фиксации каждый вызывающий получает свой
+    результат или ошибку.
+    """
+
+    def __init__(self, engine: AsyncEngine, window_seconds: float, max_batch: int):
+        self.engine = engine
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    async def submit(self, operation: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        """Поставить операцию в очередь и дождаться ее результата после фиксации."""
+        loop = asyncio.get_running_loop()
+        if self._writer is None or self._writer.done() or self._loop is not loop:
+            # Писатель запускается при первой записи в текущем цикле событий
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((operation, future))
+        return await future
+
+    async def stop(self) -> None:
+        """Дождаться выполнения поставленных операций и остановить писателя."""
+        if self._writer is None or self._loop is not asyncio.get_running_loop():
+            return
+        if not self._writer.done():
+            await self._queue.join()
+            self._writer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._writer
+        self._writer = None
+
+    async def _run(self) -> None:
+        """Цикл писателя: собрать пакет операций и выполнить его."""
+        while True:
+            batch = [await self._queue.get()]
+            if self.window_seconds > 0:
+                await asyncio.sleep(self.window_seconds)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._execute(batch)
+            except Exception as exc:
+                # Писатель продолжает работу: иначе операции в очереди не дождутся ответа
+                logger.exception("Write batch failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _execute(self, batch: List[Tuple[Callable, asyncio.Future]]) -> None:
+        """Выполнить пакет в одной транзакции и передать результаты вызывающим."""
+        outcomes = []
+        try:
+            async with self.engine.connect() as conn:
+                await conn.begin()
+                if self.engine.dialect.name == "sqlite":
+                    # Драйвер открывает транзакцию только перед изменением данных:
+                    # без явного BEGIN первая точка сохранения стала бы отдельной
+                    # транзакцией. IMMEDIATE сразу берет блокировку записи
+                    await conn.exec_driver_sql("BEGIN IMMEDIATE")
+                for operation, future in batch:
+                    session = AsyncSession(
+                        bind=conn,
+                        join_transaction_mode="create_savepoint",
+                        expire_on_commit=False,
+                        info={_AFTER_COMMIT: []}
+                    )
+                    try:
+                        result = await operation(session)
+                    except Exception as exc:
+                        await session.rollback()
+                        outcomes.append((future, None, exc, []))
+                    else:
+                        outcomes.append((future, result, None, session.info[_AFTER_COMMIT]))
+                    finally:
+                        await session.close()
+                await conn.commit()
+        except Exception as exc:
+            # Общая транзакция не зафиксирована: не применена ни одна операция пакета
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for future, result, error, callbacks in outcomes:
+            if error is None:
+                for callback in callbacks:
+                    # Изменения уже зафиксированы: ошибка обновления кэшей не должна
+                    # оставить без ответа эту и следующие операции пакета
+                    try:
+                        callback()
+                    except Exception:
+                        logger.exception("After-commit callback failed")
+            # Вызывающий мог перестать ждать: операция все равно применена
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
 # Создаем асинхронный движок SQLAlchemy
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True
-)
+engine = build_engine(settings.DATABASE_URL)
 
 # Создаем фабрику сессий
 async_session = sessionmaker(
@@ -19,6 +211,26 @@ async_session = sessionmaker(
     expire_on_commit=False
 )
 
+# Координатор записи; None - каждая операция фиксирует свою транзакцию сама
+write_coordinator: Optional[WriteCoordinator] = None
+if settings.DB_GROUP_COMMIT:
+    write_coordinator = WriteCoordinator(
+        engine, settings.DB_GROUP_COMMIT_WINDOW_MS / 1000, settings.DB_GROUP_COMMIT_MAX_BATCH
+    )
+
+def coordinated_write(func):
+    """
+    Операция записи CRUD (первый аргумент - сессия). При включенном координаторе
+    она выполняется задачей-писателем в общей транзакции, иначе - в сессии вызывающего.
+    """
+    @wraps(func)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        # Операция, вызванная из другой операции, выполняется в ее сессии
+        if write_coordinator is None or _AFTER_COMMIT in db.info:
+            return await func(db, *args, **kwargs)
+        return await write_coordinator.submit(lambda session: func(session, *args, **kwargs))
+    return wrapper
+
 # Базовый класс для моделей
 Base = declarative_base()
 
@@ -30,7 +242,21 @@ async def get_db():
         finally:
             await session.close()
 
+def get_session_factory() -> sessionmaker:
+    """
+    Получить фабрику сессий.
+    Используется обработчиками, которые работают с базой после отправки заголовков
+    ответа (потоковая выдача): сессия из get_db к этому моменту уже закрыта.
+    """
+    return async_session
+
 async def init_db():
     """Инициализировать базу данных."""
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all) 
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+
+async def close_db():
+    """Дождаться поставленных операций записи и закрыть соединения с базой."""
+    if write_coordinator is not None:
+        await write_coordinator.stop()
+    await engine.dispose()
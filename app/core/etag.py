@@ -0,0 +1,38 @@
+"""Условные запросы: ETag по версии данных пользователя и ответы 304 Not Modified."""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Response
+
+# Ответы зависят от пользователя и должны перепроверяться при каждом запросе
+CACHE_CONTROL = "private, no-cache"
+
+def make_etag(user_id: int, version: int, moment: Optional[datetime] = None) -> str:
+    """
+    ETag ответа по версии данных пользователя.
+    moment - момент расчета приоритетов, если от него зависит ответ и он не задан в URL.
+    """
+    tag = f"{user_id}.{version}"
+    if moment is not None:
+        tag += f".{moment:%Y%m%d%H%M%S%f}"
+    return f'"{tag}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Совпадает ли etag с одним из значений заголовка If-None-Match (слабое сравнение)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+
+def set_cache_headers(response: Response, etag: str) -> None:
+    """Добавить к ответу заголовки ETag и Cache-Control."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+def not_modified(etag: str) -> Response:
+    """Ответ 304: у клиента актуальная версия ресурса."""
+    response = Response(status_code=304)
+    set_cache_headers(response, etag)
+    return response
@@ -0,0 +1,72 @@
+"""Потоковая выгрузка задач в NDJSON и CSV."""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+from sqlalchemy import Row
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.crud.task import TASK_COLUMNS, stream_task_rows
+from app.schemas.task import TaskExportFormat
+
+EXPORT_FIELDS = [column.key for column in TASK_COLUMNS]
+
+MEDIA_TYPES = {
+    TaskExportFormat.NDJSON: "application/x-ndjson",
+    TaskExportFormat.CSV: "text/csv",
+}
+
+def _export_value(value):
+    """Привести значение колонки к виду, в котором его отдает API."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+def _export_record(row: Row) -> dict:
+    """Запись выгрузки в формате схемы задачи."""
+    record = {field: _export_value(value) for field, value in zip(EXPORT_FIELDS, row)}
+    if record["estimated_duration"] is not None:
+        record["estimated_duration"] = float(record["estimated_duration"])
+    return record
+
+def _ndjson_chunk(rows: Sequence[Row]) -> str:
+    """Часть выгрузки NDJSON: по одной задаче в строке."""
+    return "".join(
+        json.dumps(_export_record(row), ensure_ascii=False) + "\n" for row in rows
+    )
+
+def _csv_chunk(rows: Sequence[Row], header: bool = False) -> str:
+    """Часть выгрузки CSV, при необходимости с заголовком."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    if header:
+        writer.writeheader()
+    writer.writerows(_export_record(row) for row in rows)
+    return buffer.getvalue()
+
+async def export_tasks(
+    session_factory: sessionmaker,
+    user_id: int,
+    export_format: TaskExportFormat,
+    chunk_size: int = settings.EXPORT_CHUNK_SIZE
+) -> AsyncIterator[str]:
+    """
+    Выгрузить задачи пользователя частями для StreamingResponse.
+    Генератор открывает собственную сессию: он выполняется после того,
+    как обработчик запроса вернул ответ.
+    """
+    async with session_factory() as session:
+        if export_format == TaskExportFormat.CSV:
+            yield _csv_chunk([], header=True)
+        async for rows in stream_task_rows(session, user_id, chunk_size):
+            if export_format == TaskExportFormat.CSV:
+                yield _csv_chunk(rows)
+            else:
+                yield _ndjson_chunk(rows)
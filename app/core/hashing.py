@@ -0,0 +1,74 @@
+"""Хеширование паролей вне цикла событий."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+# Хеши с другой стоимостью считаются устаревшими и пересчитываются при входе
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt освобождает GIL, поэтому пул потоков дает реальный параллелизм;
+# размер пула ограничивает число одновременных вычислений хеша
+_executor: Optional[ThreadPoolExecutor] = None
+if settings.PASSWORD_HASH_WORKERS > 0:
+    _executor = ThreadPoolExecutor(
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        thread_name_prefix="password-hash"
+    )
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Проверить соответствие пароля хешу."""
+    try:
+        return pwd_context.verify(plain_password, hashed_password)
+    except ValueError:
+        return False  # Поврежденный или неизвестный формат хеша
+
+def get_password_hash(password: str) -> str:
+    """Получить хеш пароля."""
+    return pwd_context.hash(password)
+
+def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Проверить пароль и, если хеш устарел, вернуть новый хеш
+    с текущей стоимостью bcrypt.
+    """
+    try:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    except ValueError:
+        return False, None
+
+async def _run(func, *args):
+    """Выполнить функцию в пуле хеширования (или синхронно, если пул отключен)."""
+    if _executor is None:
+        return func(*args)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args))
+
+async def get_password_hash_async(password: str) -> str:
+    """Получить хеш пароля, не блокируя цикл событий."""
+    return await _run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Проверить пароль, не блокируя цикл событий."""
+    return await _run(verify_password, plain_password, hashed_password)
+
+async def verify_and_update_password_async(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """Проверить пароль и получить обновленный хеш, не блокируя цикл событий."""
+    return await _run(verify_and_update_password, plain_password, hashed_password)
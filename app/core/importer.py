@@ -0,0 +1,178 @@
+"""Потоковый импорт задач и категорий из JSON-выгрузок."""
+
+import codecs
+import json
+import re
+import time
+from typing import AsyncIterable, Iterator, List, NamedTuple, Optional, Union
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.schedule_cache import schedule_cache
+from app.crud.user import bump_data_version
+from app.models.category import Category
+from app.models.task import Task
+from app.schemas.category import CategoryCreate
+from app.schemas.data_import import ImportReport, ImportRowError, ImportTarget
+from app.schemas.task import TaskCreate
+
+# Схема проверки и модель для каждого типа записей
+IMPORT_TARGETS = {
+    ImportTarget.TASKS: (TaskCreate, Task),
+    ImportTarget.CATEGORIES: (CategoryCreate, Category),
+}
+
+# Предельный размер одной записи; запись длиннее считается поврежденной
+MAX_RECORD_CHARS = 1_000_000
+
+# Сколько отклоненных записей возвращать в отчете (счетчик учитывает все)
+MAX_REPORTED_ERRORS = 1000
+
+_decoder = json.JSONDecoder()
+# Разделители между записями: пробелы, запятые и скобки массива верхнего уровня
+_SEPARATORS = re.compile(r"[\s,\[\]]*")
+# Начало следующей записи: строка, начинающаяся с объекта или массива
+_NEXT_RECORD = re.compile(r"\n[ \t\r]*[{\[]")
+
+class ParsedRecord(NamedTuple):
+    """Разобранная запись: номер строки начала, значение или ошибка разбора."""
+    line: int
+    value: object
+    error: Optional[str]
+
+class RecordParser:
+    """
+    Инкрементальный разбор потока JSON-записей.
+    Понимает NDJSON, JSON-массив и записи, записанные подряд (как в test_data.json).
+    Текст, который не удается разобрать, пропускается до следующей строки,
+    начинающейся с { или [, и возвращается как ошибка.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._line = 1
+
+    def feed(self, text: str) -> Iterator[ParsedRecord]:
+        """Добавить часть входных данных и вернуть записи, которые уже можно разобрать."""
+        self._buffer += text
+        return self._parse(final=False)
+
+    def close(self) -> Iterator[ParsedRecord]:
+        """Разобрать остаток входных данных."""
+        return self._parse(final=True)
+
+    def _parse(self, final: bool) -> Iterator[ParsedRecord]:
+        buffer = self._buffer
+        pos = 0
+        while True:
+            separators_end = _SEPARATORS.match(buffer, pos).end()
+            self._line += buffer.count("\n", pos, separators_end)
+            pos = separators_end
+            if pos >= len(buffer):
+                break
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+                record = ParsedRecord(self._line, value, None)
+            except json.JSONDecodeError as exc:
+                # Строки JSON не содержат переводов строк, поэтому незакрытая строка
+                # или ошибка в самом конце буфера означают, что запись еще не дочитана
+                truncated = exc.pos >= len(buffer) or exc.msg.startswith("Unterminated string")
+                next_record = _NEXT_RECORD.search(buffer, pos)
+                if (
+                    not final
+                    and (truncated or next_record is None)
+                    and len(buffer) - pos <= MAX_RECORD_CHARS
+                ):
+                    break
+                end = next_record.start() + 1 if next_record else len(buffer)
+                record = ParsedRecord(self._line, None, f"Invalid JSON: {exc.msg}")
+            yield record
+            self._line += buffer.count("\n", pos, end)
+            pos = end
+        self._buffer = buffer[pos:]
+
+def _validation_message(exc: ValidationError) -> str:
+    """Краткое описание ошибок проверки записи."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+async def import_records(
+    db: AsyncSession,
+    user_id: int,
+    chunks: AsyncIterable[Union[str, bytes]],
+    target: ImportTarget,
+    chunk_size: int = settings.IMPORT_CHUNK_SIZE
+) -> ImportReport:
+    """
+    Импортировать записи пользователя из потока частей входных данных.
+    Записи проверяются схемой и вставляются пакетами по chunk_size строк,
+    каждый пакет - в отдельной транзакции. Отклоненные записи не прерывают импорт.
+    """
+    schema, model = IMPORT_TARGETS[target]
+    parser = RecordParser()
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    batch: List[dict] = []
+    errors: List[ImportRowError] = []
+    imported = 0
+    rejected = 0
+    start = time.perf_counter()
+
+    async def flush():
+        nonlocal imported
+        if batch:
+            await db.execute(insert(model), batch)
+            await bump_data_version(db, user_id)
+            await db.commit()
+            imported += len(batch)
+            batch.clear()
+
+    def reject(record: ParsedRecord, error: str):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            value = record.value if isinstance(record.value, dict) else None
+            errors.append(ImportRowError(line=record.line, error=error, record=value))
+
+    def accept(record: ParsedRecord):
+        if record.error is not None:
+            reject(record, record.error)
+        elif not isinstance(record.value, dict):
+            reject(record, "Record must be a JSON object")
+        else:
+            try:
+                row = schema.model_validate(record.value).model_dump()
+            except ValidationError as exc:
+                reject(record, _validation_message(exc))
+            else:
+                batch.append({**row, "user_id": user_id})
+
+    try:
+        async for chunk in chunks:
+            text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            for record in parser.feed(text):
+                accept(record)
+                if len(batch) >= chunk_size:
+                    await flush()
+        for record in parser.close():
+            accept(record)
+        await flush()
+    finally:
+        # Индекс приоритетов сбрасывать не нужно: каждый пакет меняет версию данных,
+        # и индекс перестраивается при следующем чтении в любом процессе, в том числе
+        # в сервере API, когда импорт выполняет утилита import_data.py
+        if target == ImportTarget.TASKS and imported:
+            schedule_cache.invalidate(user_id)
+
+    elapsed = time.perf_counter() - start
+    return ImportReport(
+        imported=imported,
+        rejected=rejected,
+        errors=errors,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(imported / elapsed, 1) if elapsed > 0 else 0.0
+    )
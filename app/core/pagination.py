@@ -0,0 +1,37 @@
+"""Курсорная (keyset) пагинация списков."""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, NamedTuple, Optional
+
+# Заголовок ответа с курсором следующей страницы
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class Page(NamedTuple):
+    """
+    Страница результатов и ключ, с которого начинается следующая страница.
+    evaluated_at - момент расчета приоритетов, если порядок зависит от него
+    и не задан курсором.
+    """
+    items: list
+    next_cursor: Optional[Dict[str, Any]]
+    evaluated_at: Optional[datetime] = None
+
+def encode_cursor(key: Dict[str, Any]) -> str:
+    """Упаковать ключ сортировки в непрозрачную строку курсора."""
+    raw = json.dumps(key, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Распаковать курсор, созданный encode_cursor.
+    Выбрасывает ValueError, если курсор поврежден.
+    """
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(key, dict):
+        raise ValueError("Invalid cursor")
+    return key
@@ -1,58 +1,77 @@
 """Алгоритм расчета приоритета задач."""
 
-from datetime import datetime
-from typing import List
+import math
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
 
 from app.models.task import Task
 
-def calculate_time_factor(created_at: datetime) -> float:
+# Имя SQL-функции, под которой calculate_priority регистрируется в SQLite
+PRIORITY_SQL_FUNCTION = "task_priority"
+
+# Верхняя граница зависящего от времени множителя: (1 + 1) * (1 + 1)
+MAX_DYNAMIC_FACTOR = 4.0
+
+# Начиная с этого количества задач сортировка выполняется векторизованно
+BATCH_SORT_THRESHOLD = 32
+
+_MICROSECONDS_PER_HOUR = 3600 * 1_000_000
+
+def calculate_time_factor(created_at: datetime, now: Optional[datetime] = None) -> float:
     """
     Рассчитывает срочность на основе времени с момента создания.
     Задачи становятся более срочными со временем.
     """
-    hours_since_creation = (datetime.utcnow() - created_at).total_seconds() / 3600
-    
+    now = now or datetime.utcnow()
+    hours_since_creation = (now - created_at).total_seconds() / 3600
+
     # Экспоненциальный рост: срочность увеличивается со временем
     # После 24 часов: фактор срочности = 0.5
     # После 48 часов: фактор срочности = 0.75
     time_factor = 1 - (2 ** (-hours_since_creation / 24))
-    
+
     return time_factor
 
-def calculate_due_date_factor(task: Task) -> float:
-    """
-    Рассчитывает срочность на основе срока выполнения.
-    Задачи становятся более срочными по мере приближения дедлайна.
-    """
-    if not task.due_date:
+def _due_date_factor(due_date: Optional[date], now: datetime) -> float:
+    """Фактор срочности дедлайна по значению срока выполнения."""
+    if not due_date:
         return 0.0  # Отсутствие срока означает отсутствие срочности
-    
-    now = datetime.utcnow()
-    due_datetime = datetime.combine(task.due_date, datetime.min.time())
+
+    due_datetime = datetime.combine(due_date, datetime.min.time())
     hours_until_due = (due_datetime - now).total_seconds() / 3600
-    
+
     if hours_until_due <= 0:
         return 1.0  # Просроченные задачи получают максимальную срочность
-    
+
     # Экспоненциальный рост: срочность увеличивается по мере приближения дедлайна
     # После 24 часов: фактор срочности = 0.5
     # После 48 часов: фактор срочности = 0.25
-    due_date_factor = 2 ** (-hours_until_due / 24)
-    
-    return due_date_factor
+    return 2 ** (-hours_until_due / 24)
+
+def calculate_due_date_factor(task: Task, now: Optional[datetime] = None) -> float:
+    """
+    Рассчитывает срочность на основе срока выполнения.
+    Задачи становятся более срочными по мере приближения дедлайна.
+    """
+    return _due_date_factor(task.due_date, now or datetime.utcnow())
+
+def _duration_factor(estimated_duration: Optional[float]) -> float:
+    """Фактор длительности по значению предполагаемой длительности."""
+    if not estimated_duration or estimated_duration <= 0:
+        return 1.0  # Отсутствие длительности означает нейтральный фактор
+
+    # Нормализация длительности к 24 часам
+    return 1.0 + (estimated_duration / 24.0) * 0.2  # Максимальный бонус 20%
 
 def calculate_duration_factor(task: Task) -> float:
     """
     Рассчитывает фактор на основе предполагаемой длительности.
     Более длительные задачи получают небольшой бонус к приоритету.
     """
-    if not task.estimated_duration or task.estimated_duration <= 0:
-        return 1.0  # Отсутствие длительности означает нейтральный фактор
-    
-    # Нормализация длительности к 24 часам
-    duration_factor = 1.0 + (task.estimated_duration / 24.0) * 0.2  # Максимальный бонус 20%
-    
-    return duration_factor
+    return _duration_factor(task.estimated_duration)
 
 def get_status_factor(status: str) -> float:
     """
@@ -66,7 +85,79 @@ def get_status_factor(status: str) -> float:
     }
     return status_factors.get(status.lower(), 1.0)
 
-def calculate_priority(task: Task) -> float:
+def _static_priority_values(
+    priority: int,
+    status: str,
+    estimated_duration: Optional[float]
+) -> float:
+    """Не зависящая от времени часть приоритета по значениям полей задачи."""
+    return priority * get_status_factor(status) * _duration_factor(estimated_duration)
+
+def _dynamic_factor_values(
+    created_at: datetime,
+    due_date: Optional[date],
+    now: datetime
+) -> float:
+    """Зависящий от времени множитель приоритета, лежит в диапазоне [1, 4)."""
+    time_factor = calculate_time_factor(created_at, now)
+    due_date_factor = _due_date_factor(due_date, now)
+    return (1 + time_factor) * (1 + due_date_factor)
+
+def _calculate_priority_values(
+    priority: int,
+    status: str,
+    created_at: datetime,
+    due_date: Optional[date],
+    estimated_duration: Optional[float],
+    now: datetime
+) -> float:
+    """Рассчитывает приоритет по значениям полей задачи."""
+    # Комбинируем все факторы: статическую часть (базовый приоритет, статус,
+    # длительность) умножаем на временные факторы создания и дедлайна
+    static_priority = _static_priority_values(priority, status, estimated_duration)
+    return static_priority * _dynamic_factor_values(created_at, due_date, now)
+
+def calculate_static_priority(task: Task) -> float:
+    """
+    Рассчитывает не зависящую от времени часть приоритета задачи:
+    базовый приоритет с учетом статуса и длительности.
+    """
+    return _static_priority_values(task.priority or 0, task.status or "", task.estimated_duration)
+
+def calculate_dynamic_factor(
+    created_at: datetime,
+    due_date: Optional[date],
+    now: datetime
+) -> float:
+    """
+    Рассчитывает зависящий от времени множитель приоритета.
+    Приоритет задачи равен calculate_static_priority * calculate_dynamic_factor.
+    """
+    return _dynamic_factor_values(created_at or now, due_date, now)
+
+def priority_growth_rate(
+    static_priority: float,
+    created_at: Optional[datetime],
+    due_date: Optional[date],
+    now: datetime
+) -> float:
+    """
+    Верхняя оценка скорости роста приоритета (в единицах приоритета за час)
+    в любой момент начиная с now.
+    Приоритет не убывает со временем: фактор создания растет и насыщается,
+    фактор дедлайна растет до 1 к моменту срока и дальше не меняется.
+    """
+    if not static_priority:
+        return 0.0
+    # Производная фактора создания максимальна сейчас и дальше только убывает
+    time_slope = 2 ** (-(now - (created_at or now)).total_seconds() / 3600 / 24)
+    due_datetime = datetime.combine(due_date, datetime.min.time()) if due_date else None
+    # (1 + due_date_factor) не превышает 2, а его производная - ln2/24 до наступления срока
+    due_slope = 1.0 if due_datetime and due_datetime > now else 0.0
+    due_multiplier = 2.0 if due_date else 1.0
+    return static_priority * math.log(2) / 24 * (time_slope * due_multiplier + 2.0 * due_slope)
+
+def calculate_priority(task: Task, now: Optional[datetime] = None) -> float:
     """
     Рассчитывает приоритет задачи на основе различных факторов:
     - Время с момента создания (срочность)
@@ -75,29 +166,134 @@ def calculate_priority(task: Task) -> float:
     - Текущий статус
     - Пользовательский приоритет
     """
-    # Базовый приоритет от пользователя (1-5)
-    base_priority = task.priority
-
-    # Временные факторы
-    time_factor = calculate_time_factor(task.created_at)
-    due_date_factor = calculate_due_date_factor(task)
-    duration_factor = calculate_duration_factor(task)
-    
-    # Фактор статуса
-    status_factor = get_status_factor(task.status)
-    
-    # Комбинируем все факторы
-    # Используем умножение для time_factor и due_date_factor
-    final_priority = base_priority * (1 + time_factor) * (1 + due_date_factor) * status_factor * duration_factor
-    
-    return final_priority
+    now = now or datetime.utcnow()
+    return _calculate_priority_values(
+        task.priority,
+        task.status,
+        task.created_at or now,
+        task.due_date,
+        task.estimated_duration,
+        now
+    )
+
+def sqlite_task_priority(
+    priority: Optional[int],
+    status: Optional[str],
+    created_at: Optional[str],
+    due_date: Optional[str],
+    estimated_duration: Optional[float],
+    now: str
+) -> float:
+    """
+    Реализация SQL-функции task_priority для SQLite.
+    Принимает значения колонок в том виде, в котором их хранит SQLite
+    (даты строками, статус именем элемента перечисления).
+    """
+    now_dt = datetime.fromisoformat(now)
+    return _calculate_priority_values(
+        priority or 0,
+        status or "",
+        datetime.fromisoformat(created_at) if created_at else now_dt,
+        date.fromisoformat(due_date) if due_date else None,
+        estimated_duration,
+        now_dt
+    )
+
+def priority_expression(now: datetime):
+    """
+    SQL-выражение приоритета задачи на момент now.
+    Позволяет сортировать по приоритету в базе: ORDER BY ... LIMIT n.
+    """
+    return getattr(func, PRIORITY_SQL_FUNCTION)(
+        Task.priority,
+        Task.status,
+        Task.created_at,
+        Task.due_date,
+        Task.estimated_duration,
+        now
+    )
+
+def _hours_between(later: np.ndarray, earlier: np.ndarray) -> np.ndarray:
+    """Разница двух массивов datetime64 в часах."""
+    delta = (later - earlier).astype("timedelta64[us]").astype(np.float64)
+    return delta / _MICROSECONDS_PER_HOUR
+
+def calculate_priorities_batch(
+    created_at: np.ndarray,
+    due_date: np.ndarray,
+    estimated_duration: np.ndarray,
+    status: np.ndarray,
+    priority: np.ndarray,
+    now: Optional[datetime] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Векторизованный расчет приоритетов для столбцов задач.
+    Использует единый момент времени now для всех задач и дает
+    те же значения, что и calculate_priority.
+    Возвращает массив приоритетов и индексы задач по убыванию приоритета.
+    """
+    now64 = np.datetime64(now or datetime.utcnow(), "us")
+    created = np.asarray(created_at, dtype="datetime64[us]")
+    due = np.asarray(due_date, dtype="datetime64[D]").astype("datetime64[us]")
+    duration = np.asarray(estimated_duration, dtype=np.float64)
+    base_priority = np.asarray(priority, dtype=np.float64)
+
+    # Отсутствующие даты заменяются на now, чтобы не считать с NaT
+    missing_created = np.isnat(created)
+    missing_due = np.isnat(due)
+    created = np.where(missing_created, now64, created)
+    due = np.where(missing_due, now64, due)
+
+    # Фактор времени с момента создания; отсутствие даты создания - нулевая срочность
+    time_factor = 1 - np.exp2(-_hours_between(now64, created) / 24)
+
+    # Фактор срока выполнения: 0 без срока, 1 для просроченных задач
+    hours_until_due = _hours_between(due, now64)
+    due_date_factor = np.where(
+        missing_due,
+        0.0,
+        np.where(hours_until_due <= 0, 1.0, np.exp2(-np.maximum(hours_until_due, 0) / 24))
+    )
+
+    duration_factor = np.where(duration > 0, 1.0 + (duration / 24.0) * 0.2, 1.0)
+
+    # Словарь статусов вычисляется один раз для каждого уникального значения
+    statuses = np.asarray(status, dtype=object)
+    status_factors = {value: get_status_factor(value) for value in set(statuses.tolist())}
+    status_factor = np.fromiter(
+        map(status_factors.__getitem__, statuses), dtype=np.float64, count=len(statuses)
+    )
+
+    static_priority = base_priority * status_factor * duration_factor
+    scores = static_priority * ((1 + time_factor) * (1 + due_date_factor))
+    # Стабильная сортировка сохраняет исходный порядок задач с равным приоритетом
+    order = np.argsort(-scores, kind="stable")
+    return scores, order
+
+def task_columns(tasks: Sequence[Task]) -> Dict[str, np.ndarray]:
+    """Собрать столбцы для calculate_priorities_batch из списка задач."""
+    return {
+        "created_at": np.array(
+            [task.created_at for task in tasks], dtype="datetime64[us]"
+        ),
+        "due_date": np.array([task.due_date for task in tasks], dtype="datetime64[D]"),
+        "estimated_duration": np.array(
+            [task.estimated_duration or 0 for task in tasks], dtype=np.float64
+        ),
+        "status": np.array([task.status or "" for task in tasks], dtype=object),
+        "priority": np.array([task.priority or 0 for task in tasks], dtype=np.float64),
+    }
 
 def sort_tasks_by_priority(tasks: List[Task]) -> List[Task]:
     """
     Сортирует задачи по их рассчитанному приоритету.
     """
+    now = datetime.utcnow()
+    if len(tasks) >= BATCH_SORT_THRESHOLD:
+        _, order = calculate_priorities_batch(**task_columns(tasks), now=now)
+        return [tasks[index] for index in order]
     return sorted(
         tasks,
-        key=lambda task: calculate_priority(task),
+        key=lambda task: calculate_priority(task, now),
         reverse=True
-    )
\ No newline at end of file
+    )
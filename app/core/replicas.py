@@ -0,0 +1,199 @@
+"""Маршрутизация чтений на реплики базы данных."""
+
+import itertools
+import time
+from typing import Dict, List, Optional, Set
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.database import build_engine, engine
+from app.core.security import get_current_user
+from app.models.user import User
+
+# Число записей в журнале недавних записей, после которого из него удаляются устаревшие
+_RECENT_WRITES_PRUNE_SIZE = 10_000
+
+def read_only_url(database_url: str) -> URL:
+    """
+    URL реплики. Файл SQLite открывается только для чтения: реплика не может быть
+    изменена приложением, а отсутствующий файл дает ошибку, а не пустую базу.
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return url
+    if url.query.get("uri") == "true":
+        return url
+    return url.set(
+        database=f"file:{url.database}",
+        query={**url.query, "mode": "ro", "uri": "true"}
+    )
+
+class RoutingSession(Session):
+    """
+    Сессия, которая читает с реплики, пока в ней ничего не записано.
+    Запись (flush или INSERT/UPDATE/DELETE) и все запросы после нее выполняются
+    на основной базе, поэтому сессия видит собственные изменения.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or (clause is not None and clause.is_dml):
+            self.info["wrote"] = True
+        replica: Optional[AsyncEngine] = self.info.get("replica")
+        if replica is not None and not self.info.get("wrote"):
+            return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+class ReplicaSet:
+    """Реплики для чтения, выбираемые по кругу; недоступные временно пропускаются."""
+
+    def __init__(self, urls: List[str], retry_seconds: float, check_seconds: float = 0):
+        self.engines = [build_engine(read_only_url(url)) for url in urls]
+        self.retry_seconds = retry_seconds
+        self.check_seconds = check_seconds
+        self._down_until = [0.0] * len(self.engines)
+        self._checked_until = [0.0] * len(self.engines)
+        self._order = itertools.cycle(range(len(self.engines)))
+
+    async def acquire(self) -> Optional[AsyncEngine]:
+        """
+        Выбрать доступную реплику. Доступность проверяется получением соединения
+        из пула не чаще раза в check_seconds; реплика, к которой не удалось
+        подключиться, не используется retry_seconds. Возвращает None, если реплик
+        нет или все недоступны.
+        """
+        for _ in range(len(self.engines)):
+            index = next(self._order)
+            now = time.monotonic()
+            if self._down_until[index] > now:
+                continue
+            replica = self.engines[index]
+            if self._checked_until[index] > now:
+                return replica
+            try:
+                async with replica.connect():
+                    pass
+            except (SQLAlchemyError, OSError):
+                self._down_until[index] = time.monotonic() + self.retry_seconds
+                continue
+            self._checked_until[index] = time.monotonic() + self.check_seconds
+            return replica
+        return None
+
+    async def dispose(self) -> None:
+        """Закрыть соединения всех реплик."""
+        for replica in self.engines:
+            await replica.dispose()
+
+class RecentWrites:
+    """
+    Последние записи пользователей: момент и версия данных.
+    Реплика может отставать от основной базы, поэтому в течение lag_seconds после
+    записи пользователь читает с основной, а позже - с реплики, только если она уже
+    содержит версию данных последней записи. Иначе кэши процесса (индекс приоритетов,
+    страницы, расписания), которые сбрасываются только записями, заполнились бы
+    устаревшими данными реплики.
+    """
+
+    def __init__(self, lag_seconds: float):
+        self.lag_seconds = lag_seconds
+        self._written_at: Dict[int, float] = {}
+        self._versions: Dict[int, int] = {}
+        # Реплики, на которых уже есть версия последней записи пользователя
+        self._confirmed: Dict[int, Set[AsyncEngine]] = {}
+
+    def mark(self, user_id: int, version: int) -> None:
+        """Отметить запись данных пользователя с версией данных version."""
+        now = time.monotonic()
+        if len(self._written_at) >= _RECENT_WRITES_PRUNE_SIZE:
+            self._written_at = {
+                key: moment for key, moment in self._written_at.items()
+                if now - moment < self.lag_seconds
+            }
+        self._written_at[user_id] = now
+        if len(self._versions) >= _RECENT_WRITES_PRUNE_SIZE and user_id not in self._versions:
+            # Версии давних записей реплики почти наверняка уже получили
+            oldest = next(iter(self._versions))
+            del self._versions[oldest]
+            self._confirmed.pop(oldest, None)
+        self._versions[user_id] = max(version, self._versions.pop(user_id, 0))
+        self._confirmed.pop(user_id, None)
+
+    def is_recent(self, user_id: int) -> bool:
+        """Писал ли пользователь достаточно недавно, чтобы реплика могла отставать."""
+        moment = self._written_at.get(user_id)
+        return moment is not None and time.monotonic() - moment < self.lag_seconds
+
+    def version(self, user_id: int) -> int:
+        """Версия данных последней записи пользователя в этом процессе; 0 - записей не было."""
+        return self._versions.get(user_id, 0)
+
+    def unconfirmed_version(self, user_id: int, replica: AsyncEngine) -> int:
+        """
+        Версия последней записи пользователя, которую нужно проверить на реплике;
+        0 - записей не было или реплика уже подтвердила эту версию.
+        """
+        if replica in self._confirmed.get(user_id, ()):
+            return 0
+        return self.version(user_id)
+
+    def confirm(self, user_id: int, replica: AsyncEngine) -> None:
+        """
+        Отметить, что реплика содержит версию последней записи пользователя:
+        до следующей записи версия на ней не проверяется.
+        """
+        self._confirmed.setdefault(user_id, set()).add(replica)
+
+    def clear(self) -> None:
+        """Очистить журнал."""
+        self._written_at.clear()
+        self._versions.clear()
+        self._confirmed.clear()
+
+replicas = ReplicaSet(
+    settings.DATABASE_READ_URLS,
+    settings.READ_REPLICA_RETRY_SECONDS,
+    settings.READ_REPLICA_CHECK_SECONDS
+)
+recent_writes = RecentWrites(settings.READ_REPLICA_LAG_SECONDS)
+
+# Фабрика сессий для чтения: по умолчанию связана с основной базой,
+# реплика назначается сессии в get_read_db
+read_session = sessionmaker(
+    engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False
+)
+
+async def _replica_version(session: AsyncSession, user_id: int) -> int:
+    """Версия данных пользователя на реплике сессии."""
+    result = await session.execute(select(User.data_version).where(User.id == user_id))
+    return result.scalar_one_or_none() or 0
+
+async def get_read_db(current_user: int = Depends(get_current_user)):
+    """
+    Получить сессию для чтения. Запросы выполняются на реплике, если она доступна,
+    пользователь недавно ничего не записывал и реплика содержит версию данных его
+    последней записи; иначе - на основной базе. Версия на реплике читается,
+    только пока реплика ее не подтвердила.
+    """
+    async with read_session() as session:
+        if not recent_writes.is_recent(current_user):
+            replica = await replicas.acquire()
+            if replica is not None:
+                session.info["replica"] = replica
+                known = recent_writes.unconfirmed_version(current_user, replica)
+                if known:
+                    if await _replica_version(session, current_user) < known:
+                        del session.info["replica"]
+                    else:
+                        recent_writes.confirm(current_user, replica)
+        try:
+            yield session
+        finally:
+            await session.close()
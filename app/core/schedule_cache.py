@@ -0,0 +1,89 @@
+"""Кэш расписаний пользователей и журнал изменений их задач."""
+
+from collections import deque
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Sequence
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+# Сколько последних изменений задач пользователя хранить для пересчета расписаний
+MAX_TRACKED_CHANGES = 64
+
+class ScheduleChange(NamedTuple):
+    """
+    Изменение задач пользователя, зафиксированное транзакцией с версией данных version.
+    saved - строки сохраненных задач (словари по колонкам TASK_COLUMNS).
+    """
+    version: int
+    saved: Sequence[dict]
+    deleted: Sequence[int]
+
+class ScheduleCache:
+    """
+    Расписания пользователей по интервалам и журнал изменений задач.
+    Расписание хранится вместе с версией данных пользователя, по которой оно
+    построено. Изменения, сделанные в этом процессе, записываются в журнал,
+    чтобы устаревшее расписание можно было пересчитать частично; изменения
+    из других процессов видны только по версии и требуют полного пересчета.
+    """
+
+    def __init__(self, maxsize: int):
+        self._schedules = LRUCache(maxsize)
+        self._changes = LRUCache(maxsize)
+
+    def get(self, user_id: int, start: datetime, end: datetime) -> Any:
+        """Получить закэшированное расписание пользователя на интервал."""
+        return self._schedules.get((user_id, start, end))
+
+    def set(self, user_id: int, start: datetime, end: datetime, schedule: Any) -> None:
+        """Сохранить расписание пользователя на интервал."""
+        self._schedules.set((user_id, start, end), schedule)
+
+    def tasks_changed(
+        self,
+        user_id: int,
+        version: int,
+        saved: Sequence[dict] = (),
+        deleted: Sequence[int] = ()
+    ) -> None:
+        """Записать изменение задач, зафиксированное с версией данных version."""
+        changes = self._changes.get(user_id)
+        if changes is None:
+            changes = deque(maxlen=MAX_TRACKED_CHANGES)
+            self._changes.set(user_id, changes)
+        changes.append(ScheduleChange(version, tuple(saved), tuple(deleted)))
+
+    def changes_since(
+        self,
+        user_id: int,
+        from_version: int,
+        to_version: int
+    ) -> Optional[List[ScheduleChange]]:
+        """
+        Изменения с версиями from_version + 1 ... to_version по порядку.
+        None, если какой-то версии нет в журнале (изменение сделано другим
+        процессом или вытеснено) - тогда расписание пересчитывается целиком.
+        """
+        changes = [
+            change
+            for change in self._changes.get(user_id, ())
+            if from_version < change.version <= to_version
+        ]
+        changes.sort(key=lambda change: change.version)
+        versions = [change.version for change in changes]
+        if versions != list(range(from_version + 1, to_version + 1)):
+            return None
+        return changes
+
+    def invalidate(self, user_id: int) -> None:
+        """Сбросить расписания и журнал изменений пользователя."""
+        self._changes.pop(user_id)
+        self._schedules.discard_where(lambda key, _: key[0] == user_id)
+
+    def clear(self) -> None:
+        """Сбросить все расписания и журналы."""
+        self._schedules.clear()
+        self._changes.clear()
+
+schedule_cache = ScheduleCache(settings.SCHEDULE_CACHE_SIZE)
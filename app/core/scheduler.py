@@ -0,0 +1,298 @@
+"""Планирование задач пользователя на временной интервал."""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.calendar import (
+    MICROSECONDS_PER_HOUR,
+    BusyIntervals,
+    FreeSlots,
+    busy_intervals,
+    from_microseconds,
+    to_microseconds,
+)
+from app.core.config import settings
+from app.core.priority import calculate_priorities_batch
+from app.core.schedule_cache import ScheduleChange, schedule_cache
+from app.crud.calendar_block import get_busy_blocks
+from app.crud.task import SCHEDULABLE_STATUSES, get_schedule_candidates, get_task_rows_by_ids
+from app.crud.user import get_data_version
+from app.schemas.task import ScheduledTask, ScheduleResponse
+
+class Slot(NamedTuple):
+    """Интервал, отведенный задаче: position - номер задачи в порядке размещения."""
+    position: int
+    start_time: datetime
+    end_time: datetime
+
+class SchedulePlan(NamedTuple):
+    """
+    Расписание на интервал вместе с данными для его частичного пересчета.
+    keys - ключи (-приоритет, id) задач-кандидатов по возрастанию, то есть
+    в порядке размещения; hours - их длительности в том же порядке;
+    busy - время, занятое блоками календаря.
+    """
+    version: int
+    evaluated_at: datetime
+    busy: BusyIntervals
+    keys: List[Tuple[float, int]]
+    hours: List[float]
+    scores: Dict[int, float]
+    slots: List[Slot]
+    rows: Dict[int, Mapping]
+    response: ScheduleResponse
+
+def evaluation_moment(now: datetime) -> datetime:
+    """
+    Момент, на который рассчитываются приоритеты для расписания:
+    начало текущего интервала длины SCHEDULE_PRIORITY_RESOLUTION_SECONDS.
+    """
+    seconds = (now - datetime.min) // timedelta(seconds=1)
+    return datetime.min + timedelta(
+        seconds=seconds - seconds % settings.SCHEDULE_PRIORITY_RESOLUTION_SECONDS
+    )
+
+def _scores(
+    priority: Sequence,
+    status: Sequence,
+    created_at: Sequence,
+    due_date: Sequence,
+    hours: np.ndarray,
+    now: datetime
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Приоритеты задач по столбцам значений и индексы по убыванию приоритета."""
+    return calculate_priorities_batch(
+        created_at=np.array(created_at, dtype="datetime64[us]"),
+        due_date=np.array(due_date, dtype="datetime64[D]"),
+        estimated_duration=hours,
+        status=np.array(status, dtype=object),
+        priority=np.array(priority, dtype=np.float64),
+        now=now
+    )
+
+def prioritize(
+    candidates: Sequence,
+    now: datetime
+) -> Tuple[List[int], List[float], List[float]]:
+    """
+    Упорядочить задачи-кандидаты по убыванию рассчитанного приоритета на момент now.
+    Возвращает ID, длительности (в часах) и приоритеты задач в этом порядке;
+    задачи с равным приоритетом остаются в порядке ID.
+    """
+    if not candidates:
+        return [], [], []
+    task_ids, priority, status, created_at, due_date, duration = zip(*candidates)
+    hours = np.array(duration, dtype=np.float64)
+    scores, order = _scores(priority, status, created_at, due_date, hours, now)
+    return np.array(task_ids)[order].tolist(), hours[order].tolist(), scores[order].tolist()
+
+def pack(hours: Sequence[float], free: FreeSlots, first: int = 0) -> List[Slot]:
+    """
+    Разместить задачи hours[first:] в заданном порядке: каждая занимает начало
+    самого раннего свободного интервала, в который помещается. Задача, для которой
+    места нет, пропускается: следующие, более короткие задачи еще могут поместиться.
+    """
+    slots = []
+    if first >= len(hours):
+        return slots
+    durations = np.rint(
+        np.asarray(hours[first:], dtype=np.float64) * MICROSECONDS_PER_HOUR
+    ).astype(np.int64).tolist()
+    shortest = min(durations)
+    for position, duration in enumerate(durations, first):
+        if free.longest < shortest:
+            break  # В свободное время не поместится ни одна задача
+        start_time = free.take(duration)
+        if start_time is not None:
+            slots.append(Slot(
+                position, from_microseconds(start_time), from_microseconds(start_time + duration)
+            ))
+    return slots
+
+def schedule_response(
+    tasks: Sequence[Mapping],
+    slots: Sequence[Slot],
+    start: datetime,
+    end: datetime
+) -> ScheduleResponse:
+    """Собрать ответ по строкам размещенных задач и их интервалам."""
+    scheduled = [
+        ScheduledTask(**task, start_time=slot.start_time, end_time=slot.end_time)
+        for task, slot in zip(tasks, slots)
+    ]
+    total_duration = sum(task.estimated_duration for task in scheduled)
+    # Коэффициент использования времени: доля интервала, занятая задачами
+    total_period = (end - start).total_seconds() / 3600
+    return ScheduleResponse(
+        tasks=scheduled,
+        total_duration=total_duration,
+        utilization_rate=total_duration / total_period if total_period > 0 else 0
+    )
+
+async def _finish_plan(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    version: int,
+    evaluated_at: datetime,
+    busy: BusyIntervals,
+    keys: List[Tuple[float, int]],
+    hours: List[float],
+    scores: Dict[int, float],
+    slots: List[Slot],
+    rows: Dict[int, Mapping]
+) -> SchedulePlan:
+    """Догрузить строки размещенных задач, которых нет в rows, и собрать расписание."""
+    placed = [keys[slot.position][1] for slot in slots]
+    missing = [task_id for task_id in placed if task_id not in rows]
+    for row in await get_task_rows_by_ids(db, missing, user_id):
+        rows[row.id] = dict(row._mapping)
+    # Задача могла быть удалена между запросами: ее интервал пропускается
+    tasks, kept = [], []
+    for task_id, slot in zip(placed, slots):
+        if task_id in rows:
+            tasks.append(rows[task_id])
+            kept.append(slot)
+    rows = {task["id"]: task for task in tasks}
+    return SchedulePlan(
+        version, evaluated_at, busy, keys, hours, scores, slots, rows,
+        schedule_response(tasks, kept, start, end)
+    )
+
+async def build_plan(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    version: int,
+    evaluated_at: datetime
+) -> SchedulePlan:
+    """Построить расписание на интервал целиком."""
+    busy = busy_intervals(await get_busy_blocks(db, user_id, start, end), start, end)
+    candidates = await get_schedule_candidates(db, user_id, start.date(), end.date())
+    task_ids, hours, scores = prioritize(candidates, evaluated_at)
+    keys = [(-score, task_id) for score, task_id in zip(scores, task_ids)]
+    return await _finish_plan(
+        db, user_id, start, end, version, evaluated_at, busy,
+        keys, hours, dict(zip(task_ids, scores)), pack(hours, FreeSlots(start, end, busy)), {}
+    )
+
+def _is_candidate(task: Mapping, start: datetime, end: datetime) -> bool:
+    """Попадает ли задача в расписание на интервал (как в get_schedule_candidates)."""
+    return (
+        task["status"] in SCHEDULABLE_STATUSES
+        and task["due_date"] is not None
+        and start.date() <= task["due_date"] <= end.date()
+        and bool(task["estimated_duration"])
+        and task["estimated_duration"] > 0
+    )
+
+async def update_plan(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    plan: SchedulePlan,
+    changes: Sequence[ScheduleChange]
+) -> SchedulePlan:
+    """
+    Пересчитать расписание после изменений задач.
+    Изменившиеся задачи удаляются из порядка размещения и вставляются на новые
+    места; задачи до первого затронутого места остаются в своих интервалах,
+    а остальные размещаются заново. Повторное применение изменения безопасно.
+    """
+    keys = plan.keys.copy()
+    hours = plan.hours.copy()
+    scores = dict(plan.scores)
+    rows = dict(plan.rows)
+    saved: Dict[int, Mapping] = {}
+    deleted = set()
+    for change in changes:
+        for task in change.saved:
+            saved[task["id"]] = task
+            deleted.discard(task["id"])
+        for task_id in change.deleted:
+            saved.pop(task_id, None)
+            deleted.add(task_id)
+
+    first = len(keys)
+    for task_id in chain(deleted, saved):
+        rows.pop(task_id, None)
+        score = scores.pop(task_id, None)
+        if score is not None:
+            position = bisect_left(keys, (-score, task_id))
+            del keys[position]
+            del hours[position]
+            first = min(first, position)
+
+    candidates = [task for task in saved.values() if _is_candidate(task, start, end)]
+    if candidates:
+        task_hours = np.array([task["estimated_duration"] for task in candidates], dtype=np.float64)
+        new_scores, _ = _scores(
+            [task["priority"] for task in candidates],
+            [task["status"] for task in candidates],
+            [task["created_at"] for task in candidates],
+            [task["due_date"] for task in candidates],
+            task_hours,
+            plan.evaluated_at
+        )
+        for task, score, duration in zip(candidates, new_scores.tolist(), task_hours.tolist()):
+            key = (-score, task["id"])
+            position = bisect_left(keys, key)
+            keys.insert(position, key)
+            hours.insert(position, duration)
+            scores[task["id"]] = score
+            rows[task["id"]] = task
+            first = min(first, position)
+
+    # Интервалы задач до первого затронутого места не меняются: свободное время
+    # восстанавливается повторным занятием их интервалов в том же порядке
+    kept = bisect_left([slot.position for slot in plan.slots], first)
+    slots = plan.slots[:kept]
+    free = FreeSlots(start, end, plan.busy)
+    for slot in slots:
+        free.occupy(to_microseconds(slot.start_time), to_microseconds(slot.end_time))
+    slots += pack(hours, free, first)
+    return await _finish_plan(
+        db, user_id, start, end, changes[-1].version, plan.evaluated_at, plan.busy,
+        keys, hours, scores, slots, rows
+    )
+
+async def get_schedule(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime,
+    now: Optional[datetime] = None
+) -> ScheduleResponse:
+    """
+    Расписание задач пользователя на интервал [start, end].
+    В расписание попадают незавершенные задачи со сроком внутри интервала;
+    они размещаются по убыванию приоритета, рассчитанного на evaluation_moment(now),
+    в свободное от блоков календаря время.
+    Расписание кэшируется до изменения версии данных пользователя; после изменений
+    задач, сделанных в этом процессе, оно пересчитывается с первого затронутого места,
+    после изменения блоков календаря - целиком.
+    """
+    evaluated_at = evaluation_moment(now or datetime.utcnow())
+    version = await get_data_version(db, user_id)
+    plan = schedule_cache.get(user_id, start, end)
+    if plan is not None and plan.evaluated_at == evaluated_at:
+        if plan.version == version:
+            return plan.response
+        changes = schedule_cache.changes_since(user_id, plan.version, version)
+        if changes:
+            plan = await update_plan(db, user_id, start, end, plan, changes)
+            schedule_cache.set(user_id, start, end, plan)
+            return plan.response
+    # Версия читается до задач: если задачи изменятся во время загрузки,
+    # расписание получит старую версию и будет пересчитано при следующем запросе
+    plan = await build_plan(db, user_id, start, end, version, evaluated_at)
+    schedule_cache.set(user_id, start, end, plan)
+    return plan.response
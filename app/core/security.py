@@ -1,66 +1,98 @@
 """Функции безопасности и аутентификации."""
 
+import calendar
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.crud import user as user_crud
+# Функции хеширования реэкспортируются для обратной совместимости импортов
+from app.core.hashing import get_password_hash, verify_password
+from app.core.token_cache import token_cache
+from app.models.user import User
 from app.schemas.user import TokenPayload
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Проверить соответствие пароля хешу."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    """Получить хеш пароля."""
-    return pwd_context.hash(password)
+def _timestamp(moment: datetime) -> float:
+    """Момент времени UTC в секундах Unix с дробной частью."""
+    return calendar.timegm(moment.utctimetuple()) + moment.microsecond / 1_000_000
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Создать JWT токен."""
     to_encode = data.copy()
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
+        expire = now + timedelta(minutes=15)
+    # Время выпуска с дробной частью: токены, выпущенные до смены пароля, отзываются
+    to_encode.update({"exp": expire, "iat": _timestamp(now)})
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
     return encoded_jwt
 
-def verify_token(token: str) -> Optional[TokenPayload]:
-    # Проверка валидности токена
+def decode_access_token(token: str) -> Optional[dict]:
+    """Проверить подпись и срок действия токена и вернуть его полезную нагрузку."""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        sub = payload.get("sub")
-        if sub is None:
-            return None
-        return TokenPayload(sub=int(sub))
     except JWTError:
         return None
+    if payload.get("sub") is None:
+        return None
+    return payload
+
+def verify_token(token: str) -> Optional[TokenPayload]:
+    # Проверка валидности токена
+    payload = decode_access_token(token)
+    if payload is None:
+        return None
+    return TokenPayload(sub=int(payload["sub"]))
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> int:
-    """Получить текущего пользователя по токену."""
+    """
+    Получить текущего пользователя по токену.
+    Проверенные токены кэшируются, поэтому повторные запросы с тем же токеном
+    не декодируют JWT и не обращаются к базе.
+    """
+    user_id = token_cache.get(token)
+    if user_id is not None:
+        return user_id
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    payload = decode_access_token(token)
+    if payload is None:
+        raise credentials_exception
+    # Токены приложения всегда выпускаются со сроком действия: бессрочный токен
+    # не принимается, иначе его нельзя было бы держать в кэше до истечения срока
+    expires_at = payload.get("exp")
+    if expires_at is None:
+        raise credentials_exception
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError as exc:
+        user_id = int(payload["sub"])
+        issued_at = float(payload.get("iat", 0))
+        expires_at = float(expires_at)
+    except (KeyError, TypeError, ValueError) as exc:
         raise credentials_exception from exc
-    return int(user_id) 
\ No newline at end of file
+
+    # Пользователь должен существовать, а токен - быть выпущен после последней смены пароля
+    result = await db.execute(select(User.password_changed_at).where(User.id == user_id))
+    row = result.first()
+    if row is None:
+        raise credentials_exception
+    if row.password_changed_at and issued_at < _timestamp(row.password_changed_at):
+        raise credentials_exception
+
+    token_cache.add(token, user_id, expires_at)
+    return user_id
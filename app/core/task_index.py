@@ -0,0 +1,298 @@
+"""Индекс задач в памяти процесса для быстрого ранжирования по приоритету."""
+
+import heapq
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.priority import (
+    MAX_DYNAMIC_FACTOR,
+    calculate_dynamic_factor,
+    calculate_static_priority,
+    priority_growth_rate,
+)
+
+# Предельный срок жизни закэшированного ранжирования, в часах
+MAX_RANKING_TTL_HOURS = 24.0
+
+# Сколько страниц результата хранить вместе с ранжированием пользователя
+MAX_CACHED_PAGES = 4
+
+class IndexedTask(NamedTuple):
+    """Запись индекса: статическая часть приоритета и даты для временных факторов."""
+    static_priority: float
+    created_at: Optional[datetime]
+    due_date: Optional[date]
+
+class Ranking(NamedTuple):
+    """
+    Ранжирование задач пользователя: пары (приоритет, id) по убыванию приоритета.
+    Приоритеты рассчитаны на момент evaluated_at; порядок гарантированно
+    не меняется до valid_until, если не было записей.
+    """
+    items: List[Tuple[float, int]]
+    limit: int
+    evaluated_at: datetime
+    valid_until: datetime
+
+class UserTaskIndex:
+    """
+    Задачи одного пользователя, упорядоченные по статической части приоритета.
+    version - версия данных пользователя (users.data_version), которой соответствует индекс.
+    """
+
+    def __init__(self, tasks: Iterable = (), version: int = 0):
+        self.version = version
+        self._entries: Dict[int, IndexedTask] = {}
+        # Ключи (-статический приоритет, id) в порядке возрастания
+        self._order: List[Tuple[float, int]] = []
+        for task in tasks:
+            self._entries[task.id] = self._make_entry(task)
+        self._order = sorted(
+            (-entry.static_priority, task_id) for task_id, entry in self._entries.items()
+        )
+        self._ranking: Optional[Ranking] = None
+        # Строки страниц, соответствующие текущему ранжированию: (skip, limit) -> задачи
+        self._pages: "OrderedDict[Tuple[int, int], list]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _make_entry(task) -> IndexedTask:
+        """Построить запись индекса по задаче."""
+        return IndexedTask(calculate_static_priority(task), task.created_at, task.due_date)
+
+    def upsert(self, task) -> None:
+        """Добавить задачу или обновить ее запись."""
+        self.remove(task.id)
+        entry = self._make_entry(task)
+        self._entries[task.id] = entry
+        insort(self._order, (-entry.static_priority, task.id))
+        self._reset_ranking()
+
+    def remove(self, task_id: int) -> bool:
+        """Удалить задачу из индекса."""
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return False
+        del self._order[bisect_left(self._order, (-entry.static_priority, task_id))]
+        self._reset_ranking()
+        return True
+
+    def top(self, now: datetime, limit: int) -> List[Tuple[float, int]]:
+        """Первые limit задач по убыванию приоритета в виде пар (приоритет, id)."""
+        return self.ranking(now, limit).items
+
+    def ranking(self, now: datetime, limit: int) -> Ranking:
+        """
+        Первые limit задач по убыванию приоритета на момент now (при равенстве - по id).
+        Закэшированное ранжирование возвращается без пересчета, пока порядок
+        гарантированно не изменился и не было записей.
+        """
+        cached = self._ranking
+        if (
+            cached is not None
+            and cached.limit >= limit
+            and cached.evaluated_at <= now < cached.valid_until
+        ):
+            return cached._replace(items=cached.items[:limit], limit=limit)
+        self._reset_ranking()
+        self._ranking = self._compute_ranking(now, limit)
+        return self._ranking
+
+    def get_page(self, ranking: Ranking, skip: int, limit: int) -> Optional[list]:
+        """Получить закэшированные строки страницы для ранжирования ranking."""
+        if not self._is_current(ranking):
+            return None
+        return self._pages.get((skip, limit))
+
+    def set_page(self, ranking: Ranking, skip: int, limit: int, rows: list) -> None:
+        """Сохранить строки страницы, если ранжирование ranking все еще актуально."""
+        if not self._is_current(ranking):
+            return
+        self._pages[(skip, limit)] = rows
+        while len(self._pages) > MAX_CACHED_PAGES:
+            self._pages.popitem(last=False)
+
+    def _is_current(self, ranking: Ranking) -> bool:
+        return self._ranking is not None and self._ranking.evaluated_at == ranking.evaluated_at
+
+    def _reset_ranking(self) -> None:
+        self._ranking = None
+        self._pages.clear()
+
+    def _compute_ranking(self, now: datetime, limit: int) -> Ranking:
+        """
+        Рассчитать ранжирование и момент, до которого оно остается верным.
+        Временные факторы рассчитываются только для задач, которые могут попасть
+        в результат: множитель срочности не превышает MAX_DYNAMIC_FACTOR.
+        """
+        if limit <= 0:
+            return Ranking([], limit, now, now)
+        # Куча лучших кандидатов (приоритет, -id); на вершине - худший из них
+        best: List[Tuple[float, int]] = []
+        candidates: List[Tuple[float, int]] = []
+        for negative_static, task_id in self._order:
+            if len(best) == limit and -negative_static * MAX_DYNAMIC_FACTOR < best[0][0]:
+                break  # Остальные задачи не догонят худшую из лучших даже при максимальной срочности
+            entry = self._entries[task_id]
+            score = entry.static_priority * calculate_dynamic_factor(
+                entry.created_at, entry.due_date, now
+            )
+            item = (score, -task_id)
+            candidates.append(item)
+            if len(best) < limit:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+        best.sort(reverse=True)
+
+        # Порядок первых limit задач может измениться, только когда одна из соседних
+        # задач догонит предыдущую или задача за пределами результата догонит последнюю
+        hours = MAX_RANKING_TTL_HOURS
+        for above, below in zip(best, best[1:]):
+            hours = min(hours, self._hours_until_crossover(above, below, now))
+        if len(best) == limit:
+            selected = set(best)
+            for item in candidates:
+                if item not in selected:
+                    hours = min(hours, self._hours_until_crossover(best[-1], item, now))
+
+        return Ranking(
+            [(score, -negative_id) for score, negative_id in best],
+            limit,
+            now,
+            now + timedelta(hours=hours)
+        )
+
+    def _hours_until_crossover(
+        self,
+        above: Tuple[float, int],
+        below: Tuple[float, int],
+        now: datetime
+    ) -> float:
+        """
+        Нижняя оценка времени (в часах), через которое задача below может догнать above.
+        Приоритет above не убывает, поэтому достаточно оценки скорости роста below.
+        """
+        entry_above = self._entries[-above[1]]
+        entry_below = self._entries[-below[1]]
+        if entry_above == entry_below:
+            return MAX_RANKING_TTL_HOURS  # Одинаковые задачи упорядочены по id всегда
+        rate = priority_growth_rate(
+            entry_below.static_priority, entry_below.created_at, entry_below.due_date, now
+        )
+        if rate <= 0:
+            return MAX_RANKING_TTL_HOURS
+        return (above[0] - below[0]) / rate
+
+class TaskIndex:
+    """
+    Индексы задач пользователей в памяти процесса.
+    Обновляются операциями записи из app.crud.task; при превышении лимита
+    задач вытесняются индексы давно неактивных пользователей (LRU).
+    Индекс локален для процесса: записи в других процессах его не обновляют,
+    поэтому перед использованием его версия сверяется с версией данных в базе.
+    """
+
+    def __init__(self, max_tasks: int):
+        self.max_tasks = max_tasks
+        self._users: "OrderedDict[int, UserTaskIndex]" = OrderedDict()
+        self._size = 0
+        # Счетчики записей по пользователям: защищают от установки индекса,
+        # построенного по данным, которые изменились во время загрузки
+        self._generations: Dict[int, int] = {}
+
+    def get(self, user_id: int) -> Optional[UserTaskIndex]:
+        """Получить индекс пользователя, если он загружен."""
+        index = self._users.get(user_id)
+        if index is not None:
+            self._users.move_to_end(user_id)
+        return index
+
+    def generation(self, user_id: int) -> int:
+        """Текущее поколение данных пользователя."""
+        return self._generations.get(user_id, 0)
+
+    def build(
+        self,
+        user_id: int,
+        tasks: Iterable,
+        generation: int,
+        version: int
+    ) -> UserTaskIndex:
+        """
+        Построить индекс пользователя по задачам, загруженным при версии данных version.
+        Индекс сохраняется, только если с момента загрузки не было записей.
+        """
+        index = UserTaskIndex(tasks, version)
+        if generation == self.generation(user_id) and len(index) <= self.max_tasks:
+            self._drop(user_id)
+            self._users[user_id] = index
+            self._size += len(index)
+            self._evict()
+        return index
+
+    def task_saved(self, user_id: int, task, version: int) -> None:
+        """Учесть создание или изменение задачи, зафиксированное с версией данных version."""
+        self._bump(user_id)
+        index = self._users.get(user_id)
+        if index is not None and self._advance(user_id, index, version):
+            size = len(index)
+            index.upsert(task)
+            self._size += len(index) - size
+            self._evict()
+
+    def task_deleted(self, user_id: int, task_id: int, version: int) -> None:
+        """Учесть удаление задачи, зафиксированное с версией данных version."""
+        self._bump(user_id)
+        index = self._users.get(user_id)
+        if index is not None and self._advance(user_id, index, version) and index.remove(task_id):
+            self._size -= 1
+
+    def data_changed(self, user_id: int, version: int) -> None:
+        """Учесть запись, не меняющую задачи (категории, блоки календаря)."""
+        index = self._users.get(user_id)
+        if index is not None:
+            self._advance(user_id, index, version)
+
+    def invalidate(self, user_id: int) -> None:
+        """Сбросить индекс пользователя (например, после массовых изменений)."""
+        self._bump(user_id)
+        self._drop(user_id)
+
+    def clear(self) -> None:
+        """Сбросить все индексы."""
+        self._users.clear()
+        self._generations.clear()
+        self._size = 0
+
+    def _advance(self, user_id: int, index: UserTaskIndex, version: int) -> bool:
+        """
+        Перевести индекс на версию данных version. Если это не следующая версия,
+        индекс пропустил запись (другого процесса или вне приложения) и сбрасывается.
+        """
+        if version not in (index.version, index.version + 1):
+            self._drop(user_id)
+            return False
+        index.version = version
+        return True
+
+    def _bump(self, user_id: int) -> None:
+        self._generations[user_id] = self.generation(user_id) + 1
+
+    def _drop(self, user_id: int) -> None:
+        index = self._users.pop(user_id, None)
+        if index is not None:
+            self._size -= len(index)
+
+    def _evict(self) -> None:
+        """Вытеснить наименее активных пользователей до соблюдения лимита."""
+        while self._size > self.max_tasks and len(self._users) > 1:
+            _, index = self._users.popitem(last=False)
+            self._size -= len(index)
+
+task_index = TaskIndex(settings.TASK_INDEX_MAX_TASKS)
@@ -0,0 +1,12 @@
+"""Приведение времени к виду, в котором оно хранится в базе."""
+
+from datetime import datetime, timezone
+
+def to_naive_utc(moment: datetime) -> datetime:
+    """
+    Момент времени без часового пояса, в UTC: так время хранится в базе.
+    Время с часовым поясом переводится в UTC, время без пояса считается UTC.
+    """
+    if moment.tzinfo is None:
+        return moment
+    return moment.astimezone(timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,43 @@
+"""Кэш проверенных JWT токенов доступа."""
+
+import hashlib
+import time
+from typing import Optional
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+
+class TokenCache:
+    """
+    Отображение дайджеста токена в ID пользователя для уже проверенных токенов.
+    Запись живет до истечения токена, но не дольше ttl_seconds: кэш локален
+    для процесса, и срок жизни ограничивает устаревание после смены пароля
+    в другом процессе.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._cache = LRUCache(maxsize)
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[int]:
+        """Получить ID пользователя для проверенного токена."""
+        return self._cache.get(self._digest(token))
+
+    def add(self, token: str, user_id: int, expires_at: float) -> None:
+        """Запомнить проверенный токен до момента expires_at (time.time())."""
+        expires_at = min(expires_at, time.time() + self.ttl_seconds)
+        self._cache.set(self._digest(token), user_id, expires_at)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Забыть все токены пользователя."""
+        self._cache.discard_where(lambda _, cached_user_id: cached_user_id == user_id)
+
+    def clear(self) -> None:
+        """Забыть все токены."""
+        self._cache.clear()
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL_SECONDS)
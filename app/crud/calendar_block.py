@@ -0,0 +1,161 @@
+"""CRUD операции для блоков календаря."""
+
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import Row, String, or_, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.calendar import last_end_time
+from app.core.database import after_commit, coordinated_write
+from app.core.pagination import Page
+from app.core.task_index import task_index
+from app.crud.user import bump_data_version
+from app.models.calendar_block import CalendarBlock
+from app.schemas.calendar_block import BlockRecurrence, CalendarBlockCreate, CalendarBlockUpdate
+
+async def get_calendar_blocks(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100
+) -> List[CalendarBlock]:
+    """Получить список блоков календаря пользователя."""
+    page = await get_calendar_blocks_page(db, user_id, limit=limit, skip=skip)
+    return page.items
+
+async def get_calendar_blocks_page(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 100,
+    skip: int = 0,
+    cursor: Optional[Dict[str, Any]] = None
+) -> Page:
+    """
+    Получить страницу блоков календаря пользователя в порядке ID с ключом следующей страницы.
+    Выбрасывает ValueError, если курсор поврежден.
+    """
+    query = select(CalendarBlock).where(CalendarBlock.user_id == user_id)
+    if cursor is None:
+        query = query.offset(skip)
+    else:
+        try:
+            last_id = int(cursor["id"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+        query = query.where(CalendarBlock.id > last_id)
+    result = await db.execute(query.order_by(CalendarBlock.id).limit(limit))
+    blocks = result.scalars().all()
+    next_cursor = None
+    if blocks and len(blocks) == limit:
+        next_cursor = {"id": blocks[-1].id}
+    return Page(blocks, next_cursor)
+
+async def get_calendar_block(
+    db: AsyncSession,
+    block_id: int,
+    user_id: int
+) -> Optional[CalendarBlock]:
+    """Получить блок календаря по ID."""
+    result = await db.execute(
+        select(CalendarBlock).where(
+            CalendarBlock.id == block_id,
+            CalendarBlock.user_id == user_id
+        )
+    )
+    return result.scalar_one_or_none()
+
+async def get_busy_blocks(
+    db: AsyncSession,
+    user_id: int,
+    start: datetime,
+    end: datetime
+) -> Sequence[Row]:
+    """
+    Получить блоки, повторения которых могут пересекаться с интервалом [start, end]:
+    колонки start_time, end_time, recurrence, recurrence_until. Даты, как и для
+    кандидатов расписания, возвращаются в том виде, в котором их хранит база.
+    """
+    result = await db.execute(
+        select(
+            type_coerce(CalendarBlock.start_time, String).label("start_time"),
+            type_coerce(CalendarBlock.end_time, String).label("end_time"),
+            type_coerce(CalendarBlock.recurrence, String).label("recurrence"),
+            type_coerce(CalendarBlock.recurrence_until, String).label("recurrence_until")
+        )
+        .where(
+            CalendarBlock.user_id == user_id,
+            CalendarBlock.start_time < end,
+            or_(CalendarBlock.last_end_time.is_(None), CalendarBlock.last_end_time > start)
+        )
+    )
+    return result.all()
+
+def _update_last_end_time(db_block: CalendarBlock) -> None:
+    """Пересчитать границу окончания последнего повторения блока."""
+    db_block.last_end_time = last_end_time(
+        db_block.start_time, db_block.end_time, db_block.recurrence, db_block.recurrence_until
+    )
+
+@coordinated_write
+async def create_calendar_block(
+    db: AsyncSession,
+    block: CalendarBlockCreate,
+    user_id: int
+) -> CalendarBlock:
+    """Создать блок календаря."""
+    db_block = CalendarBlock(**block.model_dump(), user_id=user_id)
+    _update_last_end_time(db_block)
+    db.add(db_block)
+    version = await bump_data_version(db, user_id)
+    await db.commit()
+    after_commit(db, partial(task_index.data_changed, user_id, version))
+    await db.refresh(db_block)
+    return db_block
+
+@coordinated_write
+async def update_calendar_block(
+    db: AsyncSession,
+    block_id: int,
+    block: CalendarBlockUpdate,
+    user_id: int
+) -> Optional[CalendarBlock]:
+    """
+    Обновить блок календаря.
+    Выбрасывает ValueError, если после изменения блок заканчивается не позже начала.
+    """
+    db_block = await get_calendar_block(db, block_id, user_id)
+    if db_block:
+        values = block.model_dump(exclude_unset=True)
+        if "recurrence" in values and values["recurrence"] is None:
+            values["recurrence"] = BlockRecurrence.NONE
+        start_time = values.get("start_time", db_block.start_time)
+        end_time = values.get("end_time", db_block.end_time)
+        if start_time is None or end_time is None or end_time <= start_time:
+            raise ValueError("end_time must be after start_time")
+        for key, value in values.items():
+            setattr(db_block, key, value)
+        _update_last_end_time(db_block)
+        version = await bump_data_version(db, user_id)
+        await db.commit()
+        # Задачи не менялись: индекс приоритетов только переводится на новую версию
+        after_commit(db, partial(task_index.data_changed, user_id, version))
+        await db.refresh(db_block)
+    return db_block
+
+@coordinated_write
+async def delete_calendar_block(
+    db: AsyncSession,
+    block_id: int,
+    user_id: int
+) -> bool:
+    """Удалить блок календаря."""
+    db_block = await get_calendar_block(db, block_id, user_id)
+    if db_block:
+        await db.delete(db_block)
+        version = await bump_data_version(db, user_id)
+        await db.commit()
+        # Задачи не менялись: индекс приоритетов только переводится на новую версию
+        after_commit(db, partial(task_index.data_changed, user_id, version))
+        return True
+    return False
@@ -1,22 +1,87 @@
 """CRUD операции для категорий задач."""
 
-from typing import List, Optional
+from functools import partial
+from typing import Any, Dict, List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, and_, delete, func, insert, select, update
 
+from app.core.database import after_commit, coordinated_write
+from app.core.pagination import Page
+from app.core.schedule_cache import schedule_cache
+from app.core.task_index import task_index
+from app.crud.task import _tasks_saved
+from app.crud.user import bump_data_version
 from app.models.category import Category
+from app.models.task import Task
 from app.schemas.category import CategoryCreate, CategoryUpdate
 
+# Колонки категории в порядке полей схемы ответа: списки читаются строками, без ORM-объектов
+CATEGORY_COLUMNS = (
+    Category.id,
+    Category.name,
+    Category.description,
+    Category.created_at,
+    Category.updated_at,
+    Category.user_id,
+)
+
+def _category_columns(fields: Optional[Sequence[str]]) -> tuple:
+    """Колонки CATEGORY_COLUMNS для полей fields; ID выбирается всегда - по нему строится курсор."""
+    if fields is None:
+        return CATEGORY_COLUMNS
+    return tuple(
+        column for column in CATEGORY_COLUMNS if column.key == "id" or column.key in fields
+    )
+
+def _categories_changed(user_id: int, version: int) -> None:
+    """
+    Учесть изменение категорий, зафиксированное с версией данных version.
+    Категории не влияют на расписание: пустое изменение в журнале позволяет
+    обновить версию закэшированных расписаний без пересчета; индекс приоритетов
+    так же только переводится на новую версию.
+    """
+    schedule_cache.tasks_changed(user_id, version)
+    task_index.data_changed(user_id, version)
+
 async def get_categories(
     db: AsyncSession,
     user_id: int,
     skip: int = 0,
     limit: int = 100
-) -> List[Category]:
-    """Получить список категорий пользователя."""
-    query = select(Category).where(Category.user_id == user_id).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return result.scalars().all()
+) -> List[Row]:
+    """Получить строки категорий пользователя."""
+    page = await get_categories_page(db, user_id, limit=limit, skip=skip)
+    return page.items
+
+async def get_categories_page(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 100,
+    skip: int = 0,
+    cursor: Optional[Dict[str, Any]] = None,
+    fields: Optional[Sequence[str]] = None
+) -> Page:
+    """
+    Получить страницу категорий пользователя (строки с колонками CATEGORY_COLUMNS,
+    только полей fields, если они заданы) в порядке ID с ключом следующей страницы.
+    С курсором страница выбирается по ключу (keyset), skip не используется.
+    Выбрасывает ValueError, если курсор поврежден.
+    """
+    query = select(*_category_columns(fields)).where(Category.user_id == user_id)
+    if cursor is None:
+        query = query.offset(skip)
+    else:
+        try:
+            last_id = int(cursor["id"])
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError("Invalid cursor") from exc
+        query = query.where(Category.id > last_id)
+    result = await db.execute(query.order_by(Category.id).limit(limit))
+    categories = result.all()
+    next_cursor = None
+    if categories and len(categories) == limit:
+        next_cursor = {"id": categories[-1].id}
+    return Page(categories, next_cursor)
 
 async def get_category(
     db: AsyncSession,
@@ -31,42 +96,115 @@ async def get_category(
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
+async def get_category_row(
+    db: AsyncSession,
+    category_id: int,
+    user_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Row]:
+    """Получить строку категории по ID с колонками полей fields (None - все CATEGORY_COLUMNS)."""
+    result = await db.execute(
+        select(*_category_columns(fields)).where(
+            Category.id == category_id,
+            Category.user_id == user_id
+        )
+    )
+    return result.first()
+
+async def count_tasks_by_category(db: AsyncSession, user_id: int) -> List[Row]:
+    """
+    Число задач в каждой категории пользователя (строки id, name, task_count)
+    в порядке ID, включая категории без задач.
+    """
+    result = await db.execute(
+        select(Category.id, Category.name, func.count(Task.id).label("task_count"))
+        # Задачи считаются только свои: владелец category_id при записи задачи
+        # не проверяется, и чужие задачи могут ссылаться на категорию пользователя
+        .outerjoin(Task, and_(Task.category_id == Category.id, Task.user_id == user_id))
+        .where(Category.user_id == user_id)
+        .group_by(Category.id)
+        .order_by(Category.id)
+    )
+    return result.all()
+
+@coordinated_write
 async def create_category(
     db: AsyncSession,
     category: CategoryCreate,
     user_id: int
 ) -> Category:
-    """Создать новую категорию."""
-    db_category = Category(**category.model_dump(), user_id=user_id)
-    db.add(db_category)
+    """Создать новую категорию: INSERT ... RETURNING сразу возвращает сохраненную строку."""
+    result = await db.execute(
+        insert(Category).values(**category.model_dump(), user_id=user_id).returning(Category)
+    )
+    db_category = result.scalar_one()
+    version = await bump_data_version(db, user_id)
     await db.commit()
-    await db.refresh(db_category)
+    after_commit(db, partial(_categories_changed, user_id, version))
     return db_category
 
+@coordinated_write
 async def update_category(
     db: AsyncSession,
     category_id: int,
     category: CategoryUpdate,
     user_id: int
 ) -> Optional[Category]:
-    """Обновить категорию."""
-    db_category = await get_category(db, category_id, user_id)
+    """
+    Обновить категорию одним запросом UPDATE ... RETURNING.
+    Возвращает None, если категория не найдена; без изменяемых полей категория только читается.
+    """
+    update_data = category.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_category(db, category_id, user_id)
+    result = await db.execute(
+        update(Category)
+        .where(Category.id == category_id, Category.user_id == user_id)
+        .values(**update_data)
+        .returning(Category)
+        .execution_options(populate_existing=True)
+    )
+    db_category = result.scalar_one_or_none()
     if db_category:
-        for key, value in category.model_dump(exclude_unset=True).items():
-            setattr(db_category, key, value)
+        version = await bump_data_version(db, user_id)
         await db.commit()
-        await db.refresh(db_category)
+        after_commit(db, partial(_categories_changed, user_id, version))
     return db_category
 
+@coordinated_write
 async def delete_category(
     db: AsyncSession,
     category_id: int,
     user_id: int
 ) -> bool:
-    """Удалить категорию."""
-    db_category = await get_category(db, category_id, user_id)
-    if db_category:
-        await db.delete(db_category)
-        await db.commit()
-        return True
-    return False 
\ No newline at end of file
+    """
+    Удалить категорию одним запросом DELETE ... RETURNING.
+    Задачи категории остаются без категории, как при удалении через ORM,
+    в том числе чужие задачи, сославшиеся на эту категорию.
+    """
+    result = await db.execute(
+        delete(Category)
+        .where(Category.id == category_id, Category.user_id == user_id)
+        .returning(Category.id)
+    )
+    if result.scalar_one_or_none() is None:
+        return False
+    result = await db.execute(
+        update(Task)
+        .where(Task.category_id == category_id)
+        .values(category_id=None)
+        .returning(Task)
+        .execution_options(populate_existing=True)
+    )
+    detached: Dict[int, List[Task]] = {user_id: []}
+    for task in result.scalars():
+        detached.setdefault(task.user_id, []).append(task)
+    # Версия данных меняется у каждого пользователя, чьи задачи изменились
+    versions = {owner: await bump_data_version(db, owner) for owner in detached}
+    await db.commit()
+    for owner, tasks in detached.items():
+        if tasks:
+            after_commit(db, partial(_tasks_saved, owner, versions[owner], tasks))
+        else:
+            after_commit(db, partial(_categories_changed, owner, versions[owner]))
+    return True
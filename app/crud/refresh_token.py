@@ -0,0 +1,83 @@
+"""CRUD операции для токенов обновления."""
+
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+
+def _hash_token(token: str) -> str:
+    """Получить хеш токена обновления для хранения и поиска."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+async def create_refresh_token(
+    db: AsyncSession,
+    user_id: int,
+    commit: bool = True
+) -> Tuple[str, RefreshToken]:
+    """Выпустить новый токен обновления. Возвращает сам токен и запись о нем."""
+    token = secrets.token_urlsafe(32)
+    db_token = RefreshToken(
+        token_hash=_hash_token(token),
+        user_id=user_id,
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(db_token)
+    if commit:
+        await db.commit()
+    return token, db_token
+
+async def rotate_refresh_token(db: AsyncSession, token: str) -> Optional[Tuple[int, str]]:
+    """
+    Обменять токен обновления на новый.
+    Возвращает ID пользователя и новый токен или None, если токен недействителен.
+    Повторное использование отозванного токена отзывает все токены пользователя.
+    """
+    result = await db.execute(
+        select(RefreshToken).where(RefreshToken.token_hash == _hash_token(token))
+    )
+    db_token = result.scalar_one_or_none()
+    if db_token is None:
+        return None
+
+    now = datetime.utcnow()
+    # Условное обновление: из параллельных запросов с одним токеном успешен только один
+    revoked = await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == db_token.id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+    if revoked.rowcount != 1:
+        await revoke_user_refresh_tokens(db, db_token.user_id)
+        return None
+    if db_token.expires_at <= now:
+        await db.commit()
+        return None
+
+    new_token, new_db_token = await create_refresh_token(db, db_token.user_id, commit=False)
+    await db.flush()
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.id == db_token.id)
+        .values(replaced_by_id=new_db_token.id)
+    )
+    await db.commit()
+    return db_token.user_id, new_token
+
+async def revoke_user_refresh_tokens(
+    db: AsyncSession,
+    user_id: int,
+    commit: bool = True
+) -> None:
+    """Отозвать все действующие токены обновления пользователя."""
+    await db.execute(
+        update(RefreshToken)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.utcnow())
+    )
+    if commit:
+        await db.commit()
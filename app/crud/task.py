@@ -1,50 +1,467 @@
 """CRUD операции для задач."""
 
-from typing import List, Optional
+from datetime import date, datetime
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Row, String, and_, delete, func, insert, or_, select, type_coerce, update
+from app.core.database import after_commit, coordinated_write
+from app.core.pagination import Page
+from app.core.priority import priority_expression
+from app.core.schedule_cache import schedule_cache
+from app.core.task_index import Ranking, UserTaskIndex, task_index
+from app.core.timeutil import to_naive_utc
+from app.crud.user import bump_data_version, get_data_version
 from app.models.task import Task
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import (
+    TaskBulkUpdateItem,
+    TaskCreate,
+    TaskFilter,
+    TaskSort,
+    TaskStatus,
+    TaskUpdate,
+)
 
 async def get_task(db: AsyncSession, task_id: int, user_id: int) -> Optional[Task]:
     """Получить задачу по ID."""
     result = await db.execute(select(Task).where(Task.id == task_id, Task.user_id == user_id))
     return result.scalar_one_or_none()
 
-async def get_tasks(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
-    """Получить список задач пользователя."""
+async def get_task_row(
+    db: AsyncSession,
+    task_id: int,
+    user_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> Optional[Row]:
+    """Получить строку задачи по ID с колонками полей fields (None - все TASK_COLUMNS)."""
     result = await db.execute(
-        select(Task).where(Task.user_id == user_id).offset(skip).limit(limit)
+        select(*_task_columns(fields)).where(Task.id == task_id, Task.user_id == user_id)
     )
-    return result.scalars().all()
+    return result.first()
 
+async def get_user_task_index(
+    db: AsyncSession,
+    user_id: int,
+    version: Optional[int] = None
+) -> UserTaskIndex:
+    """
+    Получить индекс приоритетов пользователя при версии данных version (None -
+    текущая версия из базы). Индекс загружается заново, если он не загружен или
+    построен при другой версии: данные изменились вне этого процесса.
+    """
+    if version is None:
+        # Версия читается до задач: изменение между запросами даст индексу
+        # старую версию, и он будет перестроен при следующем обращении
+        version = await get_data_version(db, user_id)
+    index = task_index.get(user_id)
+    if index is None or index.version != version:
+        generation = task_index.generation(user_id)
+        result = await db.execute(
+            select(
+                Task.id,
+                Task.priority,
+                Task.status,
+                Task.estimated_duration,
+                Task.created_at,
+                Task.due_date
+            ).where(Task.user_id == user_id)
+        )
+        index = task_index.build(user_id, result.all(), generation, version)
+    return index
+
+async def _get_ranked_tasks(
+    db: AsyncSession,
+    user_id: int,
+    skip: int,
+    limit: int,
+    version: Optional[int] = None
+) -> Tuple[List[Row], Ranking]:
+    """
+    Получить страницу задач (строки с колонками TASK_COLUMNS) по индексу приоритетов
+    и ранжирование, по которому она построена.
+    """
+    index = await get_user_task_index(db, user_id, version)
+    ranking = index.ranking(datetime.utcnow(), skip + limit)
+    # Пока порядок гарантированно не изменился, страница отдается без запросов к базе
+    tasks = index.get_page(ranking, skip, limit)
+    if tasks is None:
+        task_ids = [task_id for _, task_id in ranking.items[skip:]]
+        tasks = await get_task_rows_by_ids(db, task_ids, user_id)
+        index.set_page(ranking, skip, limit, tasks)
+    return tasks, ranking
+
+async def get_tasks(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Row]:
+    """Получить строки задач пользователя, отсортированных по приоритету."""
+    tasks, _ = await _get_ranked_tasks(db, user_id, skip, limit)
+    return tasks
+
+async def get_tasks_page(
+    db: AsyncSession,
+    user_id: int,
+    limit: int = 100,
+    skip: int = 0,
+    sort: TaskSort = TaskSort.PRIORITY,
+    cursor: Optional[Dict[str, Any]] = None,
+    filters: Optional[TaskFilter] = None,
+    fields: Optional[Sequence[str]] = None,
+    version: Optional[int] = None
+) -> Page:
+    """
+    Получить страницу задач пользователя (строки с колонками TASK_COLUMNS)
+    с ключом следующей страницы.
+    С курсором страница выбирается по ключу сортировки (keyset), skip не используется.
+    Курсор приоритетной сортировки фиксирует момент расчета приоритетов,
+    поэтому порядок между страницами остается согласованным.
+    Отфильтрованный список ранжируется в базе, а не по индексу приоритетов в памяти.
+    fields ограничивает колонки запроса; страницы из индекса приоритетов
+    содержат все колонки, лишние не выводятся при сериализации.
+    version - уже прочитанная версия данных пользователя: индекс приоритетов
+    используется только построенным при ней.
+    Выбрасывает ValueError, если курсор не подходит к сортировке.
+    """
+    conditions = _filter_conditions(filters) if filters is not None else []
+    if sort == TaskSort.ID:
+        query = select(*_task_columns(fields)).where(Task.user_id == user_id, *conditions)
+        if cursor is None:
+            query = query.offset(skip)
+        else:
+            query = query.where(Task.id > _cursor_value(cursor, sort, "id", int))
+        result = await db.execute(query.order_by(Task.id).limit(limit))
+        tasks = result.all()
+        next_cursor = None
+        if tasks and len(tasks) == limit:
+            next_cursor = {"sort": sort.value, "id": tasks[-1].id}
+        return Page(tasks, next_cursor)
+
+    if cursor is None and not conditions:
+        tasks, ranking = await _get_ranked_tasks(db, user_id, skip, limit, version)
+        evaluated_at = ranking.evaluated_at
+        ranked = ranking.items[skip:]
+    else:
+        if cursor is None:
+            evaluated_at = datetime.utcnow()
+        else:
+            evaluated_at = datetime.fromisoformat(_cursor_value(cursor, sort, "at", str))
+        score = priority_expression(evaluated_at)
+        query = (
+            select(*_task_columns(fields), score.label("score"))
+            .where(Task.user_id == user_id, *conditions)
+        )
+        if cursor is None:
+            query = query.offset(skip)
+        else:
+            last_score = _cursor_value(cursor, sort, "score", float)
+            last_id = _cursor_value(cursor, sort, "id", int)
+            query = query.where(
+                or_(score < last_score, and_(score == last_score, Task.id > last_id))
+            )
+        result = await db.execute(query.order_by(score.desc(), Task.id).limit(limit))
+        tasks = result.all()
+        ranked = [(task.score, task.id) for task in tasks]
+
+    next_cursor = None
+    if ranked and len(ranked) == limit:
+        last_score, last_id = ranked[-1]
+        next_cursor = {
+            "sort": sort.value,
+            "at": evaluated_at.isoformat(),
+            "score": last_score,
+            "id": last_id,
+        }
+    return Page(tasks, next_cursor, evaluated_at if cursor is None else None)
+
+def get_cached_ranking_moment(
+    user_id: int,
+    skip: int,
+    limit: int,
+    version: int
+) -> Optional[datetime]:
+    """
+    Момент расчета приоритетов, по которому сейчас строится первая страница
+    приоритетной сортировки, без запросов к базе. None, если индекс пользователя
+    не загружен в этом процессе или построен не при версии данных version.
+    """
+    index = task_index.get(user_id)
+    if index is None or index.version != version:
+        return None
+    return index.ranking(datetime.utcnow(), skip + limit).evaluated_at
+
+# Колонки задачи в порядке полей схемы ответа; строки с ними заменяют
+# ORM-объекты там, где задач много (списки, выгрузка, расписание)
+TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.description,
+    Task.priority,
+    Task.status,
+    Task.due_date,
+    Task.estimated_duration,
+    Task.category_id,
+    Task.created_at,
+    Task.updated_at,
+    Task.user_id,
+)
+
+def _task_columns(fields: Optional[Sequence[str]]) -> tuple:
+    """Колонки TASK_COLUMNS для полей fields; ID выбирается всегда - по нему строится курсор."""
+    if fields is None:
+        return TASK_COLUMNS
+    return tuple(column for column in TASK_COLUMNS if column.key == "id" or column.key in fields)
+
+async def stream_task_rows(
+    db: AsyncSession,
+    user_id: int,
+    chunk_size: int
+) -> AsyncIterator[Sequence[Row]]:
+    """
+    Читать задачи пользователя в порядке ID частями по chunk_size строк.
+    Строки читаются курсором по мере выдачи, а не загружаются целиком.
+    """
+    result = await db.stream(
+        select(*TASK_COLUMNS)
+        .where(Task.user_id == user_id)
+        .order_by(Task.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    async for rows in result.partitions():
+        yield rows
+
+# Статусы задач, которые попадают в расписание
+SCHEDULABLE_STATUSES = (TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED)
+
+async def get_schedule_candidates(
+    db: AsyncSession,
+    user_id: int,
+    start_date: date,
+    end_date: date
+) -> Sequence[Row]:
+    """
+    Получить незавершенные задачи со сроком в интервале [start_date, end_date]
+    и положительной длительностью, в порядке ID.
+    Возвращает только колонки для расчета приоритета; статус и даты - в том виде,
+    в котором их хранит база (в SQLite - строками): без преобразования в объекты
+    Python их быстрее превратить в массивы NumPy.
+    """
+    result = await db.execute(
+        select(
+            Task.id,
+            Task.priority,
+            type_coerce(Task.status, String).label("status"),
+            type_coerce(Task.created_at, String).label("created_at"),
+            type_coerce(Task.due_date, String).label("due_date"),
+            Task.estimated_duration
+        )
+        .where(
+            Task.user_id == user_id,
+            Task.status.in_(SCHEDULABLE_STATUSES),
+            Task.due_date.between(start_date, end_date),
+            Task.estimated_duration > 0
+        )
+        .order_by(Task.id)
+    )
+    return result.all()
+
+async def get_task_rows_by_ids(
+    db: AsyncSession,
+    task_ids: List[int],
+    user_id: int,
+    fields: Optional[Sequence[str]] = None
+) -> List[Row]:
+    """
+    Получить строки задач пользователя (колонки TASK_COLUMNS, только полей fields,
+    если они заданы) по списку ID одним запросом в порядке списка.
+    """
+    if not task_ids:
+        return []
+    result = await db.execute(
+        select(*_task_columns(fields)).where(Task.user_id == user_id, Task.id.in_(task_ids))
+    )
+    rows = {row.id: row for row in result}
+    return [rows[task_id] for task_id in task_ids if task_id in rows]
+
+async def count_tasks_by_status(db: AsyncSession, user_id: int) -> Dict[TaskStatus, int]:
+    """Число задач пользователя в каждом статусе (GROUP BY); статусы без задач - с нулем."""
+    result = await db.execute(
+        select(Task.status, func.count(Task.id))
+        .where(Task.user_id == user_id)
+        .group_by(Task.status)
+    )
+    counts = dict.fromkeys(TaskStatus, 0)
+    counts.update({TaskStatus(status): count for status, count in result})
+    return counts
+
+def _cursor_value(cursor: Dict[str, Any], sort: TaskSort, key: str, type_):
+    """Достать значение ключа из курсора, проверив, что курсор создан для этой сортировки."""
+    if cursor.get("sort") != sort.value:
+        raise ValueError("Cursor does not match sort order")
+    try:
+        return type_(cursor[key])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+def _filter_conditions(filters: TaskFilter) -> list:
+    """
+    Условия WHERE для фильтров списка задач. Условия по статусу, сроку, категории
+    и дате создания вместе с user_id используют составные индексы таблицы задач.
+    """
+    conditions = []
+    statuses = set(filters.status) if filters.status else None
+    if filters.overdue:
+        # "Незавершенные" задается перечислением статусов, а не NOT IN:
+        # так условие остается диапазоном индекса (user_id, status, due_date)
+        open_statuses = set(SCHEDULABLE_STATUSES)
+        statuses = statuses & open_statuses if statuses is not None else open_statuses
+        conditions.append(Task.due_date < datetime.utcnow().date())
+    if statuses is not None:
+        conditions.append(Task.status.in_(list(statuses)))
+    if filters.category_id is not None:
+        conditions.append(Task.category_id == filters.category_id)
+    if filters.due_before is not None:
+        conditions.append(Task.due_date <= filters.due_before)
+    if filters.due_after is not None:
+        conditions.append(Task.due_date >= filters.due_after)
+    if filters.created_after is not None:
+        conditions.append(Task.created_at > to_naive_utc(filters.created_after))
+    return conditions
+
+def _task_row(task: Task) -> dict:
+    """Значения колонок TASK_COLUMNS задачи."""
+    return {column.key: getattr(task, column.key) for column in TASK_COLUMNS}
+
+def _tasks_saved(user_id: int, version: int, tasks: List[Task]) -> None:
+    """Учесть в кэшах задачи, сохраненные транзакцией с версией данных version."""
+    for task in tasks:
+        task_index.task_saved(user_id, task, version)
+    schedule_cache.tasks_changed(user_id, version, saved=[_task_row(task) for task in tasks])
+
+def _tasks_deleted(user_id: int, version: int, task_ids: List[int]) -> None:
+    """Учесть в кэшах задачи, удаленные транзакцией с версией данных version."""
+    for task_id in task_ids:
+        task_index.task_deleted(user_id, task_id, version)
+    schedule_cache.tasks_changed(user_id, version, deleted=task_ids)
+
+@coordinated_write
 async def create_task(db: AsyncSession, task: TaskCreate, user_id: int) -> Task:
-    """Создать новую задачу."""
-    db_task = Task(
-        **task.dict(),
-        user_id=user_id
+    """Создать новую задачу: INSERT ... RETURNING сразу возвращает сохраненную строку."""
+    result = await db.execute(
+        insert(Task).values(**task.dict(), user_id=user_id).returning(Task)
     )
-    db.add(db_task)
+    db_task = result.scalar_one()
+    version = await bump_data_version(db, user_id)
     await db.commit()
-    await db.refresh(db_task)
+    after_commit(db, partial(_tasks_saved, user_id, version, [db_task]))
     return db_task
 
+@coordinated_write
 async def update_task(db: AsyncSession, task_id: int, task: TaskUpdate, user_id: int) -> Optional[Task]:
-    """Обновить задачу."""
-    db_task = await get_task(db, task_id, user_id)
+    """
+    Обновить задачу одним запросом UPDATE ... RETURNING.
+    Возвращает None, если задача не найдена; без изменяемых полей задача только читается.
+    """
+    update_data = task.dict(exclude_unset=True)
+    if not update_data:
+        return await get_task(db, task_id, user_id)
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(**update_data)
+        .returning(Task)
+        .execution_options(populate_existing=True)
+    )
+    db_task = result.scalar_one_or_none()
     if db_task:
-        update_data = task.dict(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_task, key, value)
+        version = await bump_data_version(db, user_id)
         await db.commit()
-        await db.refresh(db_task)
+        after_commit(db, partial(_tasks_saved, user_id, version, [db_task]))
     return db_task
 
+@coordinated_write
 async def delete_task(db: AsyncSession, task_id: int, user_id: int) -> bool:
-    """Удалить задачу."""
-    db_task = await get_task(db, task_id, user_id)
-    if db_task:
-        await db.delete(db_task)
+    """Удалить задачу одним запросом DELETE ... RETURNING."""
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .returning(Task.id)
+    )
+    if result.scalar_one_or_none() is None:
+        return False
+    version = await bump_data_version(db, user_id)
+    await db.commit()
+    after_commit(db, partial(_tasks_deleted, user_id, version, [task_id]))
+    return True
+
+@coordinated_write
+async def create_tasks(db: AsyncSession, tasks: List[TaskCreate], user_id: int) -> List[Task]:
+    """Создать несколько задач одним запросом INSERT в одной транзакции."""
+    # SQLite вставляет строки многострочного INSERT по порядку, выдавая возрастающие ID,
+    # поэтому порядок элементов восстанавливается сортировкой по ID. Требование порядка
+    # RETURNING (sort_by_parameter_order) заставило бы отправлять строки по одной
+    result = await db.execute(
+        insert(Task).returning(Task),
+        [{**task.dict(), "user_id": user_id} for task in tasks]
+    )
+    db_tasks = sorted(result.scalars(), key=lambda db_task: db_task.id)
+    version = await bump_data_version(db, user_id)
+    await db.commit()
+    after_commit(db, partial(_tasks_saved, user_id, version, db_tasks))
+    return db_tasks
+
+@coordinated_write
+async def update_tasks(
+    db: AsyncSession,
+    items: List[TaskBulkUpdateItem],
+    user_id: int
+) -> List[Optional[Task]]:
+    """
+    Обновить несколько задач в одной транзакции.
+    Возвращает задачи в порядке элементов; None - задача не найдена.
+    Элементы без изменений задачу не меняют, а если других нет,
+    версия данных не увеличивается.
+    """
+    ids = {item.id for item in items}
+    result = await db.execute(select(Task.id).where(Task.user_id == user_id, Task.id.in_(ids)))
+    found = set(result.scalars())
+    if not found:
+        return [None] * len(items)
+    # Массовое обновление по первичному ключу: строки с одинаковым набором
+    # колонок отправляются одним executemany
+    values = [
+        item.dict(exclude_unset=True)
+        for item in items
+        if item.id in found and item.has_changes
+    ]
+    if values:
+        await db.execute(update(Task), values)
+    result = await db.execute(
+        select(Task)
+        .where(Task.id.in_(found))
+        .execution_options(populate_existing=True)
+    )
+    db_tasks = {db_task.id: db_task for db_task in result.scalars()}
+    if values:
+        updated = {update_data["id"] for update_data in values}
+        version = await bump_data_version(db, user_id)
+        await db.commit()
+        after_commit(db, partial(
+            _tasks_saved, user_id, version,
+            [db_task for task_id, db_task in db_tasks.items() if task_id in updated]
+        ))
+    return [db_tasks.get(item.id) for item in items]
+
+@coordinated_write
+async def delete_tasks(db: AsyncSession, task_ids: List[int], user_id: int) -> List[bool]:
+    """
+    Удалить несколько задач одним запросом DELETE.
+    Возвращает признак удаления для каждого ID в порядке списка.
+    """
+    result = await db.execute(
+        delete(Task)
+        .where(Task.user_id == user_id, Task.id.in_(set(task_ids)))
+        .returning(Task.id)
+    )
+    deleted = set(result.scalars())
+    if deleted:
+        version = await bump_data_version(db, user_id)
         await db.commit()
-        return True
-    return False 
\ No newline at end of file
+        after_commit(db, partial(_tasks_deleted, user_id, version, list(deleted)))
+    return [task_id in deleted for task_id in task_ids]
@@ -1,23 +1,17 @@
 """CRUD операции для пользователей."""
 
+from datetime import datetime
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from passlib.context import CryptContext
+from sqlalchemy import select, update
 
+from app.core.hashing import get_password_hash_async, verify_and_update_password_async
+from app.core.replicas import recent_writes
+from app.core.token_cache import token_cache
+from app.crud.refresh_token import revoke_user_refresh_tokens
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Проверить соответствие пароля хешу."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    """Получить хеш пароля."""
-    return pwd_context.hash(password)
-
 async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
     """Получить пользователя по ID."""
     query = select(User).where(User.id == user_id)
@@ -30,9 +24,48 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     result = await db.execute(query)
     return result.scalar_one_or_none()
 
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    """Получить текущую версию данных пользователя."""
+    result = await db.execute(select(User.data_version).where(User.id == user_id))
+    return result.scalar_one_or_none() or 0
+
+async def bump_data_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Увеличить версию данных пользователя в текущей транзакции и вернуть новое значение.
+    Вызывается до фиксации транзакции, в которой меняются данные.
+    """
+    result = await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        # updated_at сохраняется: версия меняется из-за задач, а не профиля
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        .returning(User.data_version)
+        .execution_options(synchronize_session=False)
+    )
+    version = result.scalar_one_or_none() or 0
+    # Пока реплики не содержат эту версию, пользователь читает с основной базы
+    recent_writes.mark(user_id, version)
+    return version
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Проверить почту и пароль пользователя.
+    Хеш, созданный с устаревшей стоимостью bcrypt, пересчитывается и сохраняется.
+    """
+    db_user = await get_user_by_email(db, email)
+    if not db_user:
+        return None
+    valid, new_hash = await verify_and_update_password_async(password, db_user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        db_user.hashed_password = new_hash
+        await db.commit()
+    return db_user
+
 async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """Создать нового пользователя."""
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         hashed_password=hashed_password,
@@ -55,14 +88,19 @@ async def update_user(
         return None
     
     update_data = user_update.model_dump(exclude_unset=True)
-    if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+    password_changed = "password" in update_data
+    if password_changed:
+        update_data["hashed_password"] = await get_password_hash_async(update_data.pop("password"))
+        update_data["password_changed_at"] = datetime.utcnow()
+        await revoke_user_refresh_tokens(db, user_id, commit=False)
     
     for field, value in update_data.items():
         setattr(db_user, field, value)
     
     await db.commit()
     await db.refresh(db_user)
+    if password_changed:
+        token_cache.invalidate_user(user_id)
     return db_user
 
 async def update_user_password(
@@ -75,6 +113,10 @@ async def update_user_password(
     if not db_user:
         return False
     
-    db_user.hashed_password = get_password_hash(new_password)
+    db_user.hashed_password = await get_password_hash_async(new_password)
+    # Токены, выпущенные до смены пароля, перестают приниматься
+    db_user.password_changed_at = datetime.utcnow()
+    await revoke_user_refresh_tokens(db, user_id, commit=False)
     await db.commit()
+    token_cache.invalidate_user(user_id)
     return True 
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""Модель блока календаря: время, занятое встречами или вне рабочих часов."""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+from app.schemas.calendar_block import BlockRecurrence
+
+class CalendarBlock(Base):
+    """Модель блока календаря."""
+    __tablename__ = "calendar_blocks"
+    __table_args__ = (
+        Index("ix_calendar_blocks_user_id_id", "user_id", "id"),
+        # Блоки, влияющие на расписание, выбираются по началу первого повторения
+        Index("ix_calendar_blocks_user_id_start_time", "user_id", "start_time"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    title = Column(String)
+    start_time = Column(DateTime, nullable=False)  # Начало первого повторения
+    end_time = Column(DateTime, nullable=False)
+    recurrence = Column(Enum(BlockRecurrence), nullable=False, default=BlockRecurrence.NONE)
+    recurrence_until = Column(DateTime, nullable=True)
+    # Не раньше конца последнего повторения; NULL - блок повторяется бессрочно
+    last_end_time = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    user = relationship("User")
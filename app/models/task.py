@@ -1,7 +1,7 @@
 """Модель задачи."""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Enum, Index
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -10,9 +10,19 @@ from app.schemas.task import TaskStatus
 class Task(Base):
     """Модель задачи."""
     __tablename__ = "tasks"
+    # Индексы под запросы CRUD: выборки задач ограничены пользователем
+    __table_args__ = (
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_status_due_date", "user_id", "status", "due_date"),
+        # Фильтры списка задач по сроку и дате создания без фильтра по статусу
+        Index("ix_tasks_user_id_due_date", "user_id", "due_date"),
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at"),
+        # category_id первым: удаление категории ищет ее задачи без user_id
+        Index("ix_tasks_category_id_user_id", "category_id", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String, index=True)
+    title = Column(String)
     description = Column(String, nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.PENDING)
     priority = Column(Integer, default=0)
@@ -17,6 +17,9 @@ class User(Base):
     priority = Column(Integer, default=3)  # Приоритет пользователя от 1 до 5
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    password_changed_at = Column(DateTime, nullable=True)  # Токены, выданные раньше, недействительны
+    # Версия данных пользователя: увеличивается при каждом изменении его задач
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     tasks = relationship("Task", back_populates="user")
     categories = relationship("Category", back_populates="user") 
\ No newline at end of file
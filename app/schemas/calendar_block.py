@@ -0,0 +1,57 @@
+"""Схемы для блоков календаря."""
+
+from enum import Enum
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field, validator
+
+from app.core.timeutil import to_naive_utc
+
+class BlockRecurrence(str, Enum):
+    """Повторение блока календаря."""
+    NONE = "none"
+    DAILY = "daily"
+    WEEKDAYS = "weekdays"  # Каждый день с понедельника по пятницу
+    WEEKLY = "weekly"
+
+class CalendarBlockBase(BaseModel):
+    """Базовая схема блока календаря."""
+    title: str = Field(..., example="Планерка")
+    start_time: datetime = Field(..., example="2024-07-01T10:00:00")
+    end_time: datetime = Field(..., example="2024-07-01T10:30:00")
+    recurrence: BlockRecurrence = Field(default=BlockRecurrence.NONE, example="weekdays")
+    recurrence_until: Optional[datetime] = Field(
+        None, description="Last moment an occurrence may start; empty - repeats indefinitely"
+    )
+
+    @validator('start_time', 'end_time', 'recurrence_until')
+    def to_naive_utc(cls, v):
+        """Время с часовым поясом переводится в UTC без пояса: так время хранится в базе."""
+        return None if v is None else to_naive_utc(v)
+
+class CalendarBlockCreate(CalendarBlockBase):
+    """Схема для создания блока календаря."""
+
+    @validator('end_time')
+    def validate_end_time(cls, v, values):
+        if 'start_time' in values and v <= values['start_time']:
+            raise ValueError("end_time must be after start_time")
+        return v
+
+class CalendarBlockUpdate(CalendarBlockBase):
+    """Схема для обновления блока календаря."""
+    title: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+    recurrence: Optional[BlockRecurrence] = None
+
+class CalendarBlock(CalendarBlockBase):
+    """Схема блока календаря."""
+    id: int
+    user_id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        """Конфигурация схемы."""
+        from_attributes = True
@@ -0,0 +1,20 @@
+"""Схемы для сводки главного экрана."""
+
+from typing import Dict, List
+from pydantic import BaseModel
+
+from app.schemas.task import Task, TaskStatus
+
+class CategoryTaskCount(BaseModel):
+    """Число задач в категории."""
+    id: int
+    name: str
+    task_count: int
+
+class Dashboard(BaseModel):
+    """Схема сводки: самые приоритетные и просроченные задачи, число задач по статусам и категориям."""
+    top_tasks: List[Task]
+    overdue_tasks: List[Task]
+    status_counts: Dict[TaskStatus, int]
+    categories: List[CategoryTaskCount]
+    uncategorized_count: int
@@ -0,0 +1,24 @@
+"""Схемы для импорта данных."""
+
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+class ImportTarget(str, Enum):
+    """Тип импортируемых записей."""
+    TASKS = "tasks"
+    CATEGORIES = "categories"
+
+class ImportRowError(BaseModel):
+    """Отклоненная запись: строка начала записи во входных данных и причина."""
+    line: int
+    error: str
+    record: Optional[dict] = None
+
+class ImportReport(BaseModel):
+    """Итоги импорта."""
+    imported: int
+    rejected: int
+    errors: List[ImportRowError]
+    elapsed_seconds: float
+    rows_per_second: float
@@ -5,6 +5,8 @@ from datetime import datetime, date
 from typing import Optional, List
 from pydantic import BaseModel, Field, validator
 
+from app.core.config import settings
+
 class TaskStatus(str, Enum):
     """Статусы задачи."""
     PENDING = "pending"
@@ -13,6 +15,25 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
     BLOCKED = "blocked"
 
+class TaskSort(str, Enum):
+    """Порядок сортировки списка задач."""
+    PRIORITY = "priority"
+    ID = "id"
+
+class TaskFilter(BaseModel):
+    """Фильтры списка задач; незаданные фильтры не ограничивают выборку."""
+    status: Optional[List[TaskStatus]] = None
+    category_id: Optional[int] = None
+    due_before: Optional[date] = None  # Срок не позже этой даты
+    due_after: Optional[date] = None  # Срок не раньше этой даты
+    created_after: Optional[datetime] = None
+    overdue: bool = False  # Только незавершенные задачи с прошедшим сроком
+
+class TaskExportFormat(str, Enum):
+    """Формат выгрузки задач."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
 class TaskBase(BaseModel):
     """Базовая схема задачи."""
     title: str = Field(..., example="Сделать домашку")
@@ -67,6 +88,57 @@ class Task(TaskInDB):
     """Схема задачи для API."""
     # pass
 
+class BulkItemStatus(str, Enum):
+    """Результат обработки элемента пакетного запроса."""
+    CREATED = "created"
+    UPDATED = "updated"
+    UNCHANGED = "unchanged"
+    DELETED = "deleted"
+    NOT_FOUND = "not_found"
+
+class TaskBulkCreate(BaseModel):
+    """Схема пакетного создания задач."""
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """Изменения одной задачи в пакетном обновлении."""
+    id: int
+
+    @property
+    def has_changes(self) -> bool:
+        """Заданы ли поля, кроме ID: элемент только с ID задачу не меняет."""
+        return bool(self.model_fields_set - {"id"})
+
+class TaskBulkUpdate(BaseModel):
+    """Схема пакетного обновления задач."""
+    tasks: List[TaskBulkUpdateItem] = Field(
+        ..., min_length=1, max_length=settings.BULK_MAX_ITEMS
+    )
+
+class TaskBulkDelete(BaseModel):
+    """Схема пакетного удаления задач."""
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class TaskBatchGet(BaseModel):
+    """Схема пакетного получения задач по ID."""
+    ids: List[int] = Field(..., min_length=1, max_length=settings.BULK_MAX_ITEMS)
+
+class TaskBatchGetResponse(BaseModel):
+    """Найденные задачи в порядке запроса и ID, которые не найдены."""
+    tasks: List[Task]
+    missing: List[int]
+
+class TaskBulkItemResult(BaseModel):
+    """Результат обработки одного элемента пакета."""
+    index: int
+    id: Optional[int] = None
+    status: BulkItemStatus
+    task: Optional[Task] = None
+
+class TaskBulkResponse(BaseModel):
+    """Схема ответа пакетной операции: результаты в порядке элементов запроса."""
+    results: List[TaskBulkItemResult]
+
 class ScheduledTask(TaskInDB):
     """Схема запланированной задачи."""
     start_time: datetime
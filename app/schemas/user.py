@@ -38,6 +38,11 @@ class Token(BaseModel):
     """Схема токена доступа."""
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+
+class RefreshTokenRequest(BaseModel):
+    """Схема запроса на обновление токена доступа."""
+    refresh_token: str
 
 class TokenPayload(BaseModel):
     """Схема полезной нагрузки токена."""
@@ -0,0 +1,44 @@
+"""Бенчмарк стоимости аутентификации запроса с кэшем проверенных токенов и без него.
+
+Запуск: python -m benchmarks.bench_auth
+"""
+
+import asyncio
+import time
+
+from app.core.security import get_current_user
+from app.core.token_cache import token_cache
+from benchmarks.common import benchmark_app
+
+ITERATIONS = 2_000
+
+async def main():
+    async with benchmark_app() as (client, session_factory, headers, _):
+        token = headers["Authorization"].split()[1]
+        print(f"{'scenario':<28} {'per request, us':>16}")
+
+        async with session_factory() as session:
+            for cached in (False, True):
+                token_cache.clear()
+                start = time.perf_counter()
+                for _ in range(ITERATIONS):
+                    if not cached:
+                        token_cache.clear()
+                    await get_current_user(token, session)
+                elapsed = (time.perf_counter() - start) / ITERATIONS * 1e6
+                label = "get_current_user, " + ("cached" if cached else "no cache")
+                print(f"{label:<28} {elapsed:>16.1f}")
+
+        for cached in (False, True):
+            token_cache.clear()
+            start = time.perf_counter()
+            for _ in range(ITERATIONS // 4):
+                if not cached:
+                    token_cache.clear()
+                await client.get("/api/v1/auth/me", headers=headers)
+            elapsed = (time.perf_counter() - start) / (ITERATIONS // 4) * 1e6
+            label = "GET /auth/me, " + ("cached" if cached else "no cache")
+            print(f"{label:<28} {elapsed:>16.1f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
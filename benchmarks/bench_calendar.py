@@ -0,0 +1,137 @@
+"""Бенчмарк расписания вокруг блоков календаря: тысячи повторяющихся блоков за квартал.
+
+Для сравнения размещение выполняется и линейным поиском свободного интервала
+(O(n·m)), и деревом отрезков FreeSlots (O(n·log m)).
+
+Запуск: python -m benchmarks.bench_calendar
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+from sqlalchemy import insert
+
+from app.core.calendar import (
+    MICROSECONDS_PER_HOUR,
+    FreeSlots,
+    busy_intervals,
+    last_end_time,
+    to_microseconds,
+)
+from app.core.scheduler import pack, prioritize
+from app.crud.calendar_block import get_busy_blocks
+from app.crud.task import get_schedule_candidates
+from app.models.calendar_block import CalendarBlock
+from app.models.task import Task
+from app.schemas.calendar_block import BlockRecurrence
+from app.schemas.task import TaskStatus
+from benchmarks.common import benchmark_app
+
+BLOCK_COUNTS = (1_000, 2_000, 4_000)
+TASKS = 20_000
+WINDOW_DAYS = 90
+
+def linear_pack(hours, start, end, busy):
+    """Размещение с линейным поиском самого раннего подходящего интервала."""
+    gap_starts = [to_microseconds(start)] + busy.ends.tolist()
+    gap_ends = busy.starts.tolist() + [to_microseconds(end)]
+    placed = 0
+    for duration in np.rint(np.asarray(hours) * MICROSECONDS_PER_HOUR).astype(np.int64).tolist():
+        for index, gap_start in enumerate(gap_starts):
+            if gap_ends[index] - gap_start >= duration:
+                gap_starts[index] = gap_start + duration
+                placed += 1
+                break
+    return placed
+
+def block_rows(rng, count, start, user_id):
+    """
+    Повторяющиеся блоки по 5-20 минут в любое время суток. Повторения
+    ограничены recurrence_until, иначе тысячи блоков заняли бы весь квартал.
+    """
+    recurrences = {
+        BlockRecurrence.WEEKLY: (14, WINDOW_DAYS),
+        BlockRecurrence.WEEKDAYS: (7, 21),
+        BlockRecurrence.DAILY: (3, 10),
+    }
+    rows = []
+    for _ in range(count):
+        block_start = start + timedelta(
+            days=rng.randint(-7, WINDOW_DAYS), minutes=5 * rng.randint(0, 287)
+        )
+        recurrence = rng.choice(list(recurrences))
+        block_end = block_start + timedelta(minutes=5 * rng.randint(1, 4))
+        until = block_start + timedelta(days=rng.randint(*recurrences[recurrence]))
+        rows.append({
+            "title": "Busy",
+            "start_time": block_start,
+            "end_time": block_end,
+            "recurrence": recurrence,
+            "recurrence_until": until,
+            "last_end_time": last_end_time(block_start, block_end, recurrence, until),
+            "user_id": user_id,
+        })
+    return rows
+
+async def main():
+    print(
+        f"{'blocks':>7} {'busy':>7} {'scheduled':>10} {'load, ms':>9} {'expand, ms':>11} "
+        f"{'pack, ms':>9} {'linear, ms':>11} {'endpoint, ms':>13}"
+    )
+    statuses = [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED]
+    for count in BLOCK_COUNTS:
+        async with benchmark_app() as (client, session_factory, headers, user_id):
+            rng = random.Random(count)
+            now = datetime.utcnow()
+            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            end = start + timedelta(days=WINDOW_DAYS)
+            async with session_factory() as session:
+                await session.execute(insert(CalendarBlock), block_rows(rng, count, start, user_id))
+                await session.execute(insert(Task), [
+                    {
+                        "title": f"Task {i}",
+                        "priority": rng.randint(1, 5),
+                        "status": rng.choice(statuses),
+                        "due_date": (start + timedelta(days=rng.randint(0, WINDOW_DAYS))).date(),
+                        "estimated_duration": rng.choice([0.25, 0.5, 1, 2, 3]),
+                        "created_at": now - timedelta(hours=rng.uniform(0, 240)),
+                        "updated_at": now,
+                        "user_id": user_id,
+                    }
+                    for i in range(TASKS)
+                ])
+                await session.commit()
+
+                started = time.perf_counter()
+                blocks = await get_busy_blocks(session, user_id, start, end)
+                loaded = time.perf_counter()
+                busy = busy_intervals(blocks, start, end)
+                expanded = time.perf_counter()
+                candidates = await get_schedule_candidates(
+                    session, user_id, start.date(), end.date()
+                )
+                _, hours, _ = prioritize(candidates, now)
+                packing = time.perf_counter()
+                slots = pack(hours, FreeSlots(start, end, busy))
+                packed = time.perf_counter()
+                placed = linear_pack(hours, start, end, busy)
+                linear = time.perf_counter() - packed
+                assert placed == len(slots)
+
+            params = {"start_date": start.isoformat(), "end_date": end.isoformat()}
+            request_started = time.perf_counter()
+            response = await client.get("/api/v1/tasks/schedule", params=params, headers=headers)
+            endpoint = time.perf_counter() - request_started
+            assert response.status_code == 200
+
+            print(
+                f"{count:>7} {len(busy.starts):>7} {len(slots):>10} "
+                f"{(loaded - started) * 1e3:>9.1f} {(expanded - loaded) * 1e3:>11.1f} "
+                f"{(packed - packing) * 1e3:>9.1f} {linear * 1e3:>11.1f} {endpoint * 1e3:>13.1f}"
+            )
+
+if __name__ == "__main__":
+    asyncio.run(main())
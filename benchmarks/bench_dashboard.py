@@ -0,0 +1,125 @@
+"""Бенчмарк сводки главного экрана: запросы по очереди против asyncio.gather.
+
+Сводка - самые приоритетные и просроченные задачи, число задач по статусам
+и по категориям - собирается в файловой базе SQLite с пулом соединений
+build_engine. "По очереди" - все запросы в одной сессии, как при наивной
+реализации эндпоинта; "gather" - каждый запрос в своей сессии одновременно,
+как в GET /api/v1/dashboard. Индекс приоритетов загружается до замеров.
+Одновременные запросы выполняются в потоках aiosqlite параллельно только
+на нескольких ядрах, поэтому выводится число ядер.
+
+Запуск: python -m benchmarks.bench_dashboard
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, build_engine
+from app.core.task_index import task_index
+from app.crud import category as category_crud
+from app.crud import task as task_crud
+from app.models.calendar_block import CalendarBlock  # noqa: F401 - таблица для create_all
+from app.models.category import Category
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskFilter, TaskStatus
+
+TASKS = 50_000
+CATEGORIES = 30
+REPEATS = 50
+
+def queries(user_id: int):
+    """Запросы сводки: функции, принимающие сессию."""
+    limit = settings.DASHBOARD_TASKS_LIMIT
+    return [
+        lambda db: task_crud.get_tasks_page(db, user_id, limit=limit),
+        lambda db: task_crud.get_tasks_page(
+            db, user_id, limit=limit, filters=TaskFilter(overdue=True)
+        ),
+        lambda db: task_crud.count_tasks_by_status(db, user_id),
+        lambda db: category_crud.count_tasks_by_category(db, user_id),
+    ]
+
+async def seed(session_factory) -> int:
+    """Создать пользователя с категориями и задачами; возвращает ID пользователя."""
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        user = User(email="bench@example.com", hashed_password="", full_name="Bench")
+        session.add(user)
+        await session.flush()
+        await session.execute(insert(Category), [
+            {"name": f"Категория {i}", "user_id": user.id} for i in range(CATEGORIES)
+        ])
+        await session.execute(insert(Task), [
+            {
+                "title": f"Задача {i}",
+                "priority": rng.randint(1, 5),
+                "status": rng.choice(list(TaskStatus)),
+                "due_date": (now + timedelta(days=rng.randint(-30, 90))).date(),
+                "estimated_duration": rng.randint(1, 8),
+                "category_id": rng.choice([None, *range(1, CATEGORIES + 1)]),
+                "created_at": now - timedelta(hours=rng.uniform(0, 240)),
+                "updated_at": now,
+                "user_id": user.id,
+            }
+            for i in range(TASKS)
+        ])
+        await session.commit()
+        return user.id
+
+async def sequential(session_factory, user_id: int):
+    """Все запросы сводки по очереди в одной сессии."""
+    async with session_factory() as session:
+        return [await query(session) for query in queries(user_id)]
+
+async def concurrent(session_factory, user_id: int):
+    """Запросы сводки одновременно, каждый в своей сессии."""
+
+    async def in_session(query):
+        async with session_factory() as session:
+            return await query(session)
+
+    return await asyncio.gather(*(in_session(query) for query in queries(user_id)))
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        engine = build_engine(f"sqlite+aiosqlite:///{Path(directory) / 'dashboard.db'}")
+        session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        user_id = await seed(session_factory)
+        await sequential(session_factory, user_id)
+
+        print(
+            f"{TASKS} tasks, {CATEGORIES} categories, {REPEATS} repeats, "
+            f"{os.cpu_count()} CPU"
+        )
+        print(f"{'mode':>10} {'p50, ms':>8} {'p95, ms':>8}")
+        for name, build in (("sequential", sequential), ("gather", concurrent)):
+            samples = []
+            for _ in range(REPEATS):
+                started = time.perf_counter()
+                await build(session_factory, user_id)
+                samples.append(time.perf_counter() - started)
+            samples.sort()
+            print(
+                f"{name:>10} {statistics.median(samples) * 1e3:>8.1f} "
+                f"{samples[int(len(samples) * 0.95) - 1] * 1e3:>8.1f}"
+            )
+        await engine.dispose()
+        task_index.clear()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,54 @@
+"""Бенчмарк потоковой выгрузки: пиковая память и время до первой части.
+
+Запуск: python -m benchmarks.bench_export
+"""
+
+import asyncio
+import time
+import tracemalloc
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.core.export import export_tasks
+from app.models.task import Task
+from app.schemas.task import TaskExportFormat
+from benchmarks.common import benchmark_app
+
+SIZES = (10_000, 100_000)
+
+async def main():
+    print(
+        f"{'tasks':>8} {'format':>7} {'first chunk, ms':>16} "
+        f"{'total, s':>9} {'MB':>7} {'peak memory, MB':>16}"
+    )
+    for size in SIZES:
+        async with benchmark_app() as (_, session_factory, _, user_id):
+            now = datetime.utcnow()
+            async with session_factory() as session:
+                await session.execute(insert(Task), [
+                    {"title": f"Task {i}", "priority": i % 5 + 1, "user_id": user_id,
+                     "created_at": now, "updated_at": now}
+                    for i in range(size)
+                ])
+                await session.commit()
+
+            for export_format in TaskExportFormat:
+                tracemalloc.start()
+                start = time.perf_counter()
+                first_chunk = None
+                total_bytes = 0
+                async for chunk in export_tasks(session_factory, user_id, export_format):
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter() - start
+                    total_bytes += len(chunk.encode())
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(
+                    f"{size:>8} {export_format.value:>7} {first_chunk * 1e3:>16.1f} "
+                    f"{elapsed:>9.2f} {total_bytes / 1e6:>7.1f} {peak / 1e6:>16.2f}"
+                )
+
+if __name__ == "__main__":
+    asyncio.run(main())
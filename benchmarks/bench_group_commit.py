@@ -0,0 +1,103 @@
+"""Бенчмарк группировки записей: фиксация на каждый запрос против координатора записи.
+
+Пачки одновременных клиентов создают задачи через CRUD в файловой базе SQLite.
+Без координатора каждая операция фиксирует свою транзакцию и ждет блокировку
+записи; с координатором все операции, пришедшие за окно, фиксируются одной
+транзакцией. Сравнение выполняется для synchronous=NORMAL (профиль по умолчанию)
+и FULL, при котором каждая фиксация синхронизирует диск.
+
+Запуск: python -m benchmarks.bench_group_commit
+"""
+
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import Base, WriteCoordinator, build_engine
+from app.core.schedule_cache import schedule_cache
+from app.core.task_index import task_index
+from app.crud import task as task_crud
+from app.models.calendar_block import CalendarBlock  # noqa: F401 - таблица для create_all
+from app.models.category import Category  # noqa: F401 - внешний ключ задач
+from app.models.user import User
+from app.schemas.task import TaskCreate
+
+CLIENTS = 64
+BURSTS = 20
+
+async def run(synchronous: str, coordinated: bool, directory: Path):
+    """Выполнить пачки записей; возвращает операции в секунду и задержки в миллисекундах."""
+    settings.SQLITE_SYNCHRONOUS = synchronous
+    name = f"{synchronous}-{'group' if coordinated else 'single'}"
+    engine = build_engine(f"sqlite+aiosqlite:///{directory / f'{name}.db'}")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with session_factory() as session:
+        user = User(email="bench@example.com", hashed_password="", full_name="Bench")
+        session.add(user)
+        await session.commit()
+        user_id = user.id
+
+    coordinator = None
+    if coordinated:
+        coordinator = WriteCoordinator(
+            engine, settings.DB_GROUP_COMMIT_WINDOW_MS / 1000, settings.DB_GROUP_COMMIT_MAX_BATCH
+        )
+    database.write_coordinator = coordinator
+    latencies = []
+
+    async def write(index: int):
+        started = time.perf_counter()
+        async with session_factory() as session:
+            await task_crud.create_task(
+                session, TaskCreate(title=f"Задача {index}", priority=index % 5 + 1), user_id
+            )
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for burst in range(BURSTS):
+        await asyncio.gather(*(write(burst * CLIENTS + index) for index in range(CLIENTS)))
+    elapsed = time.perf_counter() - started
+
+    if coordinator is not None:
+        await coordinator.stop()
+    database.write_coordinator = None
+    await engine.dispose()
+    task_index.clear()
+    schedule_cache.clear()
+    latencies.sort()
+    return (
+        len(latencies) / elapsed,
+        statistics.median(latencies) * 1e3,
+        latencies[int(len(latencies) * 0.95)] * 1e3,
+    )
+
+async def main():
+    print(
+        f"{CLIENTS} clients x {BURSTS} bursts\n"
+        f"{'synchronous':>11} {'single, ops/s':>14} {'p50, ms':>8} {'p95, ms':>8} "
+        f"{'group, ops/s':>13} {'p50, ms':>8} {'p95, ms':>8}"
+    )
+    profile = settings.SQLITE_SYNCHRONOUS
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for synchronous in ("NORMAL", "FULL"):
+                single = await run(synchronous, False, Path(directory))
+                group = await run(synchronous, True, Path(directory))
+                print(
+                    f"{synchronous:>11} {single[0]:>14.0f} {single[1]:>8.1f} {single[2]:>8.1f} "
+                    f"{group[0]:>13.0f} {group[1]:>8.1f} {group[2]:>8.1f}"
+                )
+    finally:
+        settings.SQLITE_SYNCHRONOUS = profile
+
+if __name__ == "__main__":
+    asyncio.run(main())
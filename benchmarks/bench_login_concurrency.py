@@ -0,0 +1,71 @@
+"""Бенчмарк: отзывчивость API во время пачки входов в систему.
+
+Сравнивает хеширование в цикле событий (PASSWORD_HASH_WORKERS=0)
+с хешированием в пуле потоков. Пока выполняются входы, отдельная задача
+опрашивает GET /api/v1/auth/me и замеряет задержки.
+
+Запуск: python -m benchmarks.bench_login_concurrency
+"""
+
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core import hashing
+from app.core.config import settings
+from app.models.user import User
+from benchmarks.common import benchmark_app
+
+LOGINS = 16
+
+async def run(workers: int):
+    """Выполнить сценарий с заданным числом потоков хеширования."""
+    hashing._executor = ThreadPoolExecutor(max_workers=workers) if workers > 0 else None
+    async with benchmark_app() as (client, session_factory, headers, _):
+        async with session_factory() as session:
+            session.add(User(
+                email="login@example.com",
+                hashed_password=hashing.get_password_hash("password"),
+                full_name="Login"
+            ))
+            await session.commit()
+
+        latencies = []
+        done = asyncio.Event()
+
+        async def poll():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/v1/auth/me", headers=headers)
+                latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(0.005)
+
+        async def login():
+            await client.post(
+                "/api/v1/auth/login",
+                data={"username": "login@example.com", "password": "password"}
+            )
+
+        poller = asyncio.create_task(poll())
+        start = time.perf_counter()
+        await asyncio.gather(*(login() for _ in range(LOGINS)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await poller
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    worst = latencies[-1] * 1000
+    print(
+        f"{workers:>8} {elapsed:>10.2f} {len(latencies):>8} {p50:>10.1f} {worst:>10.1f}"
+    )
+
+async def main():
+    print(f"{LOGINS} concurrent logins, bcrypt rounds={settings.BCRYPT_ROUNDS}")
+    print(f"{'workers':>8} {'logins, s':>10} {'polls':>8} {'p50, ms':>10} {'max, ms':>10}")
+    for workers in (0, settings.PASSWORD_HASH_WORKERS):
+        await run(workers)
+
+if __name__ == "__main__":
+    asyncio.run(main())
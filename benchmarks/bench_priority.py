@@ -0,0 +1,71 @@
+"""Бенчмарк расчета приоритетов: поштучный путь против векторизованного.
+
+Запуск: python -m benchmarks.bench_priority
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.core.priority import calculate_priorities_batch, calculate_priority
+from app.schemas.task import TaskStatus
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+def make_columns(count: int, now: datetime):
+    """Сгенерировать случайные столбцы задач."""
+    rng = np.random.default_rng(0)
+    now64 = np.datetime64(now, "us")
+    created_at = now64 - rng.integers(0, 30 * 24 * 3600, count).astype("timedelta64[s]")
+    due_date = (now64 + rng.integers(-10, 30, count).astype("timedelta64[D]")).astype(
+        "datetime64[D]"
+    )
+    due_date[rng.random(count) < 0.3] = np.datetime64("NaT")
+    statuses = np.array(list(TaskStatus), dtype=object)
+    return {
+        "created_at": created_at,
+        "due_date": due_date,
+        "estimated_duration": rng.choice([0.0, 1.0, 4.0, 8.0, 24.0], count),
+        "status": statuses[rng.integers(0, len(statuses), count)],
+        "priority": rng.integers(1, 6, count).astype(np.float64),
+    }
+
+class _Row:
+    """Легковесная замена ORM-объекта для скалярного расчета."""
+    __slots__ = ("priority", "status", "created_at", "due_date", "estimated_duration")
+
+def to_rows(columns):
+    """Преобразовать столбцы в объекты для calculate_priority."""
+    rows = []
+    for i in range(len(columns["priority"])):
+        row = _Row()
+        row.priority = columns["priority"][i]
+        row.status = columns["status"][i]
+        row.created_at = columns["created_at"][i].item()
+        due = columns["due_date"][i]
+        row.due_date = None if np.isnat(due) else due.item()
+        row.estimated_duration = columns["estimated_duration"][i]
+        rows.append(row)
+    return rows
+
+def main():
+    now = datetime.utcnow()
+    print(f"{'tasks':>10} {'scalar, s':>12} {'batch, s':>10} {'speedup':>8}")
+    for size in SIZES:
+        columns = make_columns(size, now)
+        rows = to_rows(columns)
+
+        start = time.perf_counter()
+        scalar = sorted(rows, key=lambda row: calculate_priority(row, now), reverse=True)
+        scalar_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        scores, order = calculate_priorities_batch(**columns, now=now)
+        batch_time = time.perf_counter() - start
+
+        assert len(scalar) == len(order) == len(scores)
+        print(f"{size:>10} {scalar_time:>12.4f} {batch_time:>10.4f} {scalar_time / batch_time:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Бенчмарк построения расписания на 10k и 100k задач пользователя.
+
+Запуск: python -m benchmarks.bench_schedule
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.core.scheduler import pack, prioritize, schedule_response
+from app.crud.task import get_schedule_candidates, get_task_rows_by_ids
+from app.models.task import Task
+from app.schemas.task import TaskStatus
+from benchmarks.common import benchmark_app
+
+SIZES = (10_000, 100_000)
+WINDOW_DAYS = 90
+
+async def main():
+    print(
+        f"{'tasks':>8} {'scheduled':>10} {'load, ms':>9} {'sort, ms':>9} "
+        f"{'pack, ms':>9} {'response, ms':>13} {'endpoint, ms':>13} {'cached, ms':>11} "
+        f"{'updated, ms':>12}"
+    )
+    statuses = [TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED]
+    for size in SIZES:
+        async with benchmark_app() as (client, session_factory, headers, user_id):
+            rng = random.Random(size)
+            now = datetime.utcnow()
+            start = now.replace(hour=9, minute=0, second=0, microsecond=0)
+            end = start + timedelta(days=WINDOW_DAYS)
+            async with session_factory() as session:
+                await session.execute(insert(Task), [
+                    {
+                        "title": f"Task {i}",
+                        "priority": rng.randint(1, 5),
+                        "status": rng.choice(statuses),
+                        "due_date": (start + timedelta(days=rng.randint(0, WINDOW_DAYS))).date(),
+                        "estimated_duration": rng.randint(1, 8),
+                        "created_at": now - timedelta(hours=rng.uniform(0, 240)),
+                        "updated_at": now,
+                        "user_id": user_id,
+                    }
+                    for i in range(size)
+                ])
+                await session.commit()
+
+                started = time.perf_counter()
+                candidates = await get_schedule_candidates(
+                    session, user_id, start.date(), end.date()
+                )
+                loaded = time.perf_counter()
+                task_ids, hours, _ = prioritize(candidates, now)
+                sorted_at = time.perf_counter()
+                slots = pack(hours, start, end)
+                packed = time.perf_counter()
+                tasks = await get_task_rows_by_ids(
+                    session, [task_ids[slot.position] for slot in slots], user_id
+                )
+                schedule_response([dict(row._mapping) for row in tasks], slots, start, end)
+                built = time.perf_counter()
+
+            params = {"start_date": start.isoformat(), "end_date": end.isoformat()}
+            request_started = time.perf_counter()
+            response = await client.get("/api/v1/tasks/schedule", params=params, headers=headers)
+            endpoint = time.perf_counter() - request_started
+            assert response.status_code == 200
+
+            # Повторный запрос без изменений отдается из кэша
+            request_started = time.perf_counter()
+            await client.get("/api/v1/tasks/schedule", params=params, headers=headers)
+            cached = time.perf_counter() - request_started
+
+            # После изменения одной задачи расписание пересчитывается с ее места
+            task_id = response.json()["tasks"][len(slots) // 2]["id"]
+            await client.put(f"/api/v1/tasks/{task_id}", json={"priority": 1}, headers=headers)
+            request_started = time.perf_counter()
+            await client.get("/api/v1/tasks/schedule", params=params, headers=headers)
+            updated = time.perf_counter() - request_started
+
+            print(
+                f"{size:>8} {len(slots):>10} {(loaded - started) * 1e3:>9.1f} "
+                f"{(sorted_at - loaded) * 1e3:>9.1f} {(packed - sorted_at) * 1e3:>9.1f} "
+                f"{(built - packed) * 1e3:>13.1f} {endpoint * 1e3:>13.1f} "
+                f"{cached * 1e3:>11.1f} {updated * 1e3:>12.1f}"
+            )
+
+if __name__ == "__main__":
+    asyncio.run(main())
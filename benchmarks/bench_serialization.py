@@ -0,0 +1,131 @@
+"""Бенчмарк сериализации страниц списков: response_model против строк в байты.
+
+"До" - путь FastAPI по response_model: ORM-объекты, проверка схемой
+(from_attributes) и JSONResponse. "После" - строки запроса и dump_rows.
+
+Запуск: python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy import insert, select
+
+from app.core.serialization import dump_rows
+from app.crud.category import CATEGORY_COLUMNS
+from app.crud.task import TASK_COLUMNS
+from app.models.category import Category
+from app.models.task import Task
+from app.schemas.category import Category as CategorySchema
+from app.schemas.task import Task as TaskSchema, TaskStatus
+from benchmarks.common import benchmark_app
+from main import app
+
+ROWS = 5_000
+PAGE_SIZES = (20, 100, 500)
+REPEATS = 200
+
+def response_field(path: str):
+    """Поле response_model GET-эндпоинта."""
+    route = next(
+        route for route in app.routes
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods
+    )
+    return route.response_field
+
+async def timed(action, repeats: int = REPEATS) -> float:
+    """Среднее время выполнения корутины action в микросекундах."""
+    started = time.perf_counter()
+    for _ in range(repeats):
+        await action()
+    return (time.perf_counter() - started) / repeats * 1e6
+
+async def main():
+    print(
+        f"{'list':>10} {'page':>5} {'serialize before, us':>21} {'after, us':>10} "
+        f"{'load+serialize before, us':>26} {'after, us':>10} {'endpoint, us':>13}"
+    )
+    async with benchmark_app() as (client, session_factory, headers, user_id):
+        rng = random.Random(1)
+        now = datetime.utcnow()
+        async with session_factory() as session:
+            await session.execute(insert(Category), [
+                {"name": f"Категория {i}", "description": "Описание" if i % 2 else None,
+                 "created_at": now, "updated_at": now, "user_id": user_id}
+                for i in range(ROWS)
+            ])
+            await session.execute(insert(Task), [
+                {
+                    "title": f"Задача {i}",
+                    "description": "Описание задачи" if i % 3 else None,
+                    "priority": rng.randint(1, 5),
+                    "status": rng.choice([status for status in TaskStatus if status != TaskStatus.CANCELLED]),
+                    "due_date": (now + timedelta(days=rng.randint(0, 90))).date(),
+                    "estimated_duration": rng.randint(1, 8),
+                    "created_at": now - timedelta(hours=rng.uniform(0, 240)),
+                    "updated_at": now,
+                    "user_id": user_id,
+                }
+                for i in range(ROWS)
+            ])
+            await session.commit()
+
+        lists = [
+            ("tasks", "/api/v1/tasks/", Task, TASK_COLUMNS, TaskSchema),
+            ("categories", "/api/v1/categories/", Category, CATEGORY_COLUMNS, CategorySchema),
+        ]
+        for name, path, model, columns, schema in lists:
+            field = response_field(path)
+            for size in PAGE_SIZES:
+                async with session_factory() as session:
+                    query = select(model).where(model.user_id == user_id).order_by(model.id)
+                    row_query = (
+                        select(*columns).where(model.user_id == user_id).order_by(model.id)
+                    )
+                    objects = (await session.execute(query.limit(size))).scalars().all()
+                    rows = (await session.execute(row_query.limit(size))).all()
+
+                    async def before():
+                        content = await serialize_response(
+                            field=field, response_content=objects
+                        )
+                        return JSONResponse(content).body
+
+                    async def after():
+                        return dump_rows(schema, rows)
+
+                    assert await before() == await after()
+                    serialize_before = await timed(before)
+                    serialize_after = await timed(after)
+
+                    async def load_before():
+                        session.expunge_all()
+                        loaded = (await session.execute(query.limit(size))).scalars().all()
+                        content = await serialize_response(field=field, response_content=loaded)
+                        return JSONResponse(content).body
+
+                    async def load_after():
+                        loaded = (await session.execute(row_query.limit(size))).all()
+                        return dump_rows(schema, loaded)
+
+                    total_before = await timed(load_before)
+                    total_after = await timed(load_after)
+
+                params = {"limit": size, "sort": "id"} if name == "tasks" else {"limit": size}
+
+                async def request():
+                    response = await client.get(path, params=params, headers=headers)
+                    assert response.status_code == 200
+
+                endpoint = await timed(request, REPEATS // 4)
+                print(
+                    f"{name:>10} {size:>5} {serialize_before:>21.0f} {serialize_after:>10.0f} "
+                    f"{total_before:>26.0f} {total_after:>10.0f} {endpoint:>13.0f}"
+                )
+
+if __name__ == "__main__":
+    asyncio.run(main())
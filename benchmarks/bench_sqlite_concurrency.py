@@ -0,0 +1,134 @@
+"""Бенчмарк конкурентных чтений и записей в файловую базу SQLite.
+
+Сравнивает движок с параметрами драйвера по умолчанию (журнал отката,
+synchronous=FULL, новое соединение на каждую сессию) с движком build_engine:
+профиль PRAGMA из настроек (WAL, synchronous=NORMAL, busy_timeout, mmap,
+кэш страниц) и пул соединений. Читатели листают страницы задач, писатели
+обновляют задачи через CRUD; считаются операции в секунду, задержки
+и ошибки "database is locked".
+
+Запуск: python -m benchmarks.bench_sqlite_concurrency
+"""
+
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import event, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, build_engine, register_sqlite_functions
+from app.core.schedule_cache import schedule_cache
+from app.core.task_index import task_index
+from app.crud import task as task_crud
+from app.models.calendar_block import CalendarBlock  # noqa: F401 - таблица для create_all
+from app.models.category import Category  # noqa: F401 - внешний ключ задач
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskSort, TaskStatus, TaskUpdate
+
+TASKS = 20_000
+READERS = 8
+WRITERS = 4
+DURATION_SECONDS = 5
+PAGE_SIZE = 50
+
+def default_engine(database_url: str):
+    """Движок с параметрами драйвера по умолчанию."""
+    engine = create_async_engine(database_url, future=True)
+    event.listen(engine.sync_engine, "connect", register_sqlite_functions)
+    return engine
+
+async def seed(session_factory) -> int:
+    """Создать пользователя с задачами; возвращает ID пользователя."""
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    async with session_factory() as session:
+        user = User(email="bench@example.com", hashed_password="", full_name="Bench")
+        session.add(user)
+        await session.flush()
+        await session.execute(insert(Task), [
+            {
+                "title": f"Задача {i}",
+                "priority": rng.randint(1, 5),
+                "status": rng.choice([TaskStatus.PENDING, TaskStatus.IN_PROGRESS]),
+                "due_date": (now + timedelta(days=rng.randint(0, 90))).date(),
+                "estimated_duration": rng.randint(1, 8),
+                "created_at": now - timedelta(hours=rng.uniform(0, 240)),
+                "updated_at": now,
+                "user_id": user.id,
+            }
+            for i in range(TASKS)
+        ])
+        await session.commit()
+        return user.id
+
+async def run(name: str, make_engine, directory: Path):
+    """Выполнить сценарий на новой базе с движком make_engine."""
+    engine = make_engine(f"sqlite+aiosqlite:///{directory / f'{name}.db'}")
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    user_id = await seed(session_factory)
+
+    latencies = {"read": [], "write": []}
+    errors = {"read": 0, "write": 0}
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    async def worker(kind: str, seed_value: int):
+        rng = random.Random(seed_value)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                async with session_factory() as session:
+                    if kind == "read":
+                        await task_crud.get_tasks_page(
+                            session, user_id, limit=PAGE_SIZE,
+                            skip=rng.randrange(TASKS - PAGE_SIZE), sort=TaskSort.ID
+                        )
+                    else:
+                        await task_crud.update_task(
+                            session, rng.randint(1, TASKS),
+                            TaskUpdate(priority=rng.randint(1, 5)), user_id
+                        )
+            except OperationalError:
+                errors[kind] += 1
+                continue
+            latencies[kind].append(time.perf_counter() - started)
+
+    await asyncio.gather(
+        *(worker("read", i) for i in range(READERS)),
+        *(worker("write", READERS + i) for i in range(WRITERS)),
+    )
+    await engine.dispose()
+    task_index.clear()
+    schedule_cache.clear()
+
+    columns = []
+    for kind in ("read", "write"):
+        samples = sorted(latencies[kind]) or [0.0]
+        p95 = samples[int(len(samples) * 0.95) - 1 if len(samples) > 1 else 0]
+        columns.append(
+            f"{len(latencies[kind]) / DURATION_SECONDS:>9.0f} "
+            f"{statistics.median(samples) * 1e3:>8.1f} {p95 * 1e3:>8.1f} {errors[kind]:>7}"
+        )
+    print(f"{name:>8} " + " ".join(columns))
+
+async def main():
+    print(
+        f"{READERS} readers, {WRITERS} writers, {DURATION_SECONDS} s, {TASKS} tasks\n"
+        f"{'profile':>8} {'reads/s':>9} {'p50, ms':>8} {'p95, ms':>8} {'errors':>7} "
+        f"{'writes/s':>9} {'p50, ms':>8} {'p95, ms':>8} {'errors':>7}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        await run("default", default_engine, Path(directory))
+        await run("tuned", build_engine, Path(directory))
+
+if __name__ == "__main__":
+    asyncio.run(main())
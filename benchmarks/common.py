@@ -0,0 +1,65 @@
+"""Общая инфраструктура бенчмарков: приложение на базе SQLite в памяти."""
+
+from contextlib import asynccontextmanager
+
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import (
+    Base,
+    get_db,
+    get_session_factory,
+    register_sqlite_functions,
+)
+from app.core.replicas import get_read_db, recent_writes
+from app.core.schedule_cache import schedule_cache
+from app.core.security import create_access_token
+from app.core.task_index import task_index
+from app.core.token_cache import token_cache
+from app.models.user import User
+from main import app
+
+@asynccontextmanager
+async def benchmark_app(database_url: str = "sqlite+aiosqlite:///:memory:"):
+    """
+    Запустить приложение на отдельной базе.
+    Возвращает клиента, фабрику сессий и заголовки авторизации тестового пользователя.
+    """
+    engine = create_async_engine(
+        database_url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    event.listen(engine.sync_engine, "connect", register_sqlite_functions)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    async with session_factory() as session:
+        user = User(email="bench@example.com", hashed_password="", full_name="Bench")
+        session.add(user)
+        await session.commit()
+        user_id = user.id
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': str(user_id)})}"}
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: session_factory
+    try:
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            yield client, session_factory, headers, user_id
+    finally:
+        app.dependency_overrides.clear()
+        await engine.dispose()
+        # Кэши процесса привязаны к ID пользователя, который в новой базе повторяется
+        task_index.clear()
+        token_cache.clear()
+        schedule_cache.clear()
+        recent_writes.clear()
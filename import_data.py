@@ -0,0 +1,72 @@
+"""Импорт задач или категорий пользователя из JSON-выгрузки.
+
+Пример: python import_data.py test_data.json --email user@example.com
+"""
+
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.core.database import async_session, init_db
+from app.core.importer import import_records
+from app.crud.user import get_user_by_email
+from app.schemas.data_import import ImportTarget
+
+READ_SIZE = 64 * 1024
+
+async def read_chunks(path: str):
+    """Читать файл (или stdin для "-") блоками по READ_SIZE байт."""
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        while True:
+            chunk = stream.read(READ_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+
+async def main(args: argparse.Namespace) -> int:
+    """Выполнить импорт и вывести отчет."""
+    await init_db()
+    async with async_session() as db:
+        user = await get_user_by_email(db, args.email)
+        if user is None:
+            print(f"User {args.email} not found", file=sys.stderr)
+            return 1
+        report = await import_records(
+            db, user.id, read_chunks(args.path), args.target, args.chunk_size
+        )
+
+    print(
+        f"Imported {report.imported} {args.target.value}, rejected {report.rejected} "
+        f"in {report.elapsed_seconds:.2f} s ({report.rows_per_second:.0f} rows/s)"
+    )
+    for error in report.errors:
+        print(f"  line {error.line}: {error.error}", file=sys.stderr)
+    return 0
+
+def parse_args() -> argparse.Namespace:
+    """Разобрать аргументы командной строки."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="файл NDJSON или JSON; '-' - читать из stdin")
+    parser.add_argument("--email", required=True, help="email пользователя-владельца записей")
+    parser.add_argument(
+        "--target",
+        type=ImportTarget,
+        choices=[target.value for target in ImportTarget],
+        default=ImportTarget.TASKS.value,
+        help="тип записей"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=settings.IMPORT_CHUNK_SIZE,
+        help="число строк в одной транзакции"
+    )
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
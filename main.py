@@ -6,7 +6,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import close_db, init_db
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.api.v1.api import api_router
 
 @asynccontextmanager
@@ -14,7 +15,7 @@ async def lifespan(app: FastAPI):
     """Контекст жизненного цикла приложения."""
     await init_db()
     yield
-    # Добавьте сюда код для завершения работы, если нужно
+    await close_db()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -30,6 +31,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Подключение основного роутера API
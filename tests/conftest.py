@@ -2,12 +2,22 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.core.database import Base, get_db
+from app.core.database import (
+    Base,
+    get_db,
+    get_session_factory,
+    register_sqlite_functions,
+)
+from app.core.replicas import get_read_db, recent_writes
 from app.core.security import create_access_token
+from app.core.schedule_cache import schedule_cache
+from app.core.task_index import task_index
+from app.core.token_cache import token_cache
 from main import app
 from app.models.user import User
 
@@ -19,10 +29,24 @@ engine = create_async_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+event.listen(engine.sync_engine, "connect", register_sqlite_functions)
 TestingSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Сбросить кэши процесса между тестами."""
+    task_index.clear()
+    token_cache.clear()
+    schedule_cache.clear()
+    recent_writes.clear()
+    yield
+    task_index.clear()
+    token_cache.clear()
+    schedule_cache.clear()
+    recent_writes.clear()
+
 @pytest.fixture
 async def db():
     """Фикстура для тестовой базы данных."""
@@ -42,6 +66,8 @@ async def client(db):
         yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
     app.dependency_overrides.clear()
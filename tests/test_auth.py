@@ -2,9 +2,12 @@
 
 import pytest
 from httpx import AsyncClient
+from jose import jwt
+from passlib.hash import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from main import app
+from app.core.config import settings
 from app.core.database import Base, get_db
 from app.models.user import User
 from app.core.security import get_password_hash
@@ -124,4 +127,100 @@ async def test_login_nonexistent_user(client: AsyncClient, db: AsyncSession):
         }
     )
     assert response.status_code == 401
-    assert response.json()["detail"] == "Неверная почта или пароль" 
\ No newline at end of file
+    assert response.json()["detail"] == "Неверная почта или пароль"
+
+async def test_login_upgrades_outdated_hash(client: AsyncClient, db: AsyncSession):
+    """Тест пересчета хеша с устаревшей стоимостью bcrypt при входе."""
+    user = User(
+        email="legacy@example.com",
+        hashed_password=bcrypt.using(rounds=4).hash("testpassword"),
+        full_name="Legacy User",
+        priority=3
+    )
+    db.add(user)
+    await db.commit()
+
+    response = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "legacy@example.com", "password": "testpassword"}
+    )
+    assert response.status_code == 200
+    await db.refresh(user)
+    assert bcrypt.from_string(user.hashed_password).rounds == settings.BCRYPT_ROUNDS
+
+async def test_password_change_revokes_cached_tokens(client: AsyncClient, db: AsyncSession):
+    """Тест: после смены пароля старый токен не принимается, даже если он был в кэше."""
+    user = User(
+        email="rotate@example.com",
+        hashed_password=get_password_hash("oldpassword"),
+        full_name="Rotate User",
+        priority=3
+    )
+    db.add(user)
+    await db.commit()
+    login = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "rotate@example.com", "password": "oldpassword"}
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    response = await client.post(
+        "/api/v1/auth/change-password",
+        params={"current_password": "oldpassword", "new_password": "newpassword"},
+        headers=headers
+    )
+    assert response.status_code == 200
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 401
+
+    login = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "rotate@example.com", "password": "newpassword"}
+    )
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+async def test_token_without_claims_rejected(client: AsyncClient, test_user):
+    """Тест: токен без срока действия или без пользователя отклоняется с 401, а не 500."""
+    for claims in ({"sub": str(test_user.id)}, {"exp": 4102444800}):
+        token = jwt.encode(claims, settings.SECRET_KEY, algorithm="HS256")
+        response = await client.get(
+            "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 401
+
+async def test_refresh_token_rotation(client: AsyncClient, db: AsyncSession):
+    """Тест обмена и ротации токенов обновления с обнаружением повторного использования."""
+    db.add(User(
+        email="refresh@example.com",
+        hashed_password=get_password_hash("testpassword"),
+        full_name="Refresh User",
+        priority=3
+    ))
+    await db.commit()
+    login = await client.post(
+        "/api/v1/auth/login",
+        data={"username": "refresh@example.com", "password": "testpassword"}
+    )
+    first = login.json()["refresh_token"]
+    assert first
+
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 200
+    data = response.json()
+    second = data["refresh_token"]
+    assert second != first
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    assert (await client.get("/api/v1/auth/me", headers=headers)).status_code == 200
+
+    # Повторное использование отозванного токена отзывает и выданный взамен
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": first})
+    assert response.status_code == 401
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": second})
+    assert response.status_code == 401
+
+async def test_refresh_with_unknown_token(client: AsyncClient, db: AsyncSession):
+    """Тест обмена неизвестного токена обновления."""
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": "unknown"})
+    assert response.status_code == 401
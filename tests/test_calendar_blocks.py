@@ -0,0 +1,197 @@
+"""Тесты блоков календаря и размещения задач вокруг них."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.calendar import (
+    MICROSECONDS_PER_HOUR,
+    FreeSlots,
+    busy_intervals,
+    from_microseconds,
+)
+from app.models.task import Task
+from app.schemas.calendar_block import BlockRecurrence
+
+pytestmark = pytest.mark.asyncio
+
+MONDAY = datetime(2030, 1, 7)
+
+def at(day: int, hour: int) -> datetime:
+    """Момент времени: день от понедельника MONDAY и час."""
+    return MONDAY + timedelta(days=day, hours=hour)
+
+def test_busy_intervals_expand_and_merge_blocks():
+    """Повторения разворачиваются, обрезаются по окну и объединяются."""
+    blocks = [
+        # Ночь: каждый день с 20:00 до 08:00, начиная с прошлой недели
+        (at(-6, 20), at(-5, 8), BlockRecurrence.DAILY, None),
+        # Обед по рабочим дням, первое повторение - в субботу
+        (at(-2, 12), at(-2, 13), BlockRecurrence.WEEKDAYS, None),
+        # Встреча, пересекающаяся с обедом во вторник
+        (at(1, 12.5), at(1, 14), BlockRecurrence.NONE, None),
+        # Еженедельная встреча в среду до 09:00, продолжает ночь
+        (at(-5, 7), at(-5, 9), BlockRecurrence.WEEKLY, at(2, 7)),
+        # Повторения закончились до окна или начинаются после recurrence_until
+        (at(-6, 15), at(-6, 16), BlockRecurrence.WEEKLY, at(0, 23)),
+        (at(-1, 10), at(-1, 11), BlockRecurrence.NONE, None),
+    ]
+    busy = busy_intervals(blocks, at(0, 0), at(3, 0))
+    assert list(zip(
+        map(from_microseconds, busy.starts.tolist()),
+        map(from_microseconds, busy.ends.tolist())
+    )) == [
+        (at(0, 0), at(0, 8)),
+        (at(0, 12), at(0, 13)),
+        (at(0, 20), at(1, 8)),
+        (at(1, 12), at(1, 14)),
+        (at(1, 20), at(2, 9)),
+        (at(2, 12), at(2, 13)),
+        (at(2, 20), at(3, 0)),
+    ]
+
+def test_busy_intervals_skip_weekends():
+    """Блок по рабочим дням не повторяется в субботу и воскресенье."""
+    blocks = [(at(0, 12), at(0, 13), BlockRecurrence.WEEKDAYS, None)]
+    busy = busy_intervals(blocks, at(0, 0), at(14, 0))
+    days = [from_microseconds(start).weekday() for start in busy.starts.tolist()]
+    assert days == [0, 1, 2, 3, 4] * 2
+
+def test_free_slots_take_earliest_fitting_interval():
+    """Задача занимает самый ранний свободный интервал, в который помещается."""
+    busy = busy_intervals(
+        [(at(0, 10.5), at(0, 12), BlockRecurrence.NONE, None)], at(0, 9), at(0, 19)
+    )
+    free = FreeSlots(at(0, 9), at(0, 19), busy)
+    taken = [
+        free.take(int(hours * MICROSECONDS_PER_HOUR)) for hours in (1, 2, 0.5, 8, 5)
+    ]
+    assert [None if start is None else from_microseconds(start) for start in taken] == [
+        at(0, 9), at(0, 12), at(0, 10), None, at(0, 14)
+    ]
+    assert free.longest == 0
+
+async def test_calendar_block_crud(client: AsyncClient, db: AsyncSession, token_headers):
+    """Тест создания, изменения и удаления блока календаря."""
+    response = await client.post(
+        "/api/v1/calendar-blocks/",
+        headers=token_headers,
+        json={
+            "title": "Standup",
+            "start_time": at(0, 10).isoformat(),
+            "end_time": at(0, 10.25).isoformat(),
+            "recurrence": "weekdays"
+        }
+    )
+    assert response.status_code == 200
+    block = response.json()
+    assert block["recurrence"] == "weekdays"
+    assert block["recurrence_until"] is None
+
+    response = await client.get("/api/v1/calendar-blocks/", headers=token_headers)
+    assert [item["id"] for item in response.json()] == [block["id"]]
+
+    response = await client.put(
+        f"/api/v1/calendar-blocks/{block['id']}",
+        headers=token_headers,
+        json={"end_time": at(0, 10.5).isoformat(), "recurrence_until": at(30, 0).isoformat()}
+    )
+    assert response.status_code == 200
+    assert response.json()["end_time"] == at(0, 10.5).isoformat()
+
+    response = await client.put(
+        f"/api/v1/calendar-blocks/{block['id']}",
+        headers=token_headers,
+        json={"end_time": at(0, 9).isoformat()}
+    )
+    assert response.status_code == 400
+
+    response = await client.delete(f"/api/v1/calendar-blocks/{block['id']}", headers=token_headers)
+    assert response.status_code == 200
+    response = await client.get(f"/api/v1/calendar-blocks/{block['id']}", headers=token_headers)
+    assert response.status_code == 404
+
+async def test_create_calendar_block_invalid_interval(
+    client: AsyncClient, db: AsyncSession, token_headers
+):
+    """Блок должен заканчиваться позже, чем начинается."""
+    response = await client.post(
+        "/api/v1/calendar-blocks/",
+        headers=token_headers,
+        json={"title": "Broken", "start_time": at(0, 10).isoformat(), "end_time": at(0, 9).isoformat()}
+    )
+    assert response.status_code == 422
+
+async def test_schedule_fits_tasks_around_blocks(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Задачи размещаются вне блоков; новый блок перестраивает закэшированное расписание."""
+    for priority in (5, 4, 3):
+        db.add(Task(
+            title=f"Task {priority}",
+            priority=priority,
+            due_date=MONDAY.date(),
+            estimated_duration=2,
+            user_id=test_user.id
+        ))
+    await db.commit()
+    params = {"start_date": at(0, 9).isoformat(), "end_date": at(0, 19).isoformat()}
+
+    def starts(response):
+        return [task["start_time"] for task in response.json()["tasks"]]
+
+    response = await client.get("/api/v1/tasks/schedule", params=params, headers=token_headers)
+    assert starts(response) == [at(0, hour).isoformat() for hour in (9, 11, 13)]
+
+    await client.post(
+        "/api/v1/calendar-blocks/",
+        headers=token_headers,
+        json={
+            "title": "Lunch",
+            "start_time": at(-7, 12).isoformat(),
+            "end_time": at(-7, 13).isoformat(),
+            "recurrence": "daily"
+        }
+    )
+    response = await client.get("/api/v1/tasks/schedule", params=params, headers=token_headers)
+    assert starts(response) == [at(0, hour).isoformat() for hour in (9, 13, 15)]
+
+async def test_schedule_accepts_times_with_offset(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Время с часовым поясом в расписании и блоках переводится в UTC."""
+    db.add(Task(
+        title="Task", priority=3, due_date=MONDAY.date(), estimated_duration=2,
+        user_id=test_user.id
+    ))
+    await db.commit()
+    # 12:00-13:00 UTC, переданные как 15:00-16:00 по Москве
+    response = await client.post(
+        "/api/v1/calendar-blocks/",
+        headers=token_headers,
+        json={
+            "title": "Call",
+            "start_time": at(0, 15).isoformat() + "+03:00",
+            "end_time": at(0, 16).isoformat() + "+03:00"
+        }
+    )
+    assert response.status_code == 200
+    assert response.json()["start_time"] == at(0, 12).isoformat()
+    block_id = response.json()["id"]
+    response = await client.put(
+        f"/api/v1/calendar-blocks/{block_id}",
+        headers=token_headers,
+        json={"start_time": at(0, 9).isoformat() + "Z"}
+    )
+    assert response.status_code == 200
+    assert response.json()["start_time"] == at(0, 9).isoformat()
+
+    response = await client.get(
+        "/api/v1/tasks/schedule",
+        params={"start_date": at(0, 8).isoformat() + "Z", "end_date": at(0, 18).isoformat() + "Z"},
+        headers=token_headers
+    )
+    assert response.status_code == 200
+    assert [task["start_time"] for task in response.json()["tasks"]] == [at(0, 13).isoformat()]
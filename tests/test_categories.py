@@ -4,6 +4,11 @@ import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.user import get_data_version
+from app.models.category import Category
+from app.models.task import Task
+from app.models.user import User
+
 pytestmark = pytest.mark.asyncio
 
 async def test_create_category(client: AsyncClient, db: AsyncSession, token_headers):
@@ -46,6 +51,30 @@ async def test_read_category(client: AsyncClient, db: AsyncSession, token_header
     assert data["name"] == "Test Category"
     assert data["description"] == "Test Description"
 
+async def test_read_categories_sparse_fields(
+    client: AsyncClient, db: AsyncSession, token_headers
+):
+    """Тест выбора полей категорий параметром fields."""
+    create_response = await client.post(
+        "/api/v1/categories/",
+        headers=token_headers,
+        json={"name": "Sparse", "description": "Long text"}
+    )
+    category_id = create_response.json()["id"]
+    response = await client.get(
+        "/api/v1/categories/", params={"fields": "name"}, headers=token_headers
+    )
+    assert response.status_code == 200
+    assert response.json() == [{"name": "Sparse"}]
+    response = await client.get(
+        f"/api/v1/categories/{category_id}", params={"fields": "id,name"}, headers=token_headers
+    )
+    assert response.json() == {"id": category_id, "name": "Sparse"}
+    response = await client.get(
+        "/api/v1/categories/", params={"fields": "owner"}, headers=token_headers
+    )
+    assert response.status_code == 400
+
 async def test_update_category(client: AsyncClient, db: AsyncSession, token_headers):
     """Тест обновления категории."""
     create_response = await client.post(
@@ -83,4 +112,79 @@ async def test_delete_category(client: AsyncClient, db: AsyncSession, token_head
     category_id = create_response.json()["id"]
     response = await client.delete(f"/api/v1/categories/{category_id}", headers=token_headers)
     assert response.status_code == 200
-    assert response.json()["message"] == "Category deleted successfully" 
\ No newline at end of file
+    assert response.json()["message"] == "Category deleted successfully" 
+    response = await client.delete(f"/api/v1/categories/{category_id}", headers=token_headers)
+    assert response.status_code == 404
+
+async def test_delete_category_detaches_tasks(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Задачи удаленной категории остаются без категории."""
+    response = await client.post(
+        "/api/v1/categories/", headers=token_headers, json={"name": "Work"}
+    )
+    category_id = response.json()["id"]
+    task = Task(title="Report", priority=3, user_id=test_user.id, category_id=category_id)
+    db.add(task)
+    await db.commit()
+
+    response = await client.delete(f"/api/v1/categories/{category_id}", headers=token_headers)
+    assert response.status_code == 200
+    response = await client.get(f"/api/v1/tasks/{task.id}", headers=token_headers)
+    assert response.json()["category_id"] is None
+
+async def test_delete_category_detaches_foreign_tasks(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Задачи другого пользователя в удаленной категории тоже остаются без категории."""
+    other = User(email="other@example.com", hashed_password="hashed_password")
+    category = Category(name="Shared", user_id=test_user.id)
+    db.add_all([other, category])
+    await db.commit()
+    task = Task(title="Foreign", priority=3, user_id=other.id, category_id=category.id)
+    db.add(task)
+    await db.commit()
+    version = await get_data_version(db, other.id)
+
+    response = await client.delete(f"/api/v1/categories/{category.id}", headers=token_headers)
+    assert response.status_code == 200
+    await db.refresh(task)
+    assert task.category_id is None
+    assert await get_data_version(db, other.id) == version + 1
+
+async def test_read_categories_cursor_pagination(client: AsyncClient, db: AsyncSession, token_headers):
+    """Тест курсорной пагинации категорий."""
+    for i in range(5):
+        await client.post(
+            "/api/v1/categories/",
+            headers=token_headers,
+            json={"name": f"Category {i}"}
+        )
+    names = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/categories/", params=params, headers=token_headers)
+        assert response.status_code == 200
+        names.extend(category["name"] for category in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert names == [f"Category {i}" for i in range(5)]
+
+async def test_import_categories(client: AsyncClient, db: AsyncSession, token_headers):
+    """Тест импорта категорий из JSON-массива."""
+    response = await client.post(
+        "/api/v1/categories/import",
+        content='[{"name": "Учёба"}, {"description": "Без названия"}, {"name": "Работа"}]'.encode(),
+        headers=token_headers
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["imported"], report["rejected"]) == (2, 1)
+    names = [category["name"] for category in (await client.get(
+        "/api/v1/categories/", headers=token_headers
+    )).json()]
+    assert names == ["Учёба", "Работа"]
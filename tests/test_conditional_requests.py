@@ -0,0 +1,176 @@
+"""Тесты условных запросов: ETag, If-None-Match и 304 Not Modified."""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints import tasks as tasks_endpoint
+from app.core.task_index import task_index
+from app.crud import task as task_crud
+from app.crud.user import get_data_version
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskStatus
+
+pytestmark = pytest.mark.asyncio
+
+@contextmanager
+def capture_statements(db: AsyncSession):
+    """Собрать SQL-запросы, выполненные во время блока."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sync_engine = db.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+async def create_task(client: AsyncClient, token_headers, title: str) -> dict:
+    response = await client.post(
+        "/api/v1/tasks/", headers=token_headers, json={"title": title, "priority": 3}
+    )
+    return response.json()
+
+@pytest.mark.parametrize("params", [{}, {"sort": "id"}])
+async def test_task_list_not_modified(
+    client: AsyncClient, db: AsyncSession, token_headers, params
+):
+    """Повторный опрос списка задач без изменений получает 304 без запросов к задачам."""
+    task = await create_task(client, token_headers, "First")
+    await create_task(client, token_headers, "Second")
+    response = await client.get("/api/v1/tasks/", params=params, headers=token_headers)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    with capture_statements(db) as statements:
+        response = await client.get(
+            "/api/v1/tasks/", params=params, headers={**token_headers, "If-None-Match": etag}
+        )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert not [statement for statement in statements if "tasks" in statement]
+
+    await client.put(f"/api/v1/tasks/{task['id']}", headers=token_headers, json={"priority": 5})
+    response = await client.get(
+        "/api/v1/tasks/", params=params, headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+async def test_overdue_list_etag_changes_at_midnight(
+    client: AsyncClient, db: AsyncSession, token_headers, monkeypatch
+):
+    """Список просроченных задач зависит от даты: после полуночи старый ETag не подходит."""
+    await create_task(client, token_headers, "Task")
+    params = {"sort": "id", "overdue": "true"}
+    response = await client.get("/api/v1/tasks/", params=params, headers=token_headers)
+    etag = response.headers["ETag"]
+    response = await client.get(
+        "/api/v1/tasks/", params=params, headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    class Tomorrow(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime.utcnow() + timedelta(days=1)
+
+    monkeypatch.setattr(tasks_endpoint, "datetime", Tomorrow)
+    monkeypatch.setattr(task_crud, "datetime", Tomorrow)
+    response = await client.get(
+        "/api/v1/tasks/", params=params, headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+async def test_task_priority_list_etag_follows_ranking(
+    client: AsyncClient, db: AsyncSession, token_headers
+):
+    """Без закэшированного ранжирования первая страница строится заново с новым ETag."""
+    await create_task(client, token_headers, "Task")
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    etag = response.headers["ETag"]
+
+    task_index.clear()
+    response = await client.get(
+        "/api/v1/tasks/", headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+async def test_task_priority_list_etag_after_external_write(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """После записи вне приложения страница и ETag строятся по новой версии данных."""
+    await create_task(client, token_headers, "A")
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    etag = response.headers["ETag"]
+
+    await db.execute(insert(Task).values(
+        title="B", priority=5, status=TaskStatus.PENDING, user_id=test_user.id
+    ))
+    await db.execute(
+        update(User).where(User.id == test_user.id).values(data_version=User.data_version + 1)
+    )
+    await db.commit()
+    # Индекс построен при прежней версии: момент ранжирования для 304 не используется
+    version = await get_data_version(db, test_user.id)
+    assert task_crud.get_cached_ranking_moment(test_user.id, 0, 100, version) is None
+    response = await client.get(
+        "/api/v1/tasks/", headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["B", "A"]
+    etag = response.headers["ETag"]
+    response = await client.get(
+        "/api/v1/tasks/", headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+async def test_task_not_modified(client: AsyncClient, db: AsyncSession, token_headers):
+    """Задача отдается с ETag; 404 не получает ETag."""
+    task = await create_task(client, token_headers, "Task")
+    response = await client.get(f"/api/v1/tasks/{task['id']}", headers=token_headers)
+    etag = response.headers["ETag"]
+    response = await client.get(
+        f"/api/v1/tasks/{task['id']}", headers={**token_headers, "If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+
+    response = await client.get("/api/v1/tasks/999999", headers=token_headers)
+    assert response.status_code == 404
+    assert "ETag" not in response.headers
+
+async def test_category_writes_change_etags(
+    client: AsyncClient, db: AsyncSession, token_headers
+):
+    """Изменение категорий меняет версию данных пользователя."""
+    await create_task(client, token_headers, "Task")
+    tasks_etag = (await client.get("/api/v1/tasks/", headers=token_headers)).headers["ETag"]
+    response = await client.get("/api/v1/categories/", headers=token_headers)
+    etag = response.headers["ETag"]
+    response = await client.get(
+        "/api/v1/categories/", headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+    await client.post("/api/v1/categories/", headers=token_headers, json={"name": "Work"})
+    response = await client.get(
+        "/api/v1/categories/", headers={**token_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    response = await client.get(
+        "/api/v1/tasks/", headers={**token_headers, "If-None-Match": tasks_etag}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,80 @@
+"""Тесты сводки главного экрана."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.category import Category
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.task import TaskStatus
+
+pytestmark = pytest.mark.asyncio
+
+async def test_dashboard(client: AsyncClient, db: AsyncSession, test_user, token_headers):
+    """Тест сводки: списки задач и агрегаты в одном ответе."""
+    today = datetime.utcnow().date()
+    work = Category(name="Work", user_id=test_user.id)
+    empty = Category(name="Empty", user_id=test_user.id)
+    db.add_all([work, empty])
+    await db.commit()
+    db.add_all([
+        Task(title="late", priority=2, status=TaskStatus.IN_PROGRESS,
+             due_date=today - timedelta(days=1), category_id=work.id, user_id=test_user.id),
+        Task(title="done", priority=5, status=TaskStatus.COMPLETED,
+             due_date=today - timedelta(days=1), category_id=work.id, user_id=test_user.id),
+        *(
+            Task(title=f"todo {i}", priority=i % 5 + 1, user_id=test_user.id)
+            for i in range(settings.DASHBOARD_TASKS_LIMIT + 2)
+        ),
+    ])
+    await db.commit()
+
+    response = await client.get("/api/v1/dashboard", headers=token_headers)
+    assert response.status_code == 200
+    data = response.json()
+    full = (await client.get("/api/v1/tasks/", headers=token_headers)).json()
+    assert data["top_tasks"] == full[:settings.DASHBOARD_TASKS_LIMIT]
+    assert [task["title"] for task in data["overdue_tasks"]] == ["late"]
+    assert data["status_counts"] == {
+        "pending": settings.DASHBOARD_TASKS_LIMIT + 2,
+        "in_progress": 1,
+        "completed": 1,
+        "cancelled": 0,
+        "blocked": 0,
+    }
+    assert data["categories"] == [
+        {"id": work.id, "name": "Work", "task_count": 2},
+        {"id": empty.id, "name": "Empty", "task_count": 0},
+    ]
+    assert data["uncategorized_count"] == settings.DASHBOARD_TASKS_LIMIT + 2
+
+async def test_dashboard_ignores_foreign_tasks_in_category(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Тест: задачи другого пользователя в категории пользователя не учитываются."""
+    other = User(email="other@example.com", hashed_password="hashed_password")
+    category = Category(name="Shared", user_id=test_user.id)
+    db.add_all([other, category])
+    await db.commit()
+    db.add_all([
+        Task(title="own", priority=3, category_id=category.id, user_id=test_user.id),
+        *(
+            Task(title=f"foreign {i}", priority=3, category_id=category.id, user_id=other.id)
+            for i in range(3)
+        ),
+    ])
+    await db.commit()
+
+    data = (await client.get("/api/v1/dashboard", headers=token_headers)).json()
+    assert data["categories"] == [{"id": category.id, "name": "Shared", "task_count": 1}]
+    assert data["uncategorized_count"] == 0
+    assert sum(data["status_counts"].values()) == 1
+
+async def test_dashboard_requires_auth(client: AsyncClient):
+    """Тест доступа к сводке без токена."""
+    response = await client.get("/api/v1/dashboard")
+    assert response.status_code == 401
@@ -0,0 +1,49 @@
+"""Профиль соединений SQLite и пул движка из настроек."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+
+from app.core.config import settings
+from app.core.database import build_engine
+from app.core.priority import PRIORITY_SQL_FUNCTION
+
+pytestmark = pytest.mark.asyncio
+
+async def test_file_database_uses_sqlite_profile(tmp_path):
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+    try:
+        assert isinstance(engine.pool, AsyncAdaptedQueuePool)
+        assert engine.pool.size() == settings.DB_POOL_SIZE
+        async with engine.connect() as conn:
+            pragmas = {
+                name: (await conn.execute(text(f"PRAGMA {name}"))).scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "mmap_size",
+                             "cache_size", "temp_store")
+            }
+            # Пользовательские функции регистрируются вместе с профилем
+            priority = await conn.execute(text(
+                f"SELECT {PRIORITY_SQL_FUNCTION}"
+                "(3, 'PENDING', '2024-01-01 00:00:00', NULL, 1.0, '2024-01-02 00:00:00')"
+            ))
+            assert priority.scalar() > 0
+    finally:
+        await engine.dispose()
+    assert pragmas == {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE.lower(),
+        "synchronous": 1,  # NORMAL
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": 2,  # MEMORY
+    }
+
+async def test_memory_database_keeps_single_connection():
+    engine = build_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        assert isinstance(engine.pool, StaticPool)
+        async with engine.connect() as conn:
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+        assert busy_timeout == settings.SQLITE_BUSY_TIMEOUT_MS
+    finally:
+        await engine.dispose()
@@ -0,0 +1,56 @@
+"""Тесты алгоритма расчета приоритета."""
+
+import random
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.priority import (
+    calculate_priorities_batch,
+    calculate_priority,
+    sort_tasks_by_priority,
+    task_columns,
+)
+from app.schemas.task import TaskStatus
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+def make_tasks(count: int, seed: int = 42):
+    """Сгенерировать задачи со случайными полями, включая пустые значения."""
+    rng = random.Random(seed)
+    statuses = list(TaskStatus)
+    tasks = []
+    for task_id in range(count):
+        due_date = None
+        if rng.random() < 0.7:
+            due_date = (NOW + timedelta(days=rng.randint(-10, 30))).date()
+        tasks.append(SimpleNamespace(
+            id=task_id,
+            priority=rng.randint(1, 5),
+            status=rng.choice(statuses),
+            created_at=NOW - timedelta(minutes=rng.randint(0, 60 * 24 * 30)),
+            due_date=due_date,
+            estimated_duration=rng.choice([None, 0, 1, 4, 8, 24]),
+        ))
+    return tasks
+
+def test_batch_matches_scalar():
+    """Тест совпадения векторизованного расчета со скалярным."""
+    tasks = make_tasks(500)
+    scores, order = calculate_priorities_batch(**task_columns(tasks), now=NOW)
+    expected = [calculate_priority(task, NOW) for task in tasks]
+    assert scores.tolist() == pytest.approx(expected, rel=1e-12)
+    expected_order = sorted(range(len(tasks)), key=lambda i: expected[i], reverse=True)
+    assert [expected[i] for i in order] == pytest.approx(
+        [expected[i] for i in expected_order], rel=1e-12
+    )
+
+def test_sort_tasks_by_priority_uses_same_order_for_large_lists():
+    """Тест сортировки большого списка задач."""
+    tasks = make_tasks(200, seed=7)
+    now = datetime.utcnow()
+    ranked = sort_tasks_by_priority(tasks)
+    scores = [calculate_priority(task, now) for task in ranked]
+    assert scores == pytest.approx(sorted(scores, reverse=True), rel=1e-6)
+    assert sorted(task.id for task in ranked) == list(range(200))
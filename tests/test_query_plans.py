@@ -0,0 +1,149 @@
+"""Проверка планов запросов CRUD: ни один запрос не должен сканировать таблицу целиком."""
+
+import re
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from app.crud import calendar_block as calendar_block_crud
+from app.crud import category as category_crud
+from app.crud import task as task_crud
+from app.schemas.calendar_block import (
+    BlockRecurrence,
+    CalendarBlockCreate,
+    CalendarBlockUpdate,
+)
+from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.schemas.task import TaskCreate, TaskFilter, TaskSort, TaskStatus, TaskUpdate
+
+# Строка плана SQLite вида "SCAN tasks" означает полный проход по таблице
+FULL_SCAN = re.compile(r"^SCAN (tasks|categories|calendar_blocks)\b")
+
+@contextmanager
+def capture_queries(db):
+    """Собрать SELECT/UPDATE/DELETE запросы, выполненные через сессию."""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+            queries.append((statement, parameters))
+
+    sync_engine = db.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+
+async def full_scans(db, queries):
+    """Вернуть запросы, план которых содержит полный проход по таблице."""
+    connection = await db.connection()
+    scans = []
+    for statement, parameters in queries:
+        result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        details = [row[-1] for row in result]
+        if any(FULL_SCAN.match(detail) for detail in details):
+            scans.append((statement, details))
+    return scans
+
+async def test_task_queries_use_indexes(db, test_user):
+    """Все запросы CRUD задач используют индексы."""
+    with capture_queries(db) as queries:
+        tasks = []
+        for number in range(5):
+            tasks.append(await task_crud.create_task(
+                db,
+                TaskCreate(
+                    title=f"Task {number}",
+                    priority=number + 1,
+                    due_date=date.today() + timedelta(days=number),
+                    estimated_duration=1.0
+                ),
+                test_user.id
+            ))
+        await task_crud.get_task(db, tasks[0].id, test_user.id)
+        await task_crud.get_tasks(db, test_user.id, limit=3)
+        for sort in TaskSort:
+            page = await task_crud.get_tasks_page(db, test_user.id, limit=2, sort=sort)
+            await task_crud.get_tasks_page(
+                db, test_user.id, limit=2, sort=sort, cursor=page.next_cursor
+            )
+            await task_crud.get_tasks_page(db, test_user.id, limit=2, skip=2, sort=sort)
+        filters = [
+            TaskFilter(status=[TaskStatus.PENDING, TaskStatus.IN_PROGRESS]),
+            TaskFilter(due_after=date.today(), due_before=date.today() + timedelta(days=7)),
+            TaskFilter(created_after=datetime.utcnow() - timedelta(days=1)),
+            TaskFilter(category_id=1),
+            TaskFilter(overdue=True),
+        ]
+        for task_filter in filters:
+            for sort in TaskSort:
+                await task_crud.get_tasks_page(
+                    db, test_user.id, limit=2, sort=sort, filters=task_filter
+                )
+        await task_crud.get_schedule_candidates(
+            db, test_user.id, date.today(), date.today() + timedelta(days=3)
+        )
+        await task_crud.get_task_rows_by_ids(db, [tasks[0].id, tasks[1].id], test_user.id)
+        await task_crud.update_task(
+            db, tasks[1].id, TaskUpdate(status=TaskStatus.IN_PROGRESS), test_user.id
+        )
+        await task_crud.delete_task(db, tasks[2].id, test_user.id)
+
+    assert queries
+    assert await full_scans(db, queries) == []
+
+async def test_category_queries_use_indexes(db, test_user):
+    """Все запросы CRUD категорий используют индексы."""
+    with capture_queries(db) as queries:
+        categories = []
+        for number in range(3):
+            categories.append(await category_crud.create_category(
+                db, CategoryCreate(name=f"Category {number}"), test_user.id
+            ))
+        await category_crud.get_category(db, categories[0].id, test_user.id)
+        page = await category_crud.get_categories_page(db, test_user.id, limit=2)
+        await category_crud.get_categories_page(
+            db, test_user.id, limit=2, cursor=page.next_cursor
+        )
+        await category_crud.get_categories(db, test_user.id, skip=1)
+        await category_crud.update_category(
+            db, categories[1].id, CategoryUpdate(name="Renamed"), test_user.id
+        )
+        await category_crud.delete_category(db, categories[2].id, test_user.id)
+
+    assert queries
+    assert await full_scans(db, queries) == []
+
+async def test_calendar_block_queries_use_indexes(db, test_user):
+    """Все запросы CRUD блоков календаря используют индексы."""
+    start = datetime(2030, 1, 7, 9, 0)
+    with capture_queries(db) as queries:
+        blocks = []
+        for number, recurrence in enumerate(BlockRecurrence):
+            blocks.append(await calendar_block_crud.create_calendar_block(
+                db,
+                CalendarBlockCreate(
+                    title=f"Block {number}",
+                    start_time=start + timedelta(hours=number),
+                    end_time=start + timedelta(hours=number, minutes=30),
+                    recurrence=recurrence
+                ),
+                test_user.id
+            ))
+        await calendar_block_crud.get_calendar_block(db, blocks[0].id, test_user.id)
+        page = await calendar_block_crud.get_calendar_blocks_page(db, test_user.id, limit=2)
+        await calendar_block_crud.get_calendar_blocks_page(
+            db, test_user.id, limit=2, cursor=page.next_cursor
+        )
+        await calendar_block_crud.get_busy_blocks(
+            db, test_user.id, start, start + timedelta(days=90)
+        )
+        await calendar_block_crud.update_calendar_block(
+            db, blocks[1].id, CalendarBlockUpdate(title="Renamed"), test_user.id
+        )
+        await calendar_block_crud.delete_calendar_block(db, blocks[2].id, test_user.id)
+
+    assert queries
+    assert await full_scans(db, queries) == []
@@ -0,0 +1,154 @@
+"""Маршрутизация чтений на реплики."""
+
+import shutil
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core import replicas as replicas_module
+from app.core.database import Base, build_engine
+from app.core.replicas import ReplicaSet, RoutingSession, get_read_db, recent_writes
+from app.crud.user import bump_data_version
+from app.models.user import User
+
+pytestmark = pytest.mark.asyncio
+
+def new_user(email: str) -> User:
+    """Пользователь для наполнения базы."""
+    return User(email=email, hashed_password="", full_name="Replica")
+
+@pytest.fixture
+async def databases(tmp_path):
+    """
+    Основная база и ее реплика: реплика скопирована, когда в базе был один пользователь,
+    после чего в основную базу добавлен второй.
+    """
+    primary_path = tmp_path / "primary.db"
+    replica_path = tmp_path / "replica.db"
+    primary = build_engine(f"sqlite+aiosqlite:///{primary_path}")
+    async with primary.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(primary, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add(new_user("first@example.com"))
+        await session.commit()
+    await primary.dispose()
+    shutil.copy(primary_path, replica_path)
+    async with session_factory() as session:
+        session.add(new_user("second@example.com"))
+        await session.commit()
+
+    replica_set = ReplicaSet(
+        [f"sqlite+aiosqlite:///{tmp_path / 'missing.db'}", f"sqlite+aiosqlite:///{replica_path}"],
+        retry_seconds=60
+    )
+    yield primary, replica_set, tmp_path
+    await replica_set.dispose()
+    await primary.dispose()
+
+async def count_users(session: AsyncSession) -> int:
+    """Число пользователей, видимое сессии."""
+    return (await session.execute(select(func.count(User.id)))).scalar_one()
+
+async def test_unavailable_replica_is_skipped(databases):
+    _, replica_set, tmp_path = databases
+    # Недоступная реплика пропускается и не проверяется повторно до истечения паузы
+    assert await replica_set.acquire() is replica_set.engines[1]
+    assert await replica_set.acquire() is replica_set.engines[1]
+    assert replica_set._down_until[0] > 0
+    # Реплика открывается только для чтения: отсутствующий файл не создается
+    assert not (tmp_path / "missing.db").exists()
+
+    shutil.move(tmp_path / "replica.db", tmp_path / "moved.db")
+    await replica_set.engines[1].dispose()
+    assert await replica_set.acquire() is None
+
+async def test_replica_check_is_cached(databases):
+    _, replica_set, tmp_path = databases
+    replica_set.check_seconds = 60
+    assert await replica_set.acquire() is replica_set.engines[1]
+    # Проверенная реплика выбирается без нового соединения, пока проверка не устарела
+    shutil.move(tmp_path / "replica.db", tmp_path / "moved.db")
+    await replica_set.engines[1].dispose()
+    assert await replica_set.acquire() is replica_set.engines[1]
+    replica_set._checked_until[1] = 0
+    assert await replica_set.acquire() is None
+
+async def test_session_reads_own_writes(databases):
+    primary, replica_set, _ = databases
+    session_factory = sessionmaker(
+        primary, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+    )
+    async with session_factory() as session:
+        session.info["replica"] = await replica_set.acquire()
+        assert await count_users(session) == 1
+        # После записи сессия читает с основной базы, включая незафиксированные изменения
+        session.add(new_user("third@example.com"))
+        await session.flush()
+        assert await count_users(session) == 3
+        await session.commit()
+        assert await count_users(session) == 3
+
+async def test_read_db_uses_primary_after_user_write(databases, monkeypatch):
+    primary, replica_set, _ = databases
+    monkeypatch.setattr(replicas_module, "replicas", replica_set)
+    monkeypatch.setattr(replicas_module, "read_session", sessionmaker(
+        primary, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+    ))
+
+    async def visible_users(user_id: int) -> int:
+        dependency = get_read_db(current_user=user_id)
+        session = await dependency.__anext__()
+        try:
+            return await count_users(session)
+        finally:
+            await dependency.aclose()
+
+    assert await visible_users(1) == 1
+    recent_writes.mark(1, 0)
+    assert await visible_users(1) == 2
+    # Записи одного пользователя не переключают на основную базу остальных
+    assert await visible_users(2) == 1
+
+async def test_read_db_skips_replica_behind_last_write(databases, monkeypatch):
+    primary, replica_set, tmp_path = databases
+    monkeypatch.setattr(replicas_module, "replicas", replica_set)
+    monkeypatch.setattr(replicas_module, "read_session", sessionmaker(
+        primary, class_=AsyncSession, sync_session_class=RoutingSession, expire_on_commit=False
+    ))
+    # Окно после записи прошло, но реплика все еще не содержит записанную версию
+    monkeypatch.setattr(recent_writes, "lag_seconds", 0)
+    session_factory = sessionmaker(primary, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        version = await bump_data_version(session, 1)
+        await session.commit()
+
+    async def read_from_replica() -> bool:
+        dependency = get_read_db(current_user=1)
+        session = await dependency.__anext__()
+        try:
+            return "replica" in session.info
+        finally:
+            await dependency.aclose()
+
+    assert not await read_from_replica()
+    # Реплика, получившая версию последней записи, снова используется
+    recent_writes.clear()
+    recent_writes.mark(1, version - 1)
+    assert await read_from_replica()
+
+    # Реплика получила версию последней записи: версия подтверждается один раз
+    # и больше не читается, до следующей записи пользователя
+    writable = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    async with writable.begin() as conn:
+        await conn.execute(update(User).where(User.id == 1).values(data_version=version))
+    await writable.dispose()
+    recent_writes.mark(1, version)
+    replica = replica_set.engines[1]
+    assert recent_writes.unconfirmed_version(1, replica) == version
+    assert await read_from_replica()
+    assert recent_writes.unconfirmed_version(1, replica) == 0
+    recent_writes.mark(1, version + 1)
+    assert not await read_from_replica()
@@ -0,0 +1,203 @@
+"""Тесты планирования задач."""
+
+import random
+from datetime import datetime, timedelta
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import scheduler
+from app.core.calendar import FreeSlots
+from app.core.task_index import TaskIndex, task_index
+from app.core.scheduler import pack
+from app.crud import calendar_block as calendar_block_crud
+from app.crud import task as task_crud
+from app.crud.user import bump_data_version, get_data_version
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.calendar_block import BlockRecurrence, CalendarBlockCreate
+from app.schemas.task import TaskBulkUpdateItem, TaskCreate, TaskStatus, TaskUpdate
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2030, 1, 7, 9, 0)
+END = START + timedelta(hours=10)
+
+def test_pack_skips_tasks_that_do_not_fit():
+    """Задача, не помещающаяся в остаток интервала, не останавливает размещение."""
+    slots = pack([4, 8, 5, 1], FreeSlots(START, END))
+    assert [slot.position for slot in slots] == [0, 2, 3]
+    assert [slot.start_time for slot in slots] == [
+        START, START + timedelta(hours=4), START + timedelta(hours=9)
+    ]
+    assert slots[-1].end_time == END
+
+async def test_schedule(client: AsyncClient, db: AsyncSession, test_user, token_headers):
+    """Тест расписания: фильтр по окну, исключение завершенных, порядок по приоритету."""
+    day = START.date()
+
+    def add(title, priority, status=TaskStatus.PENDING, due=day, hours=2):
+        db.add(Task(
+            title=title,
+            priority=priority,
+            status=status,
+            due_date=due,
+            estimated_duration=hours,
+            user_id=test_user.id
+        ))
+
+    add("Blocked", 5, TaskStatus.BLOCKED)
+    add("In progress", 4, TaskStatus.IN_PROGRESS)
+    add("Pending", 3)
+    add("Done", 5, TaskStatus.COMPLETED)
+    add("Outside window", 5, due=day + timedelta(days=30))
+    add("No deadline", 5, due=None)
+    add("No duration", 5, hours=0)
+    add("Too long", 2, hours=20)
+    await db.commit()
+
+    response = await client.get(
+        "/api/v1/tasks/schedule",
+        params={"start_date": START.isoformat(), "end_date": END.isoformat()},
+        headers=token_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data["tasks"]] == ["In progress", "Pending", "Blocked"]
+    starts = [datetime.fromisoformat(task["start_time"]) for task in data["tasks"]]
+    assert starts == [START + timedelta(hours=2 * i) for i in range(3)]
+    assert data["total_duration"] == 6
+    assert data["utilization_rate"] == pytest.approx(0.6)
+
+async def test_schedule_invalid_window(client: AsyncClient, token_headers):
+    """Тест отклонения пустого интервала."""
+    response = await client.get(
+        "/api/v1/tasks/schedule",
+        params={"start_date": END.isoformat(), "end_date": START.isoformat()},
+        headers=token_headers
+    )
+    assert response.status_code == 400
+
+def schedule_params():
+    return {"start_date": START.isoformat(), "end_date": END.isoformat()}
+
+async def test_schedule_cached_until_data_changes(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Повторный запрос расписания не читает задачи, пока версия данных не изменилась."""
+    for i in range(3):
+        await task_crud.create_task(
+            db, TaskCreate(title=f"Task {i}", priority=i + 1, due_date=START.date(),
+                           estimated_duration=2), test_user.id
+        )
+    first = await client.get("/api/v1/tasks/schedule", params=schedule_params(), headers=token_headers)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.bind.sync_engine, "before_cursor_execute", listener)
+    try:
+        second = await client.get(
+            "/api/v1/tasks/schedule", params=schedule_params(), headers=token_headers
+        )
+    finally:
+        event.remove(db.bind.sync_engine, "before_cursor_execute", listener)
+    assert second.json() == first.json()
+    assert not [statement for statement in statements if "FROM tasks" in statement]
+
+async def test_schedule_incremental_update_matches_rebuild(db: AsyncSession, test_user, monkeypatch):
+    """Частичный пересчет после изменений дает то же расписание, что и полный."""
+    rng = random.Random(7)
+    now = START - timedelta(days=1)
+    end = START + timedelta(days=5)
+    tasks = [
+        await task_crud.create_task(db, TaskCreate(
+            title=f"Task {i}",
+            priority=rng.randint(1, 5),
+            status=rng.choice([TaskStatus.PENDING, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED]),
+            due_date=(START + timedelta(days=rng.randint(0, 6))).date(),
+            estimated_duration=rng.randint(1, 9)
+        ), test_user.id)
+        for i in range(60)
+    ]
+    for hour, recurrence in ((12, BlockRecurrence.DAILY), (15, BlockRecurrence.WEEKDAYS)):
+        await calendar_block_crud.create_calendar_block(db, CalendarBlockCreate(
+            title="Busy",
+            start_time=START.replace(hour=hour),
+            end_time=START.replace(hour=hour) + timedelta(minutes=rng.randint(30, 180)),
+            recurrence=recurrence
+        ), test_user.id)
+    await scheduler.get_schedule(db, test_user.id, START, end, now)
+
+    builds = []
+    build_plan = scheduler.build_plan
+    async def counting_build_plan(*args):
+        builds.append(args)
+        return await build_plan(*args)
+    monkeypatch.setattr(scheduler, "build_plan", counting_build_plan)
+
+    writes = [
+        lambda: task_crud.update_task(db, tasks[5].id, TaskUpdate(priority=5), test_user.id),
+        lambda: task_crud.update_task(
+            db, tasks[9].id, TaskUpdate(status=TaskStatus.COMPLETED), test_user.id
+        ),
+        lambda: task_crud.delete_task(db, tasks[0].id, test_user.id),
+        lambda: task_crud.create_task(db, TaskCreate(
+            title="New", priority=4, due_date=START.date(), estimated_duration=3
+        ), test_user.id),
+        lambda: task_crud.update_tasks(db, [
+            TaskBulkUpdateItem(id=tasks[1].id, estimated_duration=1),
+            TaskBulkUpdateItem(id=tasks[2].id, due_date=(START + timedelta(days=30)).date()),
+        ], test_user.id),
+        lambda: task_crud.delete_tasks(db, [tasks[3].id, tasks[4].id], test_user.id),
+    ]
+    for write in writes:
+        await write()
+        response = await scheduler.get_schedule(db, test_user.id, START, end, now)
+        version = await get_data_version(db, test_user.id)
+        rebuilt = await build_plan(
+            db, test_user.id, START, end, version, scheduler.evaluation_moment(now)
+        )
+        assert response == rebuilt.response
+    assert builds == []
+
+async def test_schedule_rebuilt_after_external_write(db: AsyncSession, test_user):
+    """Изменение из другого процесса (версия без записи в журнале) ведет к полному пересчету."""
+    await scheduler.get_schedule(db, test_user.id, START, END)
+    db.add(Task(title="External", priority=3, due_date=START.date(), estimated_duration=2,
+                user_id=test_user.id))
+    await bump_data_version(db, test_user.id)
+    await db.commit()
+    response = await scheduler.get_schedule(db, test_user.id, START, END)
+    assert [task.title for task in response.tasks] == ["External"]
+
+async def test_task_index_rebuilt_after_external_write(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Запись вне приложения (задача и версия данных в базе) перестраивает индекс приоритетов."""
+    await client.post(
+        "/api/v1/tasks/", headers=token_headers, json={"title": "A", "priority": 1}
+    )
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    assert [task["title"] for task in response.json()] == ["A"]
+
+    await db.execute(insert(Task).values(
+        title="B", priority=5, status=TaskStatus.PENDING, user_id=test_user.id
+    ))
+    await db.execute(
+        update(User).where(User.id == test_user.id).values(data_version=User.data_version + 1)
+    )
+    await db.commit()
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    assert [task["title"] for task in response.json()] == ["B", "A"]
+    assert task_index.get(test_user.id).version == await get_data_version(db, test_user.id)
+
+def test_task_index_dropped_when_write_skipped():
+    """Запись с версией не следующей за версией индекса означает пропущенную запись."""
+    registry = TaskIndex(max_tasks=100)
+    registry.build(1, [], registry.generation(1), 3)
+    registry.data_changed(1, 4)
+    assert registry.get(1).version == 4
+    registry.task_deleted(1, 10, 6)
+    assert registry.get(1) is None
+
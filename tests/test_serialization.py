@@ -0,0 +1,77 @@
+"""Быстрая сериализация списков совпадает с сериализацией через response_model."""
+
+from datetime import date
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.category import Category
+from app.models.task import Task
+from app.schemas.task import TaskStatus
+from main import app
+
+pytestmark = pytest.mark.asyncio
+
+async def response_model_body(path: str, objects) -> bytes:
+    """Тело ответа, которое FastAPI построил бы по response_model эндпоинта из ORM-объектов."""
+    route = next(
+        route for route in app.routes
+        if isinstance(route, APIRoute) and route.path == path and "GET" in route.methods
+    )
+    content = await serialize_response(field=route.response_field, response_content=objects)
+    return JSONResponse(content).body
+
+async def test_task_list_matches_response_model(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Списки задач в обоих порядках сериализуются так же, как схемой Task."""
+    category = Category(name="Учёба", user_id=test_user.id)
+    db.add(category)
+    await db.flush()
+    db.add_all([
+        Task(title="Задача «один»", description=None, priority=5, status=TaskStatus.IN_PROGRESS,
+             due_date=date(2030, 1, 7), estimated_duration=3, category_id=category.id,
+             user_id=test_user.id),
+        Task(title="Second", description="With \"quotes\"\n", priority=1,
+             status=TaskStatus.BLOCKED, due_date=None, estimated_duration=None,
+             user_id=test_user.id),
+        Task(title="Third", priority=3, estimated_duration=0, user_id=test_user.id),
+    ])
+    await db.commit()
+
+    for sort in ("id", "priority"):
+        response = await client.get(
+            "/api/v1/tasks/", params={"sort": sort}, headers=token_headers
+        )
+        ids = [task["id"] for task in response.json()]
+        result = await db.execute(select(Task).where(Task.id.in_(ids)))
+        tasks = {task.id: task for task in result.scalars()}
+        assert response.content == await response_model_body(
+            "/api/v1/tasks/", [tasks[task_id] for task_id in ids]
+        )
+        assert response.headers["content-type"] == "application/json"
+
+async def test_category_list_matches_response_model(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Список категорий сериализуется так же, как схемой Category."""
+    db.add_all([
+        Category(name="Работа", description="Проекты", user_id=test_user.id),
+        Category(name="Home", user_id=test_user.id),
+    ])
+    await db.commit()
+    response = await client.get("/api/v1/categories/", headers=token_headers)
+    result = await db.execute(select(Category).order_by(Category.id))
+    assert response.content == await response_model_body(
+        "/api/v1/categories/", result.scalars().all()
+    )
+
+async def test_empty_list(client: AsyncClient, db: AsyncSession, token_headers):
+    """Пустой список - пустой JSON-массив."""
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    assert response.status_code == 200
+    assert response.json() == []
@@ -0,0 +1,88 @@
+"""Тесты индекса приоритетов в памяти."""
+
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.priority import calculate_priority
+from app.core.task_index import TaskIndex, UserTaskIndex, task_index
+from tests.test_priority import NOW, make_tasks
+
+def brute_force_top(tasks, limit):
+    """Эталонное ранжирование: полный расчет и сортировка."""
+    ranked = sorted(tasks, key=lambda task: (-calculate_priority(task, NOW), task.id))
+    return [(calculate_priority(task, NOW), task.id) for task in ranked[:limit]]
+
+@pytest.mark.parametrize("limit", [1, 10, 100, 1000])
+def test_top_matches_full_sort(limit):
+    """Тест совпадения top с полной сортировкой."""
+    tasks = make_tasks(700)
+    assert UserTaskIndex(tasks).top(NOW, limit) == brute_force_top(tasks, limit)
+
+def test_upsert_and_remove():
+    """Тест обновления индекса при изменении и удалении задач."""
+    tasks = make_tasks(50)
+    index = UserTaskIndex(tasks)
+    changed = SimpleNamespace(**{**vars(tasks[0]), "priority": 5, "status": "in_progress"})
+    index.upsert(changed)
+    index.remove(tasks[1].id)
+    expected = [changed] + tasks[2:]
+    assert len(index) == 49
+    assert index.top(NOW, 49) == brute_force_top(expected, 49)
+
+def test_lru_eviction_and_stale_build():
+    """Тест вытеснения неактивных пользователей и защиты от устаревшей загрузки."""
+    registry = TaskIndex(max_tasks=100)
+    registry.build(1, make_tasks(60, seed=1), registry.generation(1), 0)
+    registry.build(2, make_tasks(30, seed=2), registry.generation(2), 0)
+    registry.get(1)
+    registry.build(3, make_tasks(30, seed=3), registry.generation(3), 0)
+    assert registry.get(2) is None
+    assert registry.get(1) is not None and registry.get(3) is not None
+
+    generation = registry.generation(4)
+    registry.task_deleted(4, 1, 1)
+    registry.build(4, make_tasks(10, seed=4), generation, 0)
+    assert registry.get(4) is None
+
+async def test_index_follows_crud_writes(client: AsyncClient, db: AsyncSession, token_headers):
+    """Тест сквозного обновления индекса операциями CRUD."""
+    payload = {"title": "First", "priority": 1, "status": "pending"}
+    first = (await client.post("/api/v1/tasks/", json=payload, headers=token_headers)).json()
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    assert [task["id"] for task in response.json()] == [first["id"]]
+
+    payload = {"title": "Second", "priority": 5, "status": "pending"}
+    second = (await client.post("/api/v1/tasks/", json=payload, headers=token_headers)).json()
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    assert [task["id"] for task in response.json()] == [second["id"], first["id"]]
+
+    await client.delete(f"/api/v1/tasks/{second['id']}", headers=token_headers)
+    response = await client.get("/api/v1/tasks/", headers=token_headers)
+    assert [task["id"] for task in response.json()] == [first["id"]]
+    assert len(task_index.get(first["user_id"])) == 1
+
+def test_ranking_order_holds_until_valid_until():
+    """Тест: до valid_until порядок первых задач совпадает с полным пересчетом."""
+    from datetime import timedelta
+
+    tasks = make_tasks(300, seed=11)
+    index = UserTaskIndex(tasks)
+    ranking = index.ranking(NOW, 20)
+    assert ranking.valid_until > NOW
+    ids = [task_id for _, task_id in ranking.items]
+    span = ranking.valid_until - NOW
+    for step in range(1, 10):
+        moment = NOW + span * step / 10
+        ranked = sorted(tasks, key=lambda task: (-calculate_priority(task, moment), task.id))
+        assert [task.id for task in ranked[:20]] == ids
+
+    cached = index.ranking(NOW + span / 2, 10)
+    assert cached.evaluated_at == NOW
+    assert [task_id for _, task_id in cached.items] == ids[:10]
+    assert index.ranking(ranking.valid_until + timedelta(seconds=1), 10).evaluated_at > NOW
+
+    index.remove(ids[0])
+    assert index.ranking(NOW + span / 2, 10).evaluated_at == NOW + span / 2
@@ -1,17 +1,28 @@
 """Тесты для задач."""
 
+import csv
+import io
+import json
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from httpx import AsyncClient
+from sqlalchemy import event, select
 
 from main import app
+from app.core.config import settings
 from app.core.database import Base, get_db
 from app.core.security import create_access_token
+from app.crud.user import get_data_version
 from app.models.user import User
 from app.models.task import Task
+from app.models.category import Category
 from app.schemas.task import TaskStatus
+from app.core.importer import import_records
+from app.core.priority import calculate_priority, priority_expression
+from app.schemas.data_import import ImportTarget
 
 client = TestClient(app)
 
@@ -124,4 +135,433 @@ async def test_delete_task(client: AsyncClient, db: AsyncSession, test_user, tok
         headers=token_headers
     )
     assert response.status_code == 200
-    assert response.json()["message"] == "Task deleted successfully" 
\ No newline at end of file
+    assert response.json()["message"] == "Task deleted successfully" 
+
+async def test_update_and_delete_task_without_reads(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Изменение и удаление задачи выполняются одним запросом с RETURNING, без SELECT."""
+    task = Task(title="Test Task", priority=1, user_id=test_user.id)
+    db.add(task)
+    await db.commit()
+    await db.refresh(task)
+    # Первый запрос кэширует токен, чтобы проверка пользователя не попала в выборку
+    await client.get(f"/api/v1/tasks/{task.id}", headers=token_headers)
+
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    sync_engine = db.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = await client.put(
+            f"/api/v1/tasks/{task.id}", json={"priority": 4}, headers=token_headers
+        )
+        assert response.status_code == 200
+        assert response.json()["priority"] == 4
+        assert response.json()["title"] == "Test Task"
+        response = await client.delete(f"/api/v1/tasks/{task.id}", headers=token_headers)
+        assert response.status_code == 200
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", before_cursor_execute)
+    assert not [statement for statement in statements if statement.lstrip().startswith("SELECT")]
+
+    response = await client.put(
+        f"/api/v1/tasks/{task.id}", json={"priority": 2}, headers=token_headers
+    )
+    assert response.status_code == 404
+    response = await client.delete(f"/api/v1/tasks/{task.id}", headers=token_headers)
+    assert response.status_code == 404
+
+async def test_get_tasks_ordered_by_priority_across_pages(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Тест глобальной сортировки по приоритету при постраничном выводе."""
+    for title, priority in [("Low", 1), ("High", 5), ("Medium", 3)]:
+        db.add(Task(title=title, priority=priority, user_id=test_user.id))
+    await db.commit()
+
+    titles = []
+    for skip in range(3):
+        response = await client.get(
+            f"/api/v1/tasks/?skip={skip}&limit=1",
+            headers=token_headers
+        )
+        assert response.status_code == 200
+        titles.extend(task["title"] for task in response.json())
+    assert titles == ["High", "Medium", "Low"]
+
+async def test_sql_priority_matches_python(db: AsyncSession, test_user):
+    """Тест совпадения SQL-функции приоритета с calculate_priority."""
+    now = datetime.utcnow()
+    db.add_all([
+        Task(title="A", priority=4, status=TaskStatus.IN_PROGRESS, user_id=test_user.id,
+             due_date=(now + timedelta(days=2)).date(), estimated_duration=6),
+        Task(title="B", priority=2, status=TaskStatus.BLOCKED, user_id=test_user.id,
+             created_at=now - timedelta(days=3)),
+    ])
+    await db.commit()
+    result = await db.execute(select(Task, priority_expression(now)))
+    for task, score in result.all():
+        assert score == pytest.approx(calculate_priority(task, now))
+
+async def collect_pages(client: AsyncClient, url: str, headers, limit: int):
+    """Пройти все страницы списка по курсору."""
+    items = []
+    cursor = None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        items.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return items
+
+@pytest.mark.parametrize("sort", ["priority", "id"])
+async def test_get_tasks_cursor_pagination(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers, sort
+):
+    """Тест курсорной пагинации задач."""
+    now = datetime.utcnow()
+    for i in range(7):
+        db.add(Task(
+            title=f"Task {i}",
+            priority=i % 5 + 1,
+            user_id=test_user.id,
+            due_date=(now + timedelta(days=i)).date() if i % 2 else None
+        ))
+    await db.commit()
+
+    full = (await client.get(
+        "/api/v1/tasks/", params={"sort": sort}, headers=token_headers
+    )).json()
+    paged = await collect_pages(client, f"/api/v1/tasks/?sort={sort}", token_headers, limit=3)
+    assert [task["id"] for task in paged] == [task["id"] for task in full]
+    assert len(paged) == 7
+    if sort == "id":
+        assert [task["id"] for task in paged] == sorted(task["id"] for task in paged)
+
+async def test_get_tasks_filters(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Тест фильтров списка задач."""
+    now = datetime.utcnow()
+    today = now.date()
+    category = Category(name="Work", user_id=test_user.id)
+    db.add(category)
+    await db.commit()
+    db.add_all([
+        Task(title="overdue", priority=2, status=TaskStatus.IN_PROGRESS,
+             due_date=today - timedelta(days=2), user_id=test_user.id),
+        Task(title="done late", priority=5, status=TaskStatus.COMPLETED,
+             due_date=today - timedelta(days=1), user_id=test_user.id),
+        Task(title="this week", priority=4, status=TaskStatus.IN_PROGRESS,
+             due_date=today + timedelta(days=3), category_id=category.id, user_id=test_user.id),
+        Task(title="later", priority=3, status=TaskStatus.PENDING,
+             due_date=today + timedelta(days=30), category_id=category.id, user_id=test_user.id),
+        Task(title="no due date", priority=1, status=TaskStatus.BLOCKED,
+             created_at=now - timedelta(days=10), user_id=test_user.id),
+    ])
+    await db.commit()
+
+    async def titles(**params):
+        response = await client.get("/api/v1/tasks/", params=params, headers=token_headers)
+        assert response.status_code == 200
+        return {task["title"] for task in response.json()}
+
+    assert await titles(status=["in_progress", "blocked"]) == {"overdue", "this week", "no due date"}
+    assert await titles(category_id=category.id) == {"this week", "later"}
+    assert await titles(
+        status="in_progress", due_after=today.isoformat(),
+        due_before=(today + timedelta(days=7)).isoformat()
+    ) == {"this week"}
+    assert await titles(overdue="true") == {"overdue"}
+    assert await titles(overdue="true", status="completed") == set()
+    assert await titles(created_after=(now - timedelta(days=1)).isoformat()) == {
+        "overdue", "done late", "this week", "later"
+    }
+    # Время с часовым поясом сравнивается с created_at после перевода в UTC
+    east = timezone(timedelta(hours=5))
+    created_after = (now - timedelta(hours=2)).replace(tzinfo=timezone.utc).astimezone(east)
+    assert await titles(created_after=created_after.isoformat()) == {
+        "overdue", "done late", "this week", "later"
+    }
+
+    # Отфильтрованный список ранжируется в базе в том же порядке, что и полный
+    # список по индексу приоритетов, и листается курсором
+    full = (await client.get("/api/v1/tasks/", headers=token_headers)).json()
+    expected = [task["id"] for task in full if task["status"] in ("pending", "in_progress")]
+    paged = await collect_pages(
+        client, "/api/v1/tasks/?status=pending&status=in_progress", token_headers, limit=1
+    )
+    assert [task["id"] for task in paged] == expected
+
+async def test_get_tasks_sparse_fields(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Тест выбора полей задач параметром fields."""
+    task = Task(title="Sparse", description="Long text", priority=3, user_id=test_user.id)
+    db.add(task)
+    await db.commit()
+
+    for params in ({"fields": "title,id"}, {"fields": "title,id", "sort": "id"},
+                   {"fields": "title,id", "status": "pending"}):
+        response = await client.get("/api/v1/tasks/", params=params, headers=token_headers)
+        assert response.status_code == 200
+        assert response.json() == [{"id": task.id, "title": "Sparse"}]
+
+    response = await client.get(
+        f"/api/v1/tasks/{task.id}", params={"fields": "priority"}, headers=token_headers
+    )
+    assert response.status_code == 200
+    assert response.json() == {"priority": 3}
+
+    for fields in ("title,password", ","):
+        response = await client.get(
+            "/api/v1/tasks/", params={"fields": fields}, headers=token_headers
+        )
+        assert response.status_code == 400
+    response = await client.get(
+        "/api/v1/tasks/999999", params={"fields": "title"}, headers=token_headers
+    )
+    assert response.status_code == 404
+
+async def test_get_tasks_invalid_cursor(client: AsyncClient, token_headers):
+    """Тест обработки поврежденного курсора."""
+    response = await client.get(
+        "/api/v1/tasks/", params={"cursor": "not-a-cursor"}, headers=token_headers
+    )
+    assert response.status_code == 400
+
+async def test_bulk_task_operations(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Тест пакетного создания, обновления и удаления задач."""
+    other = User(email="other@example.com", hashed_password="hashed_password")
+    db.add(other)
+    await db.commit()
+    foreign = Task(title="Foreign", priority=1, user_id=other.id)
+    db.add(foreign)
+    await db.commit()
+
+    response = await client.post(
+        "/api/v1/tasks/bulk",
+        json={"tasks": [{"title": f"Task {i}", "priority": i + 1} for i in range(3)]},
+        headers=token_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["created"] * 3
+    assert [result["task"]["title"] for result in results] == ["Task 0", "Task 1", "Task 2"]
+    ids = [result["id"] for result in results]
+
+    response = await client.patch(
+        "/api/v1/tasks/bulk",
+        json={"tasks": [
+            {"id": ids[0], "priority": 5},
+            {"id": foreign.id, "title": "Stolen"},
+            {"id": ids[1], "title": "Renamed", "status": "in_progress"},
+        ]},
+        headers=token_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["updated", "not_found", "updated"]
+    assert results[0]["task"]["priority"] == 5
+    assert results[2]["task"]["title"] == "Renamed"
+    assert results[2]["task"]["status"] == "in_progress"
+
+    # Индекс приоритетов учитывает пакетные изменения
+    titles = [task["title"] for task in (await client.get(
+        "/api/v1/tasks/", headers=token_headers
+    )).json()]
+    assert titles == ["Task 0", "Task 2", "Renamed"]
+
+    response = await client.request(
+        "DELETE",
+        "/api/v1/tasks/bulk",
+        json={"ids": [ids[2], foreign.id, ids[0]]},
+        headers=token_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["deleted", "not_found", "deleted"]
+
+    remaining = (await client.get("/api/v1/tasks/", headers=token_headers)).json()
+    assert [task["id"] for task in remaining] == [ids[1]]
+    assert (await db.get(Task, foreign.id)).title == "Foreign"
+
+async def test_bulk_update_without_changes(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Элемент пакетного обновления только с ID задачу не меняет и версию не увеличивает."""
+    task = Task(title="Task", priority=3, user_id=test_user.id)
+    db.add(task)
+    await db.commit()
+    version = await get_data_version(db, test_user.id)
+
+    response = await client.patch(
+        "/api/v1/tasks/bulk", json={"tasks": [{"id": task.id}]}, headers=token_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["status"] for result in results] == ["unchanged"]
+    assert results[0]["task"]["title"] == "Task"
+    assert await get_data_version(db, test_user.id) == version
+
+    response = await client.patch(
+        "/api/v1/tasks/bulk",
+        json={"tasks": [{"id": task.id}, {"id": task.id, "priority": 5}]},
+        headers=token_headers
+    )
+    assert [result["status"] for result in response.json()["results"]] == [
+        "unchanged", "updated"
+    ]
+    assert await get_data_version(db, test_user.id) == version + 1
+
+async def test_batch_get_tasks(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Тест получения задач по списку ID."""
+    other = User(email="other@example.com", hashed_password="hashed_password")
+    db.add(other)
+    await db.commit()
+    own = [Task(title=f"Own {i}", priority=i + 1, user_id=test_user.id) for i in range(3)]
+    foreign = Task(title="Foreign", priority=1, user_id=other.id)
+    db.add_all([*own, foreign])
+    await db.commit()
+
+    requested = [own[2].id, foreign.id, own[0].id, 999999, own[2].id]
+    response = await client.post(
+        "/api/v1/tasks/batch-get", json={"ids": requested}, headers=token_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data["tasks"]] == ["Own 2", "Own 0"]
+    assert data["missing"] == [foreign.id, 999999]
+
+    response = await client.post(
+        "/api/v1/tasks/batch-get", params={"fields": "id"},
+        json={"ids": [own[1].id]}, headers=token_headers
+    )
+    assert response.json() == {"tasks": [{"id": own[1].id}], "missing": []}
+
+    response = await client.post(
+        "/api/v1/tasks/batch-get",
+        json={"ids": list(range(settings.BULK_MAX_ITEMS + 1))},
+        headers=token_headers
+    )
+    assert response.status_code == 422
+
+async def test_bulk_max_items(client: AsyncClient, token_headers):
+    """Тест ограничения размера пакета."""
+    response = await client.request(
+        "DELETE",
+        "/api/v1/tasks/bulk",
+        json={"ids": list(range(settings.BULK_MAX_ITEMS + 1))},
+        headers=token_headers
+    )
+    assert response.status_code == 422
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv"])
+async def test_export_tasks(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers, export_format
+):
+    """Тест потоковой выгрузки задач."""
+    other = User(email="other@example.com", hashed_password="hashed_password")
+    db.add(other)
+    await db.commit()
+    db.add(Task(title="Foreign", priority=1, user_id=other.id))
+    for i in range(5):
+        db.add(Task(
+            title=f"Задача, {i}",
+            priority=i + 1,
+            status=TaskStatus.IN_PROGRESS,
+            estimated_duration=2,
+            due_date=(datetime.utcnow() + timedelta(days=i)).date(),
+            user_id=test_user.id
+        ))
+    await db.commit()
+
+    expected = (await client.get(
+        "/api/v1/tasks/", params={"sort": "id"}, headers=token_headers
+    )).json()
+    response = await client.get(
+        "/api/v1/tasks/export", params={"format": export_format}, headers=token_headers
+    )
+    assert response.status_code == 200
+    if export_format == "ndjson":
+        assert response.headers["content-type"] == "application/x-ndjson"
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        assert exported == expected
+    else:
+        assert response.headers["content-type"].startswith("text/csv")
+        exported = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["title"] for row in exported] == [task["title"] for task in expected]
+        assert exported[0]["status"] == "in_progress"
+        assert exported[0]["due_date"] == expected[0]["due_date"]
+
+async def test_import_tasks(client: AsyncClient, test_user, token_headers):
+    """Тест потокового импорта задач из выгрузки в формате test_data.json."""
+    # Индекс приоритетов загружен до импорта и должен быть сброшен им
+    assert (await client.get("/api/v1/tasks/", headers=token_headers)).json() == []
+    with open("test_data.json", "rb") as dataset:
+        content = dataset.read()
+    response = await client.post(
+        "/api/v1/tasks/import",
+        params={"chunk_size": 2},
+        content=content,
+        headers=token_headers
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert report["imported"] == 5
+    assert report["rejected"] == len(report["errors"]) == 3
+    assert report["errors"][0]["line"] == 1
+
+    tasks = (await client.get("/api/v1/tasks/", headers=token_headers)).json()
+    assert len(tasks) == 5
+    assert {task["user_id"] for task in tasks} == {test_user.id}
+
+async def test_import_outside_api_visible_to_api(
+    client: AsyncClient, db: AsyncSession, test_user, token_headers
+):
+    """Импорт утилитой (своя сессия, без запросов к API) виден в списке задач API."""
+    await client.post(
+        "/api/v1/tasks/", json={"title": "Before", "priority": 1}, headers=token_headers
+    )
+    assert [task["title"] for task in (await client.get(
+        "/api/v1/tasks/", headers=token_headers
+    )).json()] == ["Before"]
+
+    async def chunks():
+        yield '{"title": "Imported", "priority": 5}\n'
+
+    # Как в import_data.py: импорт в отдельной сессии
+    async with AsyncSession(db.bind, expire_on_commit=False) as session:
+        report = await import_records(session, test_user.id, chunks(), ImportTarget.TASKS)
+    assert report.imported == 1
+
+    tasks = (await client.get("/api/v1/tasks/", headers=token_headers)).json()
+    assert [task["title"] for task in tasks] == ["Imported", "Before"]
+
+async def test_import_tasks_collects_rejected_rows(client: AsyncClient, token_headers):
+    """Тест импорта NDJSON: ошибочные строки не прерывают импорт."""
+    content = "\n".join([
+        '{"title": "First", "priority": 1}',
+        '{"title": "Bad priority", "priority": 9}',
+        '{"title": "Broken", ',
+        '{"title": "Second", "priority": 2, "status": "in_progress"}',
+    ])
+    response = await client.post(
+        "/api/v1/tasks/import", content=content.encode(), headers=token_headers
+    )
+    report = response.json()
+    assert report["imported"] == 2
+    assert [error["line"] for error in report["errors"]] == [2, 3]
+    assert report["errors"][0]["record"]["title"] == "Bad priority"
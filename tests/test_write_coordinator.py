@@ -0,0 +1,160 @@
+"""Координатор записи: группировка операций в общую транзакцию."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.core import database
+from app.core.database import Base, WriteCoordinator, build_engine
+from app.core.task_index import task_index
+from app.crud import calendar_block as calendar_block_crud
+from app.crud import task as task_crud
+from app.crud.user import get_data_version
+from app.models.calendar_block import CalendarBlock
+from app.models.task import Task
+from app.models.user import User
+from app.schemas.calendar_block import CalendarBlockCreate, CalendarBlockUpdate
+from app.schemas.task import TaskCreate
+
+pytestmark = pytest.mark.asyncio
+
+@pytest.fixture
+async def coordinated(tmp_path, monkeypatch):
+    """
+    Файловая база с включенным координатором.
+    Возвращает фабрику сессий, ID пользователя и список выполненных BEGIN.
+    """
+    engine = build_engine(f"sqlite+aiosqlite:///{tmp_path / 'writes.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        user = User(email="writer@example.com", hashed_password="", full_name="Writer")
+        session.add(user)
+        await session.commit()
+        user_id = user.id
+
+    coordinator = WriteCoordinator(engine, window_seconds=0.05, max_batch=256)
+    monkeypatch.setattr(database, "write_coordinator", coordinator)
+    transactions = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if statement.startswith("BEGIN"):
+            transactions.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield session_factory, user_id, transactions
+    await coordinator.stop()
+    await engine.dispose()
+
+async def test_concurrent_writes_share_one_transaction(coordinated):
+    session_factory, user_id, transactions = coordinated
+
+    async def create(index: int) -> Task:
+        async with session_factory() as session:
+            return await task_crud.create_task(
+                session, TaskCreate(title=f"Task {index}", priority=3), user_id
+            )
+
+    created = await asyncio.gather(*(create(index) for index in range(20)))
+    # Каждый вызывающий получает свою задачу, все записи - в одной транзакции
+    assert [task.title for task in created] == [f"Task {index}" for index in range(20)]
+    assert len({task.id for task in created}) == 20
+    assert transactions == ["BEGIN IMMEDIATE"]
+    async with session_factory() as session:
+        assert await get_data_version(session, user_id) == 20
+        count = await session.execute(select(Task.id).where(Task.user_id == user_id))
+        assert len(count.all()) == 20
+
+async def test_failed_operation_rolls_back_alone(coordinated):
+    session_factory, user_id, transactions = coordinated
+    async with session_factory() as session:
+        block = await calendar_block_crud.create_calendar_block(session, CalendarBlockCreate(
+            title="Standup",
+            start_time="2024-01-01T09:00:00",
+            end_time="2024-01-01T09:30:00"
+        ), user_id)
+
+    async def create_task() -> Task:
+        async with session_factory() as session:
+            return await task_crud.create_task(
+                session, TaskCreate(title="Kept", priority=2), user_id
+            )
+
+    async def break_block():
+        async with session_factory() as session:
+            # Блок заканчивается раньше начала: операция выбрасывает ValueError
+            return await calendar_block_crud.update_calendar_block(
+                session, block.id, CalendarBlockUpdate(end_time="2024-01-01T08:00:00"), user_id
+            )
+
+    results = await asyncio.gather(create_task(), break_block(), return_exceptions=True)
+    assert results[0].title == "Kept"
+    assert isinstance(results[1], ValueError)
+    assert len(transactions) == 2
+    async with session_factory() as session:
+        stored = await session.get(CalendarBlock, block.id)
+        assert stored.end_time.hour == 9
+        assert (await session.execute(select(Task.title))).scalars().all() == ["Kept"]
+
+async def test_operation_rolled_back_after_writing(coordinated):
+    session_factory, user_id, transactions = coordinated
+    async with session_factory() as session:
+        existing = await task_crud.create_task(
+            session, TaskCreate(title="Original", priority=1), user_id
+        )
+    transactions.clear()
+
+    async def write_then_fail(session: AsyncSession):
+        # Операция успевает изменить данные до ошибки: откатывается ее точка сохранения
+        session.add(Task(title="Inserted", priority=1, user_id=user_id))
+        await session.flush()
+        await session.execute(
+            update(Task).where(Task.id == existing.id).values(title="Updated")
+        )
+        raise RuntimeError("failed after writing")
+
+    async def create_task() -> Task:
+        async with session_factory() as session:
+            return await task_crud.create_task(
+                session, TaskCreate(title="Kept", priority=2), user_id
+            )
+
+    results = await asyncio.gather(
+        database.write_coordinator.submit(write_then_fail), create_task(),
+        return_exceptions=True
+    )
+    assert isinstance(results[0], RuntimeError)
+    assert results[1].title == "Kept"
+    assert transactions == ["BEGIN IMMEDIATE"]
+    async with session_factory() as session:
+        titles = (await session.execute(select(Task.title).order_by(Task.id))).scalars().all()
+        assert titles == ["Original", "Kept"]
+
+async def test_failing_callback_does_not_strand_batch(coordinated, monkeypatch):
+    session_factory, user_id, _ = coordinated
+    task_saved = task_index.task_saved
+
+    def fail_for_broken(user, task, version):
+        if task.title == "Broken":
+            raise RuntimeError("cache update failed")
+        task_saved(user, task, version)
+
+    monkeypatch.setattr(task_index, "task_saved", fail_for_broken)
+
+    async def create(title: str) -> Task:
+        async with session_factory() as session:
+            return await task_crud.create_task(session, TaskCreate(title=title, priority=3), user_id)
+
+    # Ошибка в действии после фиксации не прерывает писателя: ответ получают
+    # все операции пакета, а следующие записи выполняются
+    created = await asyncio.wait_for(
+        asyncio.gather(*(create(title) for title in ("First", "Broken", "Last"))), timeout=5
+    )
+    assert [task.title for task in created] == ["First", "Broken", "Last"]
+    after = await asyncio.wait_for(create("After"), timeout=5)
+    assert after.title == "After"
+    await asyncio.wait_for(database.write_coordinator.stop(), timeout=5)